@@ -0,0 +1,138 @@
+"""
+Memory per finding, plain dataclass versus the slotted, interned Finding.
+
+Findings are produced the way a parallel review produces them: built in
+batches of files with their source line and context attached, pickled as a
+worker would return them and unpickled in the parent, then all kept alive
+as a report does.
+
+    python benchmarks/bench_finding_memory.py [--findings 100000 1000000]
+"""
+import argparse
+import pickle
+import sys
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+# Runnable from a checkout without installing the package.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from stone_sec.engine.severity import Severity  # noqa: E402
+from stone_sec.engine.snippets import attach_snippets  # noqa: E402
+from stone_sec.models.finding import Finding  # noqa: E402
+
+# (rule_id, severity, title, placeholder snippet, flagged code), as the rules
+# emit them and as the flagged line reads in the file.
+RULES = [
+    ("PY-EVAL-001", Severity.HIGH, "Use of eval()", "eval(...)", "result = eval(expression_{n})"),
+    (
+        "PY-SQL-001",
+        Severity.HIGH,
+        "Possible SQL injection",
+        "cursor.execute(f\"...\")",
+        "cursor.execute(f\"SELECT * FROM users WHERE id = {{user_{n}}}\")",
+    ),
+    (
+        "PY-SUBPROCESS-001",
+        Severity.HIGH,
+        "subprocess with shell=True",
+        "subprocess(..., shell=True)",
+        "subprocess.run(command_{n}, shell=True, check=True)",
+    ),
+    (
+        "PY-PICKLE-001",
+        Severity.HIGH,
+        "Unsafe pickle deserialization",
+        "pickle.loads(...)",
+        "payload = pickle.loads(request_body_{n})",
+    ),
+]
+
+FILES_PER_BATCH = 32
+FINDINGS_PER_FILE = 8
+
+
+@dataclass
+class DataclassFinding:
+    """
+    The previous representation, for comparison.
+    """
+
+    file: Path
+    line: int
+    rule_id: str
+    severity: Severity
+    title: str
+    snippet: str
+
+    explanation: Optional[str] = None
+    exploit_scenario: Optional[str] = None
+    remediation: Optional[str] = None
+    cell: Optional[int] = None
+    context: Optional[str] = None
+
+
+def make_file(cls, path: Path, first_rule: int) -> list:
+    # One four-line handler per finding, so context windows overlap as they
+    # do in real code.
+    lines, findings = [], []
+    for k in range(FINDINGS_PER_FILE):
+        rule_id, severity, title, placeholder, code = RULES[(first_rule + k) % len(RULES)]
+        lines += [f"def handler_{k}(request):", f"    item_{k} = load(request, {k})"]
+        lines.append("    " + code.format(n=k))
+        findings.append(
+            cls(
+                file=path,
+                line=len(lines),
+                rule_id=rule_id,
+                severity=severity,
+                title=title,
+                snippet=placeholder,
+            )
+        )
+        lines.append(f"    return item_{k}")
+
+    attach_snippets(findings, "\n".join(lines) + "\n")
+    return findings
+
+
+def make_batch(cls, batch: int) -> list:
+    findings = []
+    for n in range(FILES_PER_BATCH):
+        path = Path(f"/src/project/pkg_{batch % 97}/module_{batch}_{n}.py")
+        findings.extend(make_file(cls, path, batch + n))
+    return findings
+
+
+def measure(cls, count: int) -> float:
+    per_batch = FILES_PER_BATCH * FINDINGS_PER_FILE
+    # Pickle outside the traced region: only what the parent keeps counts.
+    payloads = [pickle.dumps(make_batch(cls, b)) for b in range((count + per_batch - 1) // per_batch)]
+
+    tracemalloc.start()
+    kept = []
+    for payload in payloads:
+        # Payloads are produced by this script a few lines above.
+        kept.extend(pickle.loads(payload))  # stone-sec: ignore[PY-PICKLE-001]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return current / len(kept)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--findings", type=int, nargs="+", default=[100_000, 1_000_000])
+    args = parser.parse_args()
+
+    print(f"{'findings':>10}  {'dataclass B':>12}  {'slotted B':>10}  {'saving':>7}")
+    for count in args.findings:
+        before = measure(DataclassFinding, count)
+        after = measure(Finding, count)
+        print(f"{count:>10}  {before:>12.0f}  {after:>10.0f}  {1 - after / before:>7.0%}")
+
+
+if __name__ == "__main__":
+    main()
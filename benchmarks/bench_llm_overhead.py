@@ -0,0 +1,96 @@
+"""
+Per-call overhead of the Ollama providers, against a stub server.
+
+The stub answers /api/generate instantly, so the timings are pure
+transport: `OllamaProvider` starts a process per call (here a stand-in
+`ollama` script that forwards the prompt to the stub, as the real CLI
+forwards to the server), `OllamaHTTPProvider` reuses pooled keep-alive
+connections.
+
+    python benchmarks/bench_llm_overhead.py [--calls 50] [--concurrency 1 4]
+"""
+import argparse
+import json
+import os
+import stat
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Runnable from a checkout without installing the package.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from stone_sec.llm.ollama_http_provider import OllamaHTTPProvider  # noqa: E402
+from stone_sec.llm.ollama_provider import OllamaProvider  # noqa: E402
+
+ANSWER = json.dumps({"explanation": "e", "exploit_scenario": "x", "remediation": "r"})
+
+FAKE_OLLAMA = """#!{python}
+import json, sys, urllib.request
+prompt = sys.stdin.read()
+body = json.dumps({{"model": sys.argv[2], "prompt": prompt, "stream": False}}).encode()
+with urllib.request.urlopen("{url}/api/generate", body) as reply:
+    print(json.loads(reply.read())["response"])
+"""
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # As Ollama's server does; headers and body are written separately.
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        data = json.dumps({"response": ANSWER, "done": True}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def per_call_ms(provider, calls: int, concurrency: int) -> float:
+    prompts = [f"finding {n}" for n in range(calls)]
+    started = time.perf_counter()
+    results = provider.generate_many(prompts, concurrency=concurrency)
+    elapsed = time.perf_counter() - started
+    assert all(r["explanation"] == "e" for r in results), "stub answer not parsed"
+    return elapsed / calls * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4])
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    with tempfile.TemporaryDirectory() as bin_dir:
+        script = Path(bin_dir) / "ollama"
+        script.write_text(FAKE_OLLAMA.format(python=sys.executable, url=url), encoding="utf-8")
+        script.chmod(script.stat().st_mode | stat.S_IEXEC)
+        os.environ["PATH"] = bin_dir + os.pathsep + os.environ["PATH"]
+
+        print(f"{'concurrency':>11}  {'subprocess ms/call':>18}  {'http ms/call':>12}")
+        for concurrency in args.concurrency:
+            subprocess_ms = per_call_ms(OllamaProvider(), args.calls, concurrency)
+            http = OllamaHTTPProvider(url=url, pool_size=concurrency)
+            http_ms = per_call_ms(http, args.calls, concurrency)
+            http.close()
+            print(f"{concurrency:>11}  {subprocess_ms:>18.2f}  {http_ms:>12.2f}")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
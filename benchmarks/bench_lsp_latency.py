@@ -0,0 +1,91 @@
+"""
+Diagnostics latency of the LSP server on large documents.
+
+Measures the time from a full-sync `didChange` to the matching
+`publishDiagnostics`, with debouncing disabled so only parse + rules count.
+
+    python benchmarks/bench_lsp_latency.py [--lines 5000 20000 50000] [--repeat 5]
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Runnable from a checkout without installing the package.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from stone_sec.lsp.server import LanguageServer  # noqa: E402
+
+URI = "file:///bench/large_module.py"
+
+BLOCK = '''
+def handler_{n}(request, cursor):
+    data = request.get("payload")
+    cursor.execute(f"SELECT * FROM t WHERE id = {{data}}")
+    subprocess.run(data, shell=True)
+    value = {{"key": [1, 2, 3], "n": {n}}}
+    return value
+'''
+
+
+def make_source(lines: int) -> str:
+    parts = ["import subprocess\n"]
+    n = 0
+    while sum(p.count("\n") for p in parts) < lines:
+        parts.append(BLOCK.format(n=n))
+        n += 1
+    return "".join(parts)
+
+
+def measure(lines: int, repeat: int) -> list:
+    published = []
+    server = LanguageServer(published.append, debounce=0)
+    server.handle({"jsonrpc": "2.0", "id": 1, "method": "initialize", "params": {}})
+
+    source = make_source(lines)
+    server.handle(
+        {
+            "jsonrpc": "2.0",
+            "method": "textDocument/didOpen",
+            "params": {"textDocument": {"uri": URI, "version": 1, "text": source}},
+        }
+    )
+
+    timings = []
+    for version in range(2, repeat + 2):
+        edited = source + f"\nx_{version} = {version}\n"
+        started = time.perf_counter()
+        server.handle(
+            {
+                "jsonrpc": "2.0",
+                "method": "textDocument/didChange",
+                "params": {
+                    "textDocument": {"uri": URI, "version": version},
+                    "contentChanges": [{"text": edited}],
+                },
+            }
+        )
+        timings.append(time.perf_counter() - started)
+
+    diagnostics = published[-1]["params"]["diagnostics"]
+    return timings, len(diagnostics)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--lines", type=int, nargs="+", default=[1000, 5000, 20000, 50000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'lines':>8}  {'diagnostics':>11}  {'median ms':>10}  {'max ms':>8}")
+    for lines in args.lines:
+        timings, count = measure(lines, args.repeat)
+        print(
+            f"{lines:>8}  {count:>11}  "
+            f"{statistics.median(timings) * 1000:>10.1f}  {max(timings) * 1000:>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
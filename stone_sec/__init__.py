@@ -0,0 +1,22 @@
+__all__ = ["Engine", "Finding", "scan_source", "scan_sources"]
+
+
+def __getattr__(name):
+    # Public names are loaded on first use, so `import stone_sec.cli` does
+    # not pay for the engine and rule set before argument parsing.
+    if name == "Engine":
+        from stone_sec.engine.core import Engine as value
+    elif name == "Finding":
+        from stone_sec.models.finding import Finding as value
+    elif name == "scan_source":
+        from stone_sec.engine.pipeline import scan_source as value
+    elif name == "scan_sources":
+        from stone_sec.engine.pipeline import scan_sources as value
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,3 @@
+from stone_sec.cli import main
+
+main()
@@ -0,0 +1,39 @@
+import os
+import threading
+from pathlib import Path
+
+
+def cache_dir() -> Path:
+    """
+    Directory for stone-sec's on-disk caches.
+
+    `STONE_SEC_CACHE_DIR` overrides the default of `$XDG_CACHE_HOME/stone-sec`
+    (or `~/.cache/stone-sec`).
+    """
+    override = os.environ.get("STONE_SEC_CACHE_DIR")
+    if override:
+        return Path(override)
+
+    base = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    return Path(base) / "stone-sec"
+
+
+def atomic_write_bytes(path: Path, data: bytes):
+    """
+    Replace `path` with `data` so concurrent readers never see a partial file.
+
+    The temporary file is private to the calling process and thread, so
+    concurrent writers (threads of the daemon or a shared `Engine`) never
+    write into each other's copy; the last replace wins.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+        raise
@@ -1,14 +1,50 @@
-from importlib.metadata import version, PackageNotFoundError
-from stone_sec.llm.ollama_provider import OllamaProvider
-from stone_sec.llm.prompt import build_prompt
-from stone_sec.engine.rules.runner import run_rules
-from stone_sec.engine.parser import parse_python_file
-from stone_sec.engine.rules.eval_rule import EvalUsageRule
-from stone_sec.engine.scanner import discover_python_files
 import argparse
 import sys
 from pathlib import Path
 
+from stone_sec.defaults import (
+    DEFAULT_BASELINE_FILE,
+    DEFAULT_LLM_CACHE_ENTRIES,
+    DEFAULT_LLM_CACHE_TTL_DAYS,
+    DEFAULT_LLM_CONCURRENCY,
+    DEFAULT_LLM_TIMEOUT,
+    DEFAULT_MAX_FILE_SIZE,
+    DEFAULT_MAX_MEMBER_SIZE,
+    DEFAULT_MAX_TOTAL_SIZE,
+)
+
+
+def parse_size(value: str) -> int:
+    units = {"K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+    text = value.strip().upper().removesuffix("B")
+
+    try:
+        if text and text[-1] in units:
+            return int(float(text[:-1]) * units[text[-1]])
+        return int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid size: {value}")
+
+
+def add_discovery_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument(
+        "--exclude",
+        action="append",
+        metavar="GLOB",
+        help="Skip paths matching this gitignore-style glob (repeatable)."
+    )
+
+    parser.add_argument(
+        "--no-gitignore",
+        action="store_true",
+        help="Do not honour .gitignore files while discovering files."
+    )
+
+    parser.add_argument(
+        "--no-scripts",
+        action="store_true",
+        help="Do not detect extensionless executable scripts with a Python shebang."
+    )
 
 
 def create_parser() -> argparse.ArgumentParser:
@@ -26,16 +62,41 @@ def create_parser() -> argparse.ArgumentParser:
     )
 
     review_parser.add_argument(
-        "path",
+        "paths",
+        type=str,
+        nargs="*",
+        metavar="path",
+        help="Python files, directories, or wheels/zips/tarballs to scan ('-' reads source from stdin)."
+    )
+
+    review_parser.add_argument(
+        "--stdin-filename",
         type=str,
-        help="Path to Python file or directory to scan."
+        default="<stdin>",
+        metavar="NAME",
+        help="File name to report for source read from stdin (default: <stdin>)."
+    )
+
+    review_parser.add_argument(
+        "--paths-from",
+        type=str,
+        metavar="FILE",
+        help="Read additional paths to scan from FILE, one per line ('-' for stdin)."
+    )
+
+    review_parser.add_argument(
+        "--environment",
+        nargs="?",
+        const="",
+        metavar="PYTHON",
+        help="Scan the installed distributions of an interpreter (default: the current one)."
     )
 
     review_parser.add_argument(
     "--format",
-    choices=["text", "json"],
+    choices=["text", "json", "jsonl", "sarif"],
     default="text",
-    help="Output format (text or json)",
+    help="Output format (text, json, jsonl: one finding per line as files complete, or sarif: SARIF 2.1.0)",
 )
 
     review_parser.add_argument(
@@ -47,10 +108,328 @@ def create_parser() -> argparse.ArgumentParser:
 
     review_parser.add_argument(
     "--provider",
-    choices=["ollama"],
-    help="LLM provider for enhanced explanations",
+    choices=["ollama", "ollama-http"],
+    help="LLM provider for enhanced explanations (ollama runs the CLI per finding; ollama-http uses a running server's API)",
 )
 
+    review_parser.add_argument(
+        "--no-llm-cache",
+        action="store_true",
+        help="Always ask the model; do not read or write the on-disk LLM answer cache."
+    )
+
+    review_parser.add_argument(
+        "--llm-cache-size",
+        type=int,
+        default=DEFAULT_LLM_CACHE_ENTRIES,
+        metavar="N",
+        help=f"Keep at most N cached LLM answers, least recently used dropped first (default: {DEFAULT_LLM_CACHE_ENTRIES})."
+    )
+
+    review_parser.add_argument(
+        "--llm-cache-ttl",
+        type=float,
+        default=DEFAULT_LLM_CACHE_TTL_DAYS,
+        metavar="DAYS",
+        help=f"Ignore cached LLM answers older than DAYS (default: {DEFAULT_LLM_CACHE_TTL_DAYS:g})."
+    )
+
+    review_parser.add_argument(
+        "--ollama-url",
+        type=str,
+        metavar="URL",
+        help="Ollama server for --provider ollama-http (default: $OLLAMA_HOST or http://127.0.0.1:11434)."
+    )
+
+    review_parser.add_argument(
+        "--llm-concurrency",
+        type=int,
+        default=DEFAULT_LLM_CONCURRENCY,
+        metavar="N",
+        help=f"LLM requests to run at once with --provider (default: {DEFAULT_LLM_CONCURRENCY})."
+    )
+
+    review_parser.add_argument(
+        "--llm-timeout",
+        type=float,
+        default=DEFAULT_LLM_TIMEOUT,
+        metavar="SECONDS",
+        help=f"Give up on one LLM request after this many seconds and use a generic explanation (default: {DEFAULT_LLM_TIMEOUT:g})."
+    )
+
+    add_discovery_arguments(review_parser)
+
+    review_parser.add_argument(
+        "--jobs",
+        type=int,
+        metavar="N",
+        help="Worker processes shared by all paths (default: CPU count)."
+    )
+
+    review_parser.add_argument(
+        "--max-archive-member-size",
+        type=parse_size,
+        default=DEFAULT_MAX_MEMBER_SIZE,
+        metavar="SIZE",
+        help="Skip archive members larger than SIZE when decompressed (default: 5M)."
+    )
+
+    review_parser.add_argument(
+        "--max-archive-size",
+        type=parse_size,
+        default=DEFAULT_MAX_TOTAL_SIZE,
+        metavar="SIZE",
+        help="Stop reading an archive after SIZE decompressed bytes (default: 256M)."
+    )
+
+    review_parser.add_argument(
+        "--max-file-size",
+        type=parse_size,
+        default=DEFAULT_MAX_FILE_SIZE,
+        metavar="SIZE",
+        help="Skip and report files larger than SIZE bytes; accepts K/M/G suffixes, 0 disables (default: 5M)."
+    )
+
+    review_parser.add_argument(
+        "--sort",
+        action="store_true",
+        help="Report findings sorted by file, line and rule, identically for any --jobs; uses bounded memory by spilling to temporary files."
+    )
+
+    review_parser.add_argument(
+        "--baseline",
+        type=str,
+        metavar="FILE",
+        help="Suppress findings recorded in this baseline file; only new findings are reported and count for --fail-on."
+    )
+
+    review_parser.add_argument(
+        "--store",
+        type=str,
+        metavar="PATH.sqlite",
+        help="Record this run's reported findings in a SQLite findings store (see 'stone-sec query')."
+    )
+
+    review_parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Run the review in a background stone-sec server, starting it if needed."
+    )
+
+    review_parser.add_argument(
+        "--socket",
+        type=str,
+        help="Unix socket path of the stone-sec server (default: per-user runtime dir)."
+    )
+
+    # Serve command
+    serve_parser = subparsers.add_parser(
+        "serve",
+        help="Run a long-lived scan server on a local Unix socket."
+    )
+
+    serve_parser.add_argument(
+        "--socket",
+        type=str,
+        help="Unix socket path to listen on (default: per-user runtime dir)."
+    )
+
+    serve_parser.add_argument(
+        "--idle-timeout",
+        type=float,
+        default=900.0,
+        help="Shut down after this many idle seconds (default: 900)."
+    )
+
+    # LSP command
+    lsp_parser = subparsers.add_parser(
+        "lsp",
+        help="Run a Language Server Protocol server over stdio."
+    )
+
+    lsp_parser.add_argument(
+        "--debounce",
+        type=float,
+        default=0.3,
+        help="Seconds to wait after the last edit before re-analysing (default: 0.3)."
+    )
+
+    # Watch command
+    watch_parser = subparsers.add_parser(
+        "watch",
+        help="Re-scan changed files continuously and print finding deltas."
+    )
+
+    watch_parser.add_argument(
+        "path",
+        type=str,
+        help="Path to Python file or directory to watch."
+    )
+
+    add_discovery_arguments(watch_parser)
+
+    watch_parser.add_argument(
+        "--max-file-size",
+        type=parse_size,
+        default=DEFAULT_MAX_FILE_SIZE,
+        metavar="SIZE",
+        help="Skip files larger than SIZE bytes; 0 disables (default: 5M)."
+    )
+
+    watch_parser.add_argument(
+        "--interval",
+        type=float,
+        default=0.5,
+        help="Seconds between change polls (default: 0.5)."
+    )
+
+    watch_parser.add_argument(
+        "--debounce",
+        type=float,
+        default=0.2,
+        help="Quiet period in seconds that ends a burst of saves (default: 0.2)."
+    )
+
+    # Baseline command
+    baseline_parser = subparsers.add_parser(
+        "baseline",
+        help="Record current findings so reviews only report new ones."
+    )
+    baseline_subparsers = baseline_parser.add_subparsers(dest="baseline_command")
+
+    baseline_create_parser = baseline_subparsers.add_parser(
+        "create",
+        help="Scan paths and write every finding to a baseline file."
+    )
+
+    baseline_create_parser.add_argument(
+        "paths",
+        type=str,
+        nargs="+",
+        metavar="path",
+        help="Python files, directories, or wheels/zips/tarballs to scan."
+    )
+
+    baseline_create_parser.add_argument(
+        "--output",
+        "-o",
+        type=str,
+        default=DEFAULT_BASELINE_FILE,
+        metavar="FILE",
+        help=f"Baseline file to write (default: {DEFAULT_BASELINE_FILE})."
+    )
+
+    add_discovery_arguments(baseline_create_parser)
+
+    baseline_create_parser.add_argument(
+        "--jobs",
+        type=int,
+        metavar="N",
+        help="Worker processes (default: CPU count)."
+    )
+
+    baseline_create_parser.add_argument(
+        "--max-file-size",
+        type=parse_size,
+        default=DEFAULT_MAX_FILE_SIZE,
+        metavar="SIZE",
+        help="Skip files larger than SIZE bytes; 0 disables (default: 5M)."
+    )
+
+    # Query command
+    query_parser = subparsers.add_parser(
+        "query",
+        help="Aggregate findings recorded with 'review --store'."
+    )
+
+    query_parser.add_argument(
+        "store",
+        type=str,
+        metavar="PATH.sqlite",
+        help="Findings store to query."
+    )
+
+    query_parser.add_argument(
+        "--by",
+        choices=["rule", "dir", "file", "week", "run"],
+        default="rule",
+        help="Group findings by rule, directory, file, week or run (default: rule)."
+    )
+
+    query_parser.add_argument(
+        "--rule",
+        type=str,
+        metavar="ID",
+        help="Only count findings of this rule."
+    )
+
+    query_parser.add_argument(
+        "--dir",
+        type=str,
+        metavar="PATH",
+        help="Only count findings in this directory or below it."
+    )
+
+    query_parser.add_argument(
+        "--since",
+        type=str,
+        metavar="YYYY-MM-DD",
+        help="Only count runs started on or after this date (UTC)."
+    )
+
+    query_parser.add_argument(
+        "--limit",
+        type=int,
+        metavar="N",
+        help="Show at most N rows."
+    )
+
+    query_parser.add_argument(
+        "--format",
+        choices=["text", "json"],
+        default="text",
+        help="Output format (text or json)",
+    )
+
+    # History command
+    history_parser = subparsers.add_parser(
+        "history",
+        help="Report when findings first and last appeared in git history."
+    )
+
+    history_parser.add_argument(
+        "range",
+        nargs="?",
+        default="HEAD",
+        help="Git revision range to walk (default: HEAD)."
+    )
+
+    history_parser.add_argument(
+        "--repo",
+        type=str,
+        default=".",
+        help="Path to the git repository (default: current directory)."
+    )
+
+    history_parser.add_argument(
+        "--format",
+        choices=["text", "json"],
+        default="text",
+        help="Output format (text or json)",
+    )
+
+    # LLM cache command
+    llm_cache_parser = subparsers.add_parser(
+        "llm-cache",
+        help="Show or clear the on-disk cache of LLM explanations."
+    )
+
+    llm_cache_parser.add_argument(
+        "action",
+        choices=["stats", "clear"],
+        help="stats: entries and size on disk; clear: drop every cached answer."
+    )
+
     # Version command
     subparsers.add_parser(
         "version",
@@ -60,17 +439,306 @@ def create_parser() -> argparse.ArgumentParser:
     return parser
 
 
-def handle_review(args):
-    import sys
-    from pathlib import Path
+def read_path_list(stream) -> list:
+    return [line.strip() for line in stream if line.strip()]
 
-    from stone_sec.engine.severity import Severity
-    from stone_sec.engine.scanner import discover_python_files
-    from stone_sec.engine.parser import parse_python_file
-    from stone_sec.engine.rules.runner import run_rules
+
+def read_stdin_bytes() -> bytes:
+    buffer = getattr(sys.stdin, "buffer", None)
+    if buffer is not None:
+        return buffer.read()
+    return sys.stdin.read().encode("utf-8")
+
+
+def handle_review(args):
+    if getattr(args, "daemon", False):
+        from stone_sec.daemon import review_via_daemon
+
+        argv = sys.argv[1:]
+        if "-" in args.paths:
+            # Source on stdin is scanned in-process; there is nothing to cache.
+            sys.exit(run_review(args, sys.stdout))
+        if args.paths_from != "-":
+            sys.exit(review_via_daemon(argv, socket_path=args.socket))
+
+        # The server cannot read our stdin: hand the list over as a file.
+        # The last --paths-from wins, so it is appended before any "--".
+        import os
+        import tempfile
+
+        with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as f:
+            f.write(sys.stdin.read())
+        end = argv.index("--") if "--" in argv else len(argv)
+        argv = argv[:end] + ["--paths-from", f.name] + argv[end:]
+        try:
+            code = review_via_daemon(argv, socket_path=args.socket)
+        finally:
+            os.unlink(f.name)
+        sys.exit(code)
+
+    sys.exit(run_review(args, sys.stdout))
+
+
+def run_review(args, out, engine=None, cwd=None) -> int:
+    """
+    Run a review and write its report to `out`.
+
+    Returns the process exit code. A long-lived `engine` may be supplied to
+    reuse its caches and worker pool; otherwise a one-shot engine is used.
+    Relative paths are resolved against `cwd` when given (used by the
+    server, which serves clients from many working directories).
+    """
+    from stone_sec.engine.core import Engine
+
+    if engine is not None:
+        return _run_review(args, out, engine, cwd)
+
+    with Engine(jobs=getattr(args, "jobs", None), cache_results=False) as engine:
+        return _run_review(args, out, engine, cwd)
+
+
+def _run_review(args, out, engine, cwd) -> int:
+    import sqlite3
+
+    from stone_sec.engine.severity import Severity, SeverityGate
+    from stone_sec.engine.baseline import Baseline, BaselineError, Fingerprinter
+    from stone_sec.engine.store import FindingStore, StoreError
+    from stone_sec.engine.pipeline import raw_size_limit, scan_source
+    from stone_sec.engine.source import FileTooLargeError
+    from stone_sec.engine.environment import EnvironmentQueryError, scan_environment
+    from stone_sec.llm.cache import CachingProvider, LLMCache
+    from stone_sec.llm.enrich import EnrichmentStage
+    from stone_sec.llm.ollama_http_provider import OllamaHTTPProvider
     from stone_sec.llm.ollama_provider import OllamaProvider
-    from stone_sec.llm.prompt import build_prompt
-    from stone_sec.output.json_formatter import findings_to_json
+    from stone_sec.output.sorting import SortedSpool
+    from stone_sec.output.writers import ReviewSummary, create_writer
+
+    max_file_size = getattr(args, "max_file_size", None)
+
+    environment = getattr(args, "environment", None)
+
+    paths = list(getattr(args, "paths", None) or [])
+    paths_from = getattr(args, "paths_from", None)
+
+    if not paths and paths_from is None and environment is None:
+        print("[ERROR] A path, --paths-from or --environment is required", file=out)
+        return 1
+
+    read_stdin = "-" in paths
+    paths = [p for p in paths if p != "-"]
+
+    if read_stdin and paths_from == "-":
+        print("[ERROR] Cannot read both source and --paths-from from stdin", file=out)
+        return 1
+
+    if paths_from == "-":
+        paths.extend(read_path_list(sys.stdin))
+    elif paths_from is not None:
+        list_path = Path(cwd) / paths_from if cwd else Path(paths_from)
+        try:
+            with open(list_path, encoding="utf-8") as f:
+                paths.extend(read_path_list(f))
+        except OSError as exc:
+            print(f"[ERROR] Unable to read path list {paths_from}: {exc}", file=out)
+            return 1
+
+    roots = []
+    for target in paths:
+        target_path = Path(target)
+        scan_root = Path(cwd) / target_path if cwd else target_path
+
+        if not scan_root.exists():
+            print(f"[ERROR] Path does not exist: {target_path}", file=out)
+            return 1
+
+        roots.append(scan_root)
+
+    base = Path(cwd) if cwd else Path.cwd()
+
+    baseline = None
+    baseline_file = getattr(args, "baseline", None)
+    if baseline_file:
+        try:
+            baseline = Baseline.load(base / baseline_file)
+        except BaselineError as exc:
+            print(f"[ERROR] {exc}", file=out)
+            return 1
+    fingerprint = Fingerprinter(base)
+    baselined = 0
+
+    store = None
+    store_file = getattr(args, "store", None)
+    if store_file:
+        try:
+            store = FindingStore(base / store_file)
+        except StoreError as exc:
+            print(f"[ERROR] {exc}", file=out)
+            return 1
+        store.begin_run(
+            [fingerprint.relative_path(root) for root in roots] + (["-"] if read_stdin else [])
+        )
+
+    spool = SortedSpool() if getattr(args, "sort", False) else None
+    enricher = None
+
+    try:
+        writer = create_writer(args.format, out, base=base)
+        report = spool.add if spool is not None else writer.finding
+        gate = SeverityGate(Severity.from_string(args.fail_on) if args.fail_on else None)
+        files_scanned = 0
+
+        # --- Optional LLM enhancement (never affects severity/exit) ---
+        provider_name = getattr(args, "provider", None)
+        if provider_name:
+            timeout = getattr(args, "llm_timeout", DEFAULT_LLM_TIMEOUT)
+            concurrency = getattr(args, "llm_concurrency", DEFAULT_LLM_CONCURRENCY)
+            if provider_name == "ollama-http":
+                provider = OllamaHTTPProvider(
+                    url=getattr(args, "ollama_url", None), timeout=timeout, pool_size=concurrency
+                )
+            else:
+                provider = OllamaProvider(timeout=timeout)
+            if not getattr(args, "no_llm_cache", False):
+                try:
+                    llm_cache = LLMCache(
+                        max_entries=getattr(args, "llm_cache_size", DEFAULT_LLM_CACHE_ENTRIES),
+                        ttl=getattr(args, "llm_cache_ttl", DEFAULT_LLM_CACHE_TTL_DAYS) * 86400,
+                    )
+                except (OSError, sqlite3.Error) as exc:
+                    writer.warning(f"LLM cache unavailable, not caching explanations: {exc}")
+                else:
+                    provider = CachingProvider(provider, llm_cache)
+            enricher = EnrichmentStage(provider, report, concurrency=concurrency, timeout=timeout)
+
+        def emit(findings):
+            # Each finding is counted and stored as soon as its file is done,
+            # and written then too unless it waits for an enrichment batch
+            # or --sort (spooled, not held in memory).
+            nonlocal baselined
+            for f in findings:
+                fp = fingerprint(f) if baseline is not None or store is not None else None
+                if baseline is not None and fp in baseline:
+                    baselined += 1
+                    continue
+
+                gate.observe(f.severity)
+                if store is not None:
+                    store.add(f, fingerprint.display_path(f.file), fp)
+
+                if enricher is not None:
+                    enricher.add(f)
+                else:
+                    report(f)
+
+        # --- Deterministic detection phase ---
+        if read_stdin:
+            data = read_stdin_bytes()
+            files_scanned += 1
+            limit = raw_size_limit(Path(args.stdin_filename), max_file_size)
+            try:
+                if limit and len(data) > limit:
+                    raise FileTooLargeError(Path(args.stdin_filename), len(data), limit)
+                emit(scan_source(data, args.stdin_filename, max_file_size=max_file_size))
+            except FileTooLargeError as exc:
+                writer.skipped(exc)
+
+        # Every file from every root goes through the engine's one executor, so
+        # roots are scanned in parallel with each other and reported together.
+        scan = engine.scan_paths(
+            roots,
+            max_file_size=max_file_size,
+            exclude=getattr(args, "exclude", None) or (),
+            use_gitignore=not getattr(args, "no_gitignore", False),
+            detect_scripts=not getattr(args, "no_scripts", False),
+            max_member_size=getattr(args, "max_archive_member_size", DEFAULT_MAX_MEMBER_SIZE),
+            max_total_size=getattr(args, "max_archive_size", DEFAULT_MAX_TOTAL_SIZE),
+        )
+        emit(scan)
+        files_scanned += scan.files_scanned
+
+        for exc in scan.skipped:
+            writer.skipped(exc)
+        for archive, error in scan.archive_errors:
+            writer.warning(f"Unable to read archive {archive}: {error}")
+
+        if environment is not None:
+            try:
+                env_result = scan_environment(environment or None, max_file_size=max_file_size)
+            except EnvironmentQueryError as exc:
+                writer.error(str(exc))
+                return 1
+
+            files_scanned += env_result.files
+            emit(env_result.findings)
+            for exc in env_result.skipped:
+                writer.skipped(exc)
+            writer.info(
+                f"Environment {env_result.python}: {env_result.distributions} "
+                f"distribution(s), {env_result.cached} unchanged since last scan"
+            )
+
+        if enricher is not None:
+            enricher.flush()
+            model_requests = enricher.requests
+            if isinstance(enricher.provider, CachingProvider):
+                model_requests = enricher.provider.requests
+            writer.info(
+                f"LLM: {model_requests} model request(s) for {enricher.findings} finding(s), "
+                f"{enricher.saved} saved by grouping"
+            )
+            if isinstance(enricher.provider, CachingProvider):
+                enricher.provider.cache.prune()
+                writer.info(f"LLM cache: {enricher.provider.cache.stats}")
+
+        if spool is not None:
+            for f in spool.drain():
+                writer.finding(f)
+
+        if baseline is not None:
+            writer.info(f"{gate.count} new finding(s), {baselined} baselined")
+
+        if store is not None:
+            store.finish_run(files_scanned, gate.count, baselined if baseline is not None else None)
+
+        # --- CI fail-on logic (deterministic, unaffected by LLM/output) ---
+        writer.finish(
+            ReviewSummary(
+                files_scanned=files_scanned,
+                total_findings=gate.count,
+                highest_severity=gate.highest,
+                failed=gate.tripped,
+                baselined=baselined if baseline is not None else None,
+            )
+        )
+
+        return 1 if gate.tripped else 0
+    finally:
+        # An unfinished run (an error part way) is rolled back.
+        if store is not None:
+            store.close()
+        if spool is not None:
+            spool.close()
+        if enricher is not None:
+            enricher.provider.close()
+
+
+def _location(f) -> str:
+    if f.cell is not None:
+        return f"{f.file}:cell {f.cell}:{f.line}"
+    return f"{f.file}:{f.line}"
+
+
+def print_watch_delta(delta):
+    for exc in delta.skipped:
+        print(f"[WARN] Skipped oversized file ({exc.size} bytes > {exc.limit}): {exc.path}")
+    for f in delta.new:
+        print(f"+ [{str(f.severity)}] {f.rule_id} {_location(f)} {f.title}")
+    for f in delta.resolved:
+        print(f"- [{str(f.severity)}] {f.rule_id} {_location(f)} {f.title}")
+
+
+def handle_watch(args):
+    from stone_sec.engine.watcher import Watcher
 
     target_path = Path(args.path)
 
@@ -78,83 +746,208 @@ def handle_review(args):
         print(f"[ERROR] Path does not exist: {target_path}")
         sys.exit(1)
 
-    python_files = discover_python_files(target_path)
+    watcher = Watcher(
+        target_path,
+        interval=args.interval,
+        debounce=args.debounce,
+        exclude=args.exclude or (),
+        use_gitignore=not args.no_gitignore,
+        detect_scripts=not args.no_scripts,
+        max_file_size=args.max_file_size,
+    )
+    initial = watcher.start()
 
-    if not python_files:
-        if args.format == "json":
-            print(findings_to_json([]))
-        else:
-            print("No Python files found.")
-        sys.exit(0)
+    mode = "inotify" if watcher.uses_inotify else "polling"
+    print(
+        f"Watching {target_path} ({watcher.file_count()} file(s), {mode}): "
+        f"{len(initial.new)} issue(s). Press Ctrl+C to stop.\n"
+    )
+    print_watch_delta(initial)
 
-    findings = []
+    def on_delta(delta):
+        print(
+            f"\n{len(delta.new)} new, {len(delta.resolved)} resolved "
+            f"({delta.rescanned} file(s) in {delta.elapsed * 1000:.1f} ms)"
+        )
+        print_watch_delta(delta)
+        sys.stdout.flush()
 
-    # --- Deterministic detection phase ---
-    for file_path in python_files:
-        tree = parse_python_file(file_path)
-        if tree is None:
-            continue
+    try:
+        watcher.run(on_delta)
+    except KeyboardInterrupt:
+        pass
 
-        findings.extend(run_rules(tree, file_path))
+    sys.exit(0)
 
-    if not findings:
-        if args.format == "json":
-            print(findings_to_json([]))
-        else:
-            print("No security issues found.")
+
+def handle_baseline(args):
+    from stone_sec.engine.baseline import Fingerprinter, baseline_entry, write_baseline
+    from stone_sec.engine.core import Engine
+
+    if args.baseline_command != "create":
+        print("[ERROR] Usage: stone-sec baseline create PATH [PATH ...]")
+        sys.exit(1)
+
+    roots = []
+    for target in args.paths:
+        target_path = Path(target)
+        if not target_path.exists():
+            print(f"[ERROR] Path does not exist: {target_path}")
+            sys.exit(1)
+        roots.append(target_path)
+
+    fingerprint = Fingerprinter(Path.cwd())
+    entries = []
+
+    with Engine(jobs=args.jobs, cache_results=False) as engine:
+        scan = engine.scan_paths(
+            roots,
+            max_file_size=args.max_file_size,
+            exclude=args.exclude or (),
+            use_gitignore=not args.no_gitignore,
+            detect_scripts=not args.no_scripts,
+        )
+        for f in scan:
+            entries.append(baseline_entry(f, fingerprint(f), fingerprint))
+
+    output = Path(args.output)
+    write_baseline(output, entries)
+    print(f"Wrote {len(entries)} finding(s) from {scan.files_scanned} file(s) to {output}")
+    sys.exit(0)
+
+
+def handle_query(args):
+    import json
+
+    from stone_sec.engine.store import FindingStore, StoreError
+
+    store_path = Path(args.store)
+
+    if not store_path.exists():
+        print(f"[ERROR] Path does not exist: {store_path}")
+        sys.exit(1)
+
+    try:
+        with FindingStore(store_path) as store:
+            rows = store.aggregate(
+                by=args.by,
+                rule=args.rule,
+                directory=args.dir,
+                since=args.since,
+                limit=args.limit,
+            )
+    except StoreError as exc:
+        print(f"[ERROR] {exc}")
+        sys.exit(1)
+
+    if args.format == "json":
+        data = [{args.by: key, "runs": runs, "findings": count} for key, runs, count in rows]
+        print(json.dumps(data, indent=2))
         sys.exit(0)
 
-    # --- Optional LLM enhancement (never affects severity/exit) ---
-    provider = None
-    if getattr(args, "provider", None) == "ollama":
-        provider = OllamaProvider()
+    if not rows:
+        print("No findings recorded.")
+        sys.exit(0)
+
+    width = max(len(args.by), *(len(key) for key, _, _ in rows))
+    print(f"{args.by:<{width}}  {'runs':>6}  {'findings':>9}")
+    for key, runs, count in rows:
+        print(f"{key:<{width}}  {runs:>6}  {count:>9}")
+
+    sys.exit(0)
+
+
+def handle_history(args):
+    from stone_sec.engine.history import GitError, scan_history
+    from stone_sec.output.json_formatter import history_to_json
 
-    if provider:
-        for f in findings:
-            prompt = build_prompt(f)
-            result = provider.generate(prompt)
+    repo_path = Path(args.repo)
 
-            f.explanation = result.get("explanation")
-            f.exploit_scenario = result.get("exploit_scenario")
-            f.remediation = result.get("remediation")
+    if not repo_path.exists():
+        print(f"[ERROR] Path does not exist: {repo_path}")
+        sys.exit(1)
+
+    try:
+        result = scan_history(repo_path, args.range)
+    except GitError as exc:
+        print(f"[ERROR] {exc}")
+        sys.exit(1)
 
-    # --- Output phase ---
     if args.format == "json":
-        print(findings_to_json(findings))
-    else:
-        print(f"Found {len(findings)} issue(s):\n")
-
-        for f in findings:
-            print(f"[{str(f.severity)}] {f.title}")
-            print(f"Rule: {f.rule_id}")
-            print(f"File: {f.file}")
-            print(f"Line: {f.line}")
-            print(f"Snippet: {f.snippet}")
-
-            if f.explanation:
-                print(f"Explanation: {f.explanation}")
-            if f.exploit_scenario:
-                print(f"Exploit: {f.exploit_scenario}")
-            if f.remediation:
-                print(f"Fix: {f.remediation}")
-
-            print()
-
-    # --- CI fail-on logic (deterministic, unaffected by LLM/output) ---
-    highest_severity = None
-    for f in findings:
-        if highest_severity is None or f.severity.value > highest_severity.value:
-            highest_severity = f.severity
-
-    if args.fail_on:
-        threshold = Severity.from_string(args.fail_on)
-        if highest_severity and highest_severity.value >= threshold.value:
-            sys.exit(1)
+        print(history_to_json(result))
+        sys.exit(0)
+
+    print(
+        f"Scanned {len(result.commits)} commit(s), "
+        f"{result.blobs_scanned} distinct blob(s).\n"
+    )
+
+    if not result.findings:
+        print("No security issues found.")
+        sys.exit(0)
+
+    print(f"Found {len(result.findings)} issue(s):\n")
+
+    for h in result.findings:
+        f = h.finding
+        print(f"[{str(f.severity)}] {f.title}")
+        print(f"Rule: {f.rule_id}")
+        print(f"File: {f.file}")
+        if f.cell is not None:
+            print(f"Cell: {f.cell}")
+        print(f"Line: {f.line}")
+        print(f"First seen: {h.first_seen[:12]}")
+        print(f"Last seen: {h.last_seen[:12]}")
+        print()
+
+    sys.exit(0)
+
+
+def handle_llm_cache(args):
+    import sqlite3
+
+    from stone_sec.llm.cache import LLMCache, default_cache_path
+
+    path = default_cache_path()
+    if not path.exists():
+        print(f"No LLM cache at {path}")
+        sys.exit(0)
+
+    # Inspecting or clearing the cache must not apply the default TTL and
+    # size limits; those belong to the review that set them.
+    try:
+        cache = LLMCache(path)
+    except (OSError, sqlite3.Error) as exc:
+        print(f"[ERROR] Unable to open LLM cache {path}: {exc}")
+        sys.exit(1)
+    try:
+        if args.action == "clear":
+            cache.clear()
+            print(f"Cleared LLM cache {path}")
+        else:
+            size = sum(p.stat().st_size for p in path.parent.glob(path.name + "*"))
+            print(f"LLM cache {path}: {len(cache)} answer(s), {size / 1024:.1f} KiB")
+    finally:
+        cache.close(prune=False)
 
     sys.exit(0)
 
 
+def handle_lsp(args):
+    from stone_sec.lsp.server import run_stdio_server
+
+    sys.exit(run_stdio_server(debounce=args.debounce))
+
+
+def handle_serve(args):
+    from stone_sec.daemon import serve
+
+    sys.exit(serve(socket_path=args.socket, idle_timeout=args.idle_timeout))
+
+
 def handle_version(args):
+    from importlib.metadata import version, PackageNotFoundError
+
     try:
         v = version("stone-sec")
     except PackageNotFoundError:
@@ -173,6 +966,27 @@ def main():
     if args.command == "review":
         handle_review(args)
 
+    elif args.command == "lsp":
+        handle_lsp(args)
+
+    elif args.command == "serve":
+        handle_serve(args)
+
+    elif args.command == "watch":
+        handle_watch(args)
+
+    elif args.command == "baseline":
+        handle_baseline(args)
+
+    elif args.command == "query":
+        handle_query(args)
+
+    elif args.command == "history":
+        handle_history(args)
+
+    elif args.command == "llm-cache":
+        handle_llm_cache(args)
+
     elif args.command == "version":
         handle_version(args)
 
@@ -0,0 +1,340 @@
+import json
+import multiprocessing
+import os
+import socket
+import socketserver
+import stat
+import struct
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+from stone_sec.engine.core import Engine
+
+DEFAULT_IDLE_TIMEOUT = 900.0
+STARTUP_TIMEOUT = 5.0
+
+
+def default_socket_path() -> Path:
+    """
+    `$XDG_RUNTIME_DIR/stone-sec-UID.sock`, or a socket in a private
+    `stone-sec-UID` directory under the temporary directory.
+    """
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return Path(runtime_dir) / f"stone-sec-{os.getuid()}.sock"
+    return Path(tempfile.gettempdir()) / f"stone-sec-{os.getuid()}" / "server.sock"
+
+
+def ensure_private_dir(path: Path):
+    """
+    Create `path` with mode 0700, or check that the existing directory is
+    owned by the current user and closed to everyone else, so no other
+    local user can plant a socket in it. Raises `PermissionError` if not.
+    """
+    try:
+        os.mkdir(path, 0o700)
+    except FileExistsError:
+        pass
+
+    st = os.lstat(path)
+    if not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid() or st.st_mode & 0o077:
+        raise PermissionError(f"{path} is not a private directory of the current user")
+
+
+def _owned_socket(path: Path) -> bool:
+    try:
+        st = os.lstat(path)
+    except OSError:
+        return False
+    return stat.S_ISSOCK(st.st_mode) and st.st_uid == os.getuid()
+
+
+def _peer_uid(sock: socket.socket) -> Optional[int]:
+    """
+    UID of the process on the other end, where the platform reports it.
+    """
+    if not hasattr(socket, "SO_PEERCRED"):
+        return None
+    creds = sock.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i"))
+    return struct.unpack("3i", creds)[1]
+
+
+class _MessageWriter:
+    """
+    File-like object that forwards report text to the client as
+    newline-delimited JSON messages.
+    """
+
+    def __init__(self, wfile):
+        self._wfile = wfile
+        self._buffer: List[str] = []
+
+    def write(self, text: str) -> int:
+        self._buffer.append(text)
+        if "\n" in text:
+            self.flush()
+        return len(text)
+
+    def flush(self):
+        if not self._buffer:
+            return
+        self.send({"out": "".join(self._buffer)})
+        self._buffer = []
+
+    def send(self, message: dict):
+        self._wfile.write(json.dumps(message).encode("utf-8") + b"\n")
+        self._wfile.flush()
+
+
+class _ReviewHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        from stone_sec.cli import create_parser, run_review
+
+        self.server.request_started()
+        writer = _MessageWriter(self.wfile)
+
+        try:
+            request = json.loads(self.rfile.readline())
+
+            try:
+                args = create_parser().parse_args(request["argv"])
+            except SystemExit as exc:
+                writer.send({"exit": exc.code if isinstance(exc.code, int) else 1})
+                return
+
+            code = run_review(
+                args,
+                writer,
+                engine=self.server.engine,
+                cwd=Path(request["cwd"]),
+            )
+            writer.flush()
+            writer.send({"exit": code})
+        except (OSError, ValueError, KeyError):
+            # Client went away or sent garbage; nothing to report back.
+            pass
+        finally:
+            self.server.request_finished()
+
+
+class ReviewServer(socketserver.UnixStreamServer):
+    """
+    Unix socket server that keeps one `Engine` (compiled rules, result
+    cache, scan worker pool) and a request thread pool warm across requests.
+    """
+
+    def __init__(self, socket_path: str, idle_timeout: float, workers: Optional[int] = None):
+        super().__init__(socket_path, _ReviewHandler)
+        self.idle_timeout = idle_timeout
+        # Forking a threaded server is unsafe; workers come from a forkserver.
+        context = (
+            multiprocessing.get_context("forkserver")
+            if "forkserver" in multiprocessing.get_all_start_methods()
+            else None
+        )
+        self.engine = Engine(mp_context=context)
+        self._pool = ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 4)
+        self._active = 0
+        self._last_activity = time.monotonic()
+        self._state_lock = threading.Lock()
+
+    def process_request(self, request, client_address):
+        self._pool.submit(self._process_request_in_worker, request, client_address)
+
+    def _process_request_in_worker(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def request_started(self):
+        with self._state_lock:
+            self._active += 1
+            self._last_activity = time.monotonic()
+
+    def request_finished(self):
+        with self._state_lock:
+            self._active -= 1
+            self._last_activity = time.monotonic()
+
+    def is_idle(self) -> bool:
+        with self._state_lock:
+            return (
+                self._active == 0
+                and time.monotonic() - self._last_activity >= self.idle_timeout
+            )
+
+    def server_close(self):
+        super().server_close()
+        self._pool.shutdown(wait=False)
+        self.engine.close()
+
+
+def _connect(path: Path) -> Optional[socket.socket]:
+    """
+    Connect to a server run by the current user; a socket owned or served
+    by anyone else is never trusted with a request.
+    """
+    if not _owned_socket(path):
+        return None
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(str(path))
+        uid = _peer_uid(sock)
+    except OSError:
+        sock.close()
+        return None
+
+    if uid is not None and uid != os.getuid():
+        sock.close()
+        return None
+    return sock
+
+
+def serve(
+    socket_path: Optional[str] = None,
+    idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+    workers: Optional[int] = None,
+) -> int:
+    path = Path(socket_path) if socket_path else default_socket_path()
+
+    try:
+        if not socket_path:
+            ensure_private_dir(path.parent)
+    except OSError as exc:
+        print(f"[ERROR] Unable to listen on {path}: {exc}")
+        return 1
+
+    if os.path.lexists(path):
+        existing = _connect(path)
+        if existing is not None:
+            existing.close()
+            print(f"[ERROR] stone-sec server already running on {path}")
+            return 1
+        # Stale socket left behind by a crashed server.
+        try:
+            path.unlink()
+        except OSError as exc:
+            print(f"[ERROR] Unable to remove stale socket {path}: {exc}")
+            return 1
+
+    old_umask = os.umask(0o177)
+    try:
+        server = ReviewServer(str(path), idle_timeout=idle_timeout, workers=workers)
+    except OSError as exc:
+        print(f"[ERROR] Unable to listen on {path}: {exc}")
+        return 1
+    finally:
+        os.umask(old_umask)
+
+    def watchdog():
+        while not stopped.wait(1.0):
+            if server.is_idle():
+                server.shutdown()
+                return
+
+    stopped = threading.Event()
+    threading.Thread(target=watchdog, daemon=True).start()
+
+    try:
+        server.serve_forever(poll_interval=0.5)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stopped.set()
+        server.server_close()
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+    return 0
+
+
+def _spawn_server(path: Path):
+    package_root = str(Path(__file__).resolve().parent.parent)
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        p for p in (package_root, env.get("PYTHONPATH")) if p
+    )
+
+    subprocess.Popen(
+        [sys.executable, "-m", "stone_sec", "serve", "--socket", str(path)],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+        close_fds=True,
+        env=env,
+    )
+
+
+def _connect_or_start(path: Path) -> Optional[socket.socket]:
+    sock = _connect(path)
+    if sock is not None:
+        return sock
+    if os.path.lexists(path) and not _owned_socket(path):
+        # Someone else's file; a server of ours could not replace it.
+        return None
+
+    _spawn_server(path)
+
+    deadline = time.monotonic() + STARTUP_TIMEOUT
+    while time.monotonic() < deadline:
+        time.sleep(0.05)
+        sock = _connect(path)
+        if sock is not None:
+            return sock
+
+    return None
+
+
+def review_via_daemon(
+    argv: Sequence[str],
+    socket_path: Optional[str] = None,
+    out=None,
+) -> int:
+    """
+    Send a review request to the stone-sec server and stream its report.
+
+    Starts the server on first use. If it cannot be reached, the review
+    runs in-process so the caller always gets a result.
+    """
+    out = out or sys.stdout
+    path = Path(socket_path) if socket_path else default_socket_path()
+
+    try:
+        if not socket_path:
+            ensure_private_dir(path.parent)
+        sock = _connect_or_start(path)
+    except OSError:
+        sock = None
+    if sock is None:
+        from stone_sec.cli import create_parser, run_review
+
+        return run_review(create_parser().parse_args(list(argv)), out)
+
+    with sock, sock.makefile("rwb") as stream:
+        request = {"argv": list(argv), "cwd": os.getcwd()}
+        stream.write(json.dumps(request).encode("utf-8") + b"\n")
+        stream.flush()
+
+        for line in stream:
+            message = json.loads(line)
+            if "out" in message:
+                out.write(message["out"])
+                out.flush()
+            elif "exit" in message:
+                return message["exit"]
+
+    print("[ERROR] stone-sec server closed the connection unexpectedly", file=out)
+    return 1
@@ -0,0 +1,21 @@
+"""
+Default limits and settings shared by the CLI and the modules that apply
+them. Kept free of imports so the CLI can build its parser without loading
+the engine.
+"""
+
+# Generated modules above this size are reported and skipped, not parsed.
+DEFAULT_MAX_FILE_SIZE = 5 * 1024 * 1024
+
+DEFAULT_MAX_MEMBER_SIZE = 5 * 1024 * 1024
+DEFAULT_MAX_TOTAL_SIZE = 256 * 1024 * 1024
+
+DEFAULT_BASELINE_FILE = ".stone-sec-baseline.json"
+
+DEFAULT_LLM_CONCURRENCY = 4
+
+# Seconds one LLM request may take before a generic explanation is used.
+DEFAULT_LLM_TIMEOUT = 120.0
+
+DEFAULT_LLM_CACHE_ENTRIES = 50_000
+DEFAULT_LLM_CACHE_TTL_DAYS = 30.0
@@ -0,0 +1,163 @@
+import tarfile
+import zipfile
+import zlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import BinaryIO, Iterator, List, Optional, Tuple
+
+from stone_sec.defaults import DEFAULT_MAX_MEMBER_SIZE, DEFAULT_MAX_TOTAL_SIZE
+from stone_sec.engine.parser import parse_python_source
+from stone_sec.engine.rules.runner import run_rules
+from stone_sec.engine.snippets import attach_snippets
+from stone_sec.engine.source import FileTooLargeError
+from stone_sec.engine.suppressions import filter_suppressed
+from stone_sec.models.finding import Finding
+
+ZIP_SUFFIXES = (".whl", ".zip")
+TAR_SUFFIXES = (".tar.gz", ".tgz", ".tar.bz2", ".tar.xz", ".tar")
+ARCHIVE_SUFFIXES = ZIP_SUFFIXES + TAR_SUFFIXES
+
+CHUNK_SIZE = 64 * 1024
+
+
+def is_archive(path: Path) -> bool:
+    return path.name.lower().endswith(ARCHIVE_SUFFIXES)
+
+
+def member_path(archive: Path, member: str) -> Path:
+    """
+    Display path of an archive member: `archive!member`.
+    """
+    return Path(f"{archive}!{member}")
+
+
+@dataclass
+class ArchiveResult:
+    archive: Path
+    findings: List[Finding] = field(default_factory=list)
+    skipped: List[FileTooLargeError] = field(default_factory=list)
+    members_scanned: int = 0
+    error: Optional[str] = None
+
+
+class _SizeBudget:
+    def __init__(self, archive: Path, max_member_size: int, max_total_size: int):
+        self.archive = archive
+        self.max_member_size = max_member_size
+        self.max_total_size = max_total_size
+        self.used = 0
+
+    def read(self, stream: BinaryIO, member: str) -> bytes:
+        """
+        Read one member, enforcing both limits on the bytes actually
+        decompressed rather than on sizes declared in archive headers.
+        """
+        chunks = []
+        size = 0
+
+        while True:
+            chunk = stream.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            size += len(chunk)
+            self.used += len(chunk)
+
+            if self.max_member_size and size > self.max_member_size:
+                raise FileTooLargeError(
+                    member_path(self.archive, member), size, self.max_member_size
+                )
+            if self.max_total_size and self.used > self.max_total_size:
+                raise _TotalBudgetExceeded(
+                    FileTooLargeError(self.archive, self.used, self.max_total_size)
+                )
+            chunks.append(chunk)
+
+        return b"".join(chunks)
+
+
+class _TotalBudgetExceeded(Exception):
+    def __init__(self, error: FileTooLargeError):
+        super().__init__(str(error))
+        self.error = error
+
+
+# (member name, source bytes or None, reason the member was skipped or None)
+_Member = Tuple[str, Optional[bytes], Optional[FileTooLargeError]]
+
+
+def _read_member(budget: _SizeBudget, name: str, declared_size: int, open_stream) -> _Member:
+    # Cheap rejection on the declared size; _SizeBudget still guards against
+    # headers that under-report.
+    if budget.max_member_size and declared_size > budget.max_member_size:
+        error = FileTooLargeError(
+            member_path(budget.archive, name), declared_size, budget.max_member_size
+        )
+        return name, None, error
+
+    stream = open_stream()
+    if stream is None:
+        return name, None, None
+
+    with stream:
+        try:
+            return name, budget.read(stream, name), None
+        except FileTooLargeError as error:
+            return name, None, error
+
+
+def _iter_zip_members(archive: Path, budget: _SizeBudget) -> Iterator[_Member]:
+    with zipfile.ZipFile(archive) as zf:
+        for info in zf.infolist():
+            if info.is_dir() or not info.filename.endswith(".py"):
+                continue
+            yield _read_member(budget, info.filename, info.file_size, lambda: zf.open(info))
+
+
+def _iter_tar_members(archive: Path, budget: _SizeBudget) -> Iterator[_Member]:
+    # Stream mode ("r|*") reads members sequentially without seeking.
+    with tarfile.open(archive, mode="r|*") as tf:
+        for member in tf:
+            if not member.isfile() or not member.name.endswith(".py"):
+                continue
+            yield _read_member(budget, member.name, member.size, lambda: tf.extractfile(member))
+
+
+def scan_archive(
+    archive: Path,
+    max_member_size: int = DEFAULT_MAX_MEMBER_SIZE,
+    max_total_size: int = DEFAULT_MAX_TOTAL_SIZE,
+) -> ArchiveResult:
+    """
+    Scan the `.py` members of a wheel, zip or tarball in place.
+
+    Members are streamed from `zipfile`/`tarfile` straight into the parser;
+    nothing is extracted to disk. Oversized members are skipped and
+    reported; exceeding the total budget stops the archive.
+    """
+    result = ArchiveResult(archive=archive)
+    budget = _SizeBudget(archive, max_member_size, max_total_size)
+    iter_members = (
+        _iter_zip_members if archive.name.lower().endswith(ZIP_SUFFIXES) else _iter_tar_members
+    )
+
+    try:
+        for name, data, error in iter_members(archive, budget):
+            if error is not None:
+                result.skipped.append(error)
+                continue
+            if data is None:
+                continue
+
+            result.members_scanned += 1
+            display = member_path(archive, name)
+            tree = parse_python_source(data, filename=str(display))
+            if tree is not None:
+                findings = filter_suppressed(run_rules(tree, display), data)
+                attach_snippets(findings, data)
+                result.findings.extend(findings)
+    except _TotalBudgetExceeded as exc:
+        result.skipped.append(exc.error)
+    except (zipfile.BadZipFile, tarfile.TarError, zlib.error, EOFError, OSError) as exc:
+        result.error = f"{type(exc).__name__}: {exc}"
+
+    return result
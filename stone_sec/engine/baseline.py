@@ -0,0 +1,119 @@
+import hashlib
+import json
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from stone_sec.cache import atomic_write_bytes
+from stone_sec.defaults import DEFAULT_BASELINE_FILE
+from stone_sec.models.finding import Finding
+
+BASELINE_VERSION = 1
+
+
+class BaselineError(Exception):
+    pass
+
+
+def normalize_code(text: str) -> str:
+    """
+    Code with whitespace runs collapsed, so re-indenting or re-spacing a
+    line keeps its fingerprint.
+    """
+    return " ".join(text.split())
+
+
+class Fingerprinter:
+    """
+    Stable fingerprints for findings, built from the rule ID, the file path
+    relative to `base` and the normalized flagged code.
+
+    Line numbers are left out so findings keep their fingerprint when code
+    above them moves. Identical code flagged by the same rule in one file is
+    told apart by its occurrence number. Findings must arrive grouped by
+    file, as a review reports them.
+    """
+
+    def __init__(self, base: Path):
+        self.base = base.resolve()
+        self._file: Optional[Path] = None
+        self._display = ""
+        self._seen: Dict[Tuple[str, str], int] = {}
+
+    def relative_path(self, file: Path) -> str:
+        if not file.is_absolute():
+            return file.as_posix()
+        try:
+            return file.relative_to(self.base).as_posix()
+        except ValueError:
+            return file.as_posix()
+
+    def display_path(self, file: Path) -> str:
+        """
+        `relative_path` of `file`, computed once per file.
+        """
+        if file is not self._file and file != self._file:
+            self._file = file
+            self._display = self.relative_path(file)
+            self._seen = {}
+        return self._display
+
+    def __call__(self, f: Finding) -> str:
+        display = self.display_path(f.file)
+        key = (f.rule_id, normalize_code(f.snippet))
+        occurrence = self._seen.get(key, 0)
+        self._seen[key] = occurrence + 1
+
+        payload = "\0".join((f.rule_id, display, key[1], str(occurrence)))
+        return hashlib.sha256(payload.encode("utf-8", errors="surrogateescape")).hexdigest()[:32]
+
+
+class Baseline:
+    """
+    Fingerprints of accepted findings; membership is a set lookup.
+    """
+
+    def __init__(self, fingerprints: Iterable[str] = ()):
+        self.fingerprints: Set[str] = set(fingerprints)
+
+    def __contains__(self, fingerprint: str) -> bool:
+        return fingerprint in self.fingerprints
+
+    def __len__(self) -> int:
+        return len(self.fingerprints)
+
+    @classmethod
+    def load(cls, path: Path) -> "Baseline":
+        try:
+            with open(path, "rb") as f:
+                data = json.load(f)
+        except OSError as exc:
+            raise BaselineError(f"Unable to read baseline {path}: {exc}")
+        except ValueError as exc:
+            raise BaselineError(f"Invalid baseline {path}: {exc}")
+
+        if not isinstance(data, dict) or data.get("version") != BASELINE_VERSION:
+            raise BaselineError(f"Unsupported baseline format: {path}")
+
+        try:
+            return cls(entry["fingerprint"] for entry in data["findings"])
+        except (KeyError, TypeError):
+            raise BaselineError(f"Invalid baseline {path}: malformed findings")
+
+
+def baseline_entry(f: Finding, fingerprint: str, fingerprinter: Fingerprinter) -> dict:
+    return {
+        "fingerprint": fingerprint,
+        "rule_id": f.rule_id,
+        "file": fingerprinter.relative_path(f.file),
+        "line": f.line,
+    }
+
+
+def write_baseline(path: Path, entries: List[dict]):
+    """
+    Write a baseline file; entries are sorted so regenerating an unchanged
+    baseline gives an identical file.
+    """
+    entries = sorted(entries, key=lambda e: (e["file"], e["line"], e["rule_id"], e["fingerprint"]))
+    data = {"version": BASELINE_VERSION, "findings": entries}
+    atomic_write_bytes(path, (json.dumps(data, indent=1) + "\n").encode("utf-8"))
@@ -0,0 +1,218 @@
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from stone_sec.engine.archives import DEFAULT_MAX_MEMBER_SIZE, DEFAULT_MAX_TOTAL_SIZE
+from stone_sec.engine.executor import ScanExecutor
+from stone_sec.engine.pipeline import raw_size_limit, scan_file, scan_source
+from stone_sec.engine.scanner import dedupe_roots, discover_python_files
+from stone_sec.engine.shebang import ShebangCache
+from stone_sec.engine.source import DEFAULT_MAX_FILE_SIZE, FileTooLargeError
+from stone_sec.models.finding import Finding
+
+MAX_CACHED_FILES = 100_000
+
+FileSignature = Tuple[int, int]
+
+
+class FileResultCache:
+    """
+    Per-file findings keyed by (mtime_ns, size), shared by all scans.
+
+    Callers get copies, so LLM enrichment on one request never leaks into
+    the cached results of another.
+    """
+
+    def __init__(self, max_entries: int = MAX_CACHED_FILES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Path, Tuple[FileSignature, List[Finding]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def lookup(
+        self, path: Path, max_file_size: Optional[int] = DEFAULT_MAX_FILE_SIZE
+    ) -> Tuple[Optional[FileSignature], Optional[List[Finding]]]:
+        """
+        Return `(signature, findings)`; findings are None on a miss and the
+        signature is None when the file cannot be stat'ed.
+        """
+        try:
+            st = path.stat()
+        except OSError:
+            return None, None
+        signature = (st.st_mtime_ns, st.st_size)
+
+        limit = raw_size_limit(path, max_file_size)
+        if limit and st.st_size > limit:
+            raise FileTooLargeError(path, st.st_size, limit)
+
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry[0] == signature:
+                self._entries.move_to_end(path)
+                return signature, [f.replace() for f in entry[1]]
+
+        return signature, None
+
+    def store(self, path: Path, signature: FileSignature, findings: List[Finding]):
+        with self._lock:
+            self._entries[path] = (signature, findings)
+            self._entries.move_to_end(path)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def scan(self, path: Path, max_file_size: Optional[int] = DEFAULT_MAX_FILE_SIZE) -> List[Finding]:
+        signature, findings = self.lookup(path, max_file_size)
+        if findings is not None:
+            return findings
+        if signature is None:
+            return []
+
+        findings = scan_file(path, max_file_size)
+        self.store(path, signature, findings)
+        return [f.replace() for f in findings]
+
+
+class PathScan:
+    """
+    Iterator over the findings of one `Engine.scan_paths` call.
+
+    The counters and lists fill in as the iterator is consumed.
+    """
+
+    def __init__(self):
+        self.files_scanned = 0
+        self.skipped: List[FileTooLargeError] = []
+        # (archive, error message) for archives that could not be read
+        self.archive_errors: List[Tuple[Path, str]] = []
+        self._findings: Iterator[Finding] = iter(())
+
+    def __iter__(self) -> Iterator[Finding]:
+        return self._findings
+
+
+class Engine:
+    """
+    A reusable scanner for embedding and long-lived services.
+
+    The rule set is compiled once per process (`compiled_rules`), and
+    per-file results, shebang detection and the worker pool are kept warm
+    between calls. An `Engine` is safe to share across threads: per-call
+    state lives in the returned iterators, and the shared caches and pool
+    are thread-safe. One-shot callers can pass `cache_results=False`.
+
+        with Engine() as engine:
+            for finding in engine.scan_paths(["src/"]):
+                ...
+    """
+
+    def __init__(
+        self,
+        jobs: Optional[int] = None,
+        cache_results: bool = True,
+        result_cache: Optional[FileResultCache] = None,
+        shebang_cache: Optional[ShebangCache] = None,
+        mp_context=None,
+    ):
+        self.jobs = jobs or os.cpu_count() or 1
+        self.result_cache = result_cache
+        if self.result_cache is None and cache_results:
+            self.result_cache = FileResultCache()
+        self._shebang_cache = shebang_cache
+        self._mp_context = mp_context
+        self._pool: Optional[Executor] = None
+        self._lock = threading.Lock()
+
+    def _get_pool(self) -> Executor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.jobs, mp_context=self._mp_context
+                )
+            return self._pool
+
+    def _shebangs(self) -> ShebangCache:
+        with self._lock:
+            if self._shebang_cache is None:
+                self._shebang_cache = ShebangCache.load()
+            return self._shebang_cache
+
+    def scan_source(self, source: Union[str, bytes], filename: str = "<string>") -> Iterator[Finding]:
+        """
+        Findings for source code held in memory (see `stone_sec.scan_source`).
+        """
+        return iter(scan_source(source, filename))
+
+    def scan_sources(self, sources: Iterable[Tuple[Union[str, bytes], str]]) -> Iterator[Finding]:
+        for source, filename in sources:
+            yield from scan_source(source, filename)
+
+    def scan_paths(
+        self,
+        paths: Sequence[Union[str, Path]],
+        max_file_size: Optional[int] = DEFAULT_MAX_FILE_SIZE,
+        exclude: Sequence[str] = (),
+        use_gitignore: bool = True,
+        detect_scripts: bool = True,
+        max_member_size: int = DEFAULT_MAX_MEMBER_SIZE,
+        max_total_size: int = DEFAULT_MAX_TOTAL_SIZE,
+    ) -> PathScan:
+        """
+        Scan files, directories and archives; overlapping paths are scanned
+        once. Findings are yielded in discovery order, each batch of files
+        as soon as it is done.
+        """
+        scan = PathScan()
+        executor = ScanExecutor(
+            jobs=self.jobs,
+            max_file_size=max_file_size,
+            max_member_size=max_member_size,
+            max_total_size=max_total_size,
+            cache=self.result_cache,
+            pool_factory=self._get_pool,
+        )
+        shebangs = self._shebangs() if detect_scripts else None
+
+        def collect(results) -> Iterator[Finding]:
+            for result in results:
+                scan.skipped.extend(result.skipped)
+                error = getattr(result, "error", None)
+                if error:
+                    scan.archive_errors.append((result.archive, error))
+                yield from result.findings
+
+        def findings() -> Iterator[Finding]:
+            for root in dedupe_roots([Path(p) for p in paths]):
+                for path in discover_python_files(
+                    root,
+                    exclude=exclude,
+                    use_gitignore=use_gitignore,
+                    detect_scripts=detect_scripts,
+                    shebang_cache=shebangs,
+                    include_archives=True,
+                ):
+                    scan.files_scanned += 1
+                    executor.submit(path)
+                    # Hand out finished batches while discovery continues.
+                    yield from collect(executor.ready())
+
+            yield from collect(executor.results())
+
+        scan._findings = findings()
+        return scan
+
+    def close(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(cancel_futures=True)
+                self._pool = None
+            if self._shebang_cache is not None:
+                self._shebang_cache.save()
+
+    def __enter__(self) -> "Engine":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
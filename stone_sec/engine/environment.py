@@ -0,0 +1,238 @@
+import hashlib
+import json
+import re
+import subprocess
+import sys
+from dataclasses import dataclass, field
+from functools import lru_cache
+from importlib import metadata
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+from stone_sec.cache import atomic_write_bytes, cache_dir
+from stone_sec.engine.pipeline import scan_file
+from stone_sec.engine.rules.runner import rule_table
+from stone_sec.engine.source import DEFAULT_MAX_FILE_SIZE, FileTooLargeError
+from stone_sec.models.finding import Finding
+from stone_sec.output.json_formatter import finding_from_dict, finding_to_dict
+
+# Bump when the scan pipeline changes in a way `pipeline_fingerprint` cannot
+# see, so cached per-distribution results are not reused.
+CACHE_VERSION = 3
+
+
+class EnvironmentQueryError(Exception):
+    pass
+
+
+@dataclass
+class EnvironmentResult:
+    python: str
+    distributions: int = 0
+    # Python files of every distribution, whether scanned now or cached.
+    files: int = 0
+    cached: int = 0
+    findings: List[Finding] = field(default_factory=list)
+    skipped: List[FileTooLargeError] = field(default_factory=list)
+
+
+def interpreter_paths(python: Optional[str] = None) -> List[str]:
+    """
+    `sys.path` of the target interpreter; the running one when `python` is None.
+    """
+    if not python:
+        return list(sys.path)
+
+    try:
+        proc = subprocess.run(
+            [python, "-c", "import json, sys; print(json.dumps(sys.path))"],
+            capture_output=True,
+            text=True,
+            timeout=30,
+        )
+    except (OSError, subprocess.TimeoutExpired) as exc:
+        raise EnvironmentQueryError(f"Unable to run {python}: {exc}") from exc
+
+    if proc.returncode != 0:
+        raise EnvironmentQueryError(f"Unable to query {python}: {proc.stderr.strip()}")
+
+    return json.loads(proc.stdout)
+
+
+@lru_cache(maxsize=None)
+def pipeline_fingerprint() -> str:
+    """
+    Identifies the code that produced cached findings: the stone-sec version,
+    `CACHE_VERSION` and the rule table, so a release or a rule change
+    invalidates every cached result without a manual bump.
+    """
+    try:
+        tool_version = metadata.version("stone-sec")
+    except metadata.PackageNotFoundError:
+        tool_version = "unknown"
+
+    rules = [f"{rule_id}={cls.__module__}.{cls.__qualname__}" for rule_id, cls in rule_table()]
+    payload = "\n".join([tool_version, str(CACHE_VERSION)] + rules)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+
+def _normalize_name(name: str) -> str:
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+def iter_distributions(paths: List[str]) -> Iterator[metadata.Distribution]:
+    """
+    Installed distributions on `paths`, first occurrence of each name winning
+    as it would on import.
+    """
+    seen = set()
+    for dist in metadata.distributions(path=paths):
+        name = dist.metadata["Name"]
+        if not name:
+            continue
+        key = _normalize_name(name)
+        if key in seen:
+            continue
+        seen.add(key)
+        yield dist
+
+
+def _python_files(dist: metadata.Distribution) -> List[Path]:
+    return [
+        Path(dist.locate_file(f))
+        for f in (dist.files or [])
+        if f.suffix == ".py"
+    ]
+
+
+def _record_hash(dist: metadata.Distribution, files: List[Path]) -> str:
+    digest = hashlib.sha256()
+    record = dist.read_text("RECORD")
+
+    if record is not None:
+        digest.update(record.encode("utf-8"))
+    else:
+        # Legacy or editable installs without RECORD: fall back to stat data.
+        for path in files:
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            digest.update(f"{path}\0{st.st_size}\0{st.st_mtime_ns}\n".encode("utf-8"))
+
+    return digest.hexdigest()
+
+
+class DistributionCache:
+    """
+    On-disk findings per distribution, keyed by name, version and a hash of
+    its RECORD. An unchanged distribution is never re-read.
+
+    Files skipped for size are stored too, and results are only reused
+    under the same `max_file_size` they were produced with.
+    """
+
+    def __init__(self, directory: Optional[Path] = None):
+        self.directory = directory or cache_dir() / "environment"
+
+    def _path(self, name: str, version: str, record_hash: str) -> Path:
+        safe = re.sub(r"[^A-Za-z0-9.]+", "_", f"{_normalize_name(name)}-{version}")
+        return self.directory / f"{safe}-{record_hash[:32]}.json"
+
+    def get(
+        self,
+        name: str,
+        version: str,
+        record_hash: str,
+        max_file_size: Optional[int],
+    ) -> Optional[Tuple[List[Finding], List[FileTooLargeError]]]:
+        try:
+            data = json.loads(self._path(name, version, record_hash).read_bytes())
+        except (OSError, ValueError):
+            return None
+
+        if (
+            data.get("pipeline") != pipeline_fingerprint()
+            or data.get("record_hash") != record_hash
+            or data.get("max_file_size") != max_file_size
+        ):
+            return None
+
+        findings = [finding_from_dict(item) for item in data["findings"]]
+        skipped = [
+            FileTooLargeError(Path(item["path"]), item["size"], item["limit"])
+            for item in data["skipped"]
+        ]
+        return findings, skipped
+
+    def put(
+        self,
+        name: str,
+        version: str,
+        record_hash: str,
+        max_file_size: Optional[int],
+        findings: List[Finding],
+        skipped: List[FileTooLargeError],
+    ):
+        data = {
+            "pipeline": pipeline_fingerprint(),
+            "name": name,
+            "version": version,
+            "record_hash": record_hash,
+            "max_file_size": max_file_size,
+            "findings": [finding_to_dict(f) for f in findings],
+            "skipped": [
+                {"path": str(exc.path), "size": exc.size, "limit": exc.limit} for exc in skipped
+            ],
+        }
+        try:
+            atomic_write_bytes(
+                self._path(name, version, record_hash), json.dumps(data).encode("utf-8")
+            )
+        except OSError:
+            pass
+
+
+def scan_environment(
+    python: Optional[str] = None,
+    cache: Optional[DistributionCache] = None,
+    max_file_size: Optional[int] = DEFAULT_MAX_FILE_SIZE,
+    paths: Optional[List[str]] = None,
+) -> EnvironmentResult:
+    """
+    Scan every installed distribution of an interpreter's environment.
+
+    Only distributions that are new or whose RECORD changed are scanned;
+    the rest are served from the per-distribution cache.
+    """
+    cache = cache or DistributionCache()
+    result = EnvironmentResult(python=python or sys.executable)
+
+    for dist in iter_distributions(paths if paths is not None else interpreter_paths(python)):
+        name = dist.metadata["Name"]
+        version = dist.version or "0"
+        files = _python_files(dist)
+        record_hash = _record_hash(dist, files)
+        result.distributions += 1
+        result.files += len(files)
+
+        cached = cache.get(name, version, record_hash, max_file_size)
+        if cached is not None:
+            result.cached += 1
+            result.findings.extend(cached[0])
+            result.skipped.extend(cached[1])
+            continue
+
+        findings: List[Finding] = []
+        skipped: List[FileTooLargeError] = []
+        for path in files:
+            try:
+                findings.extend(scan_file(path, max_file_size))
+            except FileTooLargeError as exc:
+                skipped.append(exc)
+
+        cache.put(name, version, record_hash, max_file_size, findings, skipped)
+        result.findings.extend(findings)
+        result.skipped.extend(skipped)
+
+    return result
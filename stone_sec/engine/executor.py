@@ -0,0 +1,217 @@
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from pathlib import Path
+from typing import Callable, Deque, Dict, Iterator, List, Optional, Tuple, Union
+
+from stone_sec.engine.archives import (
+    DEFAULT_MAX_MEMBER_SIZE,
+    DEFAULT_MAX_TOTAL_SIZE,
+    ArchiveResult,
+    is_archive,
+    scan_archive,
+)
+from stone_sec.engine.pipeline import scan_file
+from stone_sec.engine.source import DEFAULT_MAX_FILE_SIZE, FileTooLargeError
+from stone_sec.models.finding import Finding
+
+# Files per pool task; large enough to amortize pickling and IPC per task.
+BATCH_SIZE = 32
+
+
+@dataclass
+class FileBatchResult:
+    paths: List[Path]
+    # Findings of each path, aligned with `paths`.
+    per_file: List[List[Finding]] = field(default_factory=list)
+    skipped: List[FileTooLargeError] = field(default_factory=list)
+
+    @property
+    def findings(self) -> List[Finding]:
+        return [f for findings in self.per_file for f in findings]
+
+
+ScanResult = Union[FileBatchResult, ArchiveResult]
+
+
+def scan_files(
+    paths: List[Path],
+    max_file_size: Optional[int] = DEFAULT_MAX_FILE_SIZE,
+) -> FileBatchResult:
+    result = FileBatchResult(paths=paths)
+    for path in paths:
+        try:
+            result.per_file.append(scan_file(path, max_file_size))
+        except FileTooLargeError as exc:
+            result.per_file.append([])
+            result.skipped.append(exc)
+    return result
+
+
+class _CachedBatch:
+    """
+    A batch split into cache hits, served immediately, and misses, which are
+    scanned and then stored.
+    """
+
+    def __init__(self, paths: List[Path], cache, max_file_size: Optional[int]):
+        self.paths = paths
+        self.cache = cache
+        self.hits: Dict[Path, List[Finding]] = {}
+        self.signatures: Dict[Path, Tuple[int, int]] = {}
+        self.skipped: List[FileTooLargeError] = []
+        self.misses: List[Path] = []
+
+        for path in paths:
+            try:
+                signature, findings = cache.lookup(path, max_file_size)
+            except FileTooLargeError as exc:
+                self.skipped.append(exc)
+                continue
+            if findings is not None:
+                self.hits[path] = findings
+            else:
+                if signature is not None:
+                    self.signatures[path] = signature
+                self.misses.append(path)
+
+    def resolve(self, scanned: Optional[FileBatchResult]) -> FileBatchResult:
+        fresh: Dict[Path, List[Finding]] = {}
+        if scanned is not None:
+            for path, findings in zip(scanned.paths, scanned.per_file):
+                if path in self.signatures:
+                    self.cache.store(path, self.signatures[path], findings)
+                # Callers may enrich findings in place; keep the cached ones pristine.
+                fresh[path] = [f.replace() for f in findings]
+
+        result = FileBatchResult(
+            paths=self.paths,
+            skipped=self.skipped + (scanned.skipped if scanned is not None else []),
+        )
+        for path in self.paths:
+            result.per_file.append(self.hits.get(path) or fresh.get(path, []))
+        return result
+
+
+class ScanExecutor:
+    """
+    Schedules every file and archive of a review, from any number of roots,
+    on one shared process pool.
+
+    Files are grouped into batches of `batch_size`. Results come back in
+    submission order, so reports do not depend on which worker finishes
+    first. The pool is only started once there is a full batch or an
+    archive to hand out; small reviews and `jobs <= 1` run inline.
+
+    With a `cache` (see `FileResultCache`), unchanged files are served
+    from it and only misses are scanned. With a `pool_factory`, the pool
+    belongs to the caller and outlives this executor.
+    """
+
+    def __init__(
+        self,
+        jobs: int = 1,
+        max_file_size: Optional[int] = DEFAULT_MAX_FILE_SIZE,
+        max_member_size: int = DEFAULT_MAX_MEMBER_SIZE,
+        max_total_size: int = DEFAULT_MAX_TOTAL_SIZE,
+        cache=None,
+        pool_factory: Optional[Callable[[], Executor]] = None,
+        batch_size: int = BATCH_SIZE,
+    ):
+        self.jobs = jobs
+        self.max_file_size = max_file_size
+        self.max_member_size = max_member_size
+        self.max_total_size = max_total_size
+        self.cache = cache
+        self.batch_size = batch_size
+        self._pool_factory = pool_factory
+        self._pool: Optional[Executor] = None
+        # (future the result waits on, or None when inline; result thunk)
+        self._pending: Deque[Tuple[Optional[Future], Callable[[], ScanResult]]] = deque()
+        self._batch: List[Path] = []
+
+    def submit(self, path: Path):
+        if is_archive(path):
+            self._flush()
+            self._pending.append(
+                self._schedule(
+                    scan_archive,
+                    path,
+                    self.max_member_size,
+                    self.max_total_size,
+                    start_pool=True,
+                )
+            )
+            return
+
+        self._batch.append(path)
+        if len(self._batch) >= self.batch_size:
+            self._flush(start_pool=True)
+
+    def _flush(self, start_pool: bool = False):
+        if not self._batch:
+            return
+
+        batch, self._batch = self._batch, []
+
+        if self.cache is None:
+            self._pending.append(
+                self._schedule(scan_files, batch, self.max_file_size, start_pool=start_pool)
+            )
+            return
+
+        cached = _CachedBatch(batch, self.cache, self.max_file_size)
+        if not cached.misses:
+            self._pending.append((None, partial(cached.resolve, None)))
+            return
+
+        future, scanned = self._schedule(
+            scan_files, cached.misses, self.max_file_size, start_pool=start_pool
+        )
+        self._pending.append((future, lambda: cached.resolve(scanned())))
+
+    def _schedule(self, fn, *args, start_pool: bool = False):
+        if start_pool and self.jobs > 1 and self._pool is None:
+            if self._pool_factory is not None:
+                self._pool = self._pool_factory()
+            else:
+                self._pool = ProcessPoolExecutor(max_workers=self.jobs)
+
+        if self._pool is not None:
+            future = self._pool.submit(fn, *args)
+            return future, future.result
+        return None, partial(fn, *args)
+
+    def ready(self) -> Iterator[ScanResult]:
+        """
+        Results that can be taken now without waiting, in submission order.
+
+        Inline batches count as ready (running them is the work), so a
+        caller interleaving this with `submit` streams results while
+        discovery is still going.
+        """
+        while self._pending:
+            future, result = self._pending[0]
+            if future is not None and not future.done():
+                return
+            self._pending.popleft()
+            yield result()
+
+    def results(self) -> Iterator[ScanResult]:
+        """
+        All remaining results, in submission order, waiting as needed.
+        """
+        self._flush()
+        try:
+            while self._pending:
+                _, result = self._pending.popleft()
+                yield result()
+        finally:
+            self._pending.clear()
+            self.close()
+
+    def close(self):
+        if self._pool is not None and self._pool_factory is None:
+            self._pool.shutdown(cancel_futures=True)
+        self._pool = None
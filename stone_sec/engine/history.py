@@ -0,0 +1,287 @@
+import subprocess
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from stone_sec.engine.parser import parse_python_source
+from stone_sec.engine.rules.runner import run_rules
+from stone_sec.engine.snippets import attach_snippets
+from stone_sec.engine.suppressions import filter_suppressed
+from stone_sec.models.finding import Finding
+
+# Only regular and executable files; symlinks (120000) and submodules (160000)
+# never carry Python source we can parse.
+SCANNED_MODES = {"100644", "100755"}
+
+# (rule_id, normalized source line, occurrence) identifies a finding inside
+# one file independently of the line it sits on, so pure line shifts keep
+# history; the occurrence tells identical flagged lines apart.
+FindingKey = Tuple[str, str, int]
+
+
+class GitError(Exception):
+    pass
+
+
+@dataclass
+class HistoryFinding:
+    finding: Finding
+    first_seen: str
+    last_seen: str
+
+
+@dataclass
+class HistoryResult:
+    commits: List[str]
+    blobs_scanned: int
+    findings: List[HistoryFinding]
+
+
+def _run_git(repo: Path, *args: str) -> bytes:
+    try:
+        proc = subprocess.run(
+            ["git", "-C", str(repo), *args],
+            capture_output=True,
+            check=False,
+        )
+    except OSError as exc:
+        raise GitError(f"Unable to run git: {exc}") from exc
+
+    if proc.returncode != 0:
+        message = proc.stderr.decode("utf-8", errors="replace").strip()
+        raise GitError(message or f"git {args[0]} failed")
+
+    return proc.stdout
+
+
+def _is_python_path(path: str) -> bool:
+    return path.endswith(".py")
+
+
+class BlobReader:
+    """
+    Reads blob contents through a single long-lived `git cat-file --batch`
+    process instead of spawning git once per blob.
+    """
+
+    def __init__(self, repo: Path):
+        try:
+            self._proc = subprocess.Popen(
+                ["git", "-C", str(repo), "cat-file", "--batch"],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+            )
+        except OSError as exc:
+            raise GitError(f"Unable to run git: {exc}") from exc
+
+    def read(self, sha: str) -> Optional[bytes]:
+        assert self._proc.stdin is not None and self._proc.stdout is not None
+
+        self._proc.stdin.write(sha.encode("ascii") + b"\n")
+        self._proc.stdin.flush()
+
+        header = self._proc.stdout.readline().split()
+        if len(header) != 3 or header[1] != b"blob":
+            return None
+
+        size = int(header[2])
+        data = self._proc.stdout.read(size)
+        self._proc.stdout.read(1)  # trailing newline
+        return data
+
+    def close(self):
+        if self._proc.stdin:
+            self._proc.stdin.close()
+        self._proc.wait()
+        if self._proc.stdout:
+            self._proc.stdout.close()
+
+
+class BlobFindingCache:
+    """
+    Scan results keyed by git blob SHA.
+
+    Each distinct blob is parsed and run through the rules exactly once;
+    every later path or commit that references the same blob reuses the
+    cached findings.
+    """
+
+    def __init__(self, reader: BlobReader):
+        self._reader = reader
+        self._cache: Dict[str, List[Tuple[FindingKey, Finding]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def findings_for(self, sha: str, path: str) -> List[Tuple[FindingKey, Finding]]:
+        cached = self._cache.get(sha)
+
+        if cached is None:
+            cached = self._scan_blob(sha, path)
+            self._cache[sha] = cached
+
+        file_path = Path(path)
+        return [(key, f.replace(file=file_path)) for key, f in cached]
+
+    def _scan_blob(self, sha: str, path: str) -> List[Tuple[FindingKey, Finding]]:
+        data = self._reader.read(sha)
+        if data is None:
+            return []
+
+        tree = parse_python_source(data, filename=path)
+        if tree is None:
+            return []
+
+        lines = data.splitlines()
+        results = []
+        seen: Dict[Tuple[str, str], int] = {}
+
+        findings = filter_suppressed(run_rules(tree, Path(path)), data)
+        attach_snippets(findings, data)
+
+        for f in findings:
+            text = ""
+            if 0 < f.line <= len(lines):
+                text = " ".join(lines[f.line - 1].decode("utf-8", errors="replace").split())
+            occurrence = seen.get((f.rule_id, text), 0)
+            seen[(f.rule_id, text)] = occurrence + 1
+            results.append(((f.rule_id, text, occurrence), f))
+
+        return results
+
+
+def _list_tree(repo: Path, commit: str) -> Dict[str, str]:
+    """
+    Full `path -> blob` map of the Python files in one commit.
+    """
+    output = _run_git(repo, "ls-tree", "-r", "-z", "--full-tree", commit)
+    files: Dict[str, str] = {}
+
+    for entry in output.split(b"\0"):
+        if not entry:
+            continue
+        meta, _, path_bytes = entry.partition(b"\t")
+        mode, obj_type, sha = meta.decode("ascii").split()
+        path = path_bytes.decode("utf-8", errors="surrogateescape")
+
+        if obj_type == "blob" and mode in SCANNED_MODES and _is_python_path(path):
+            files[path] = sha
+
+    return files
+
+
+def _iter_commit_changes(
+    repo: Path, rev_range: str
+) -> Iterator[Tuple[str, List[Tuple[str, str, str]]]]:
+    """
+    Yield `(commit, [(path, new_mode, new_sha), ...])` oldest first, diffing
+    every commit against its first parent.
+
+    A deleted path is reported with the all-zero SHA.
+    """
+    output = _run_git(
+        repo,
+        "log",
+        "--first-parent",
+        "-m",
+        "--reverse",
+        "--no-renames",
+        "--raw",
+        "-r",
+        "--no-abbrev",
+        "-z",
+        "--format=%H",
+        rev_range,
+    )
+
+    commit: Optional[str] = None
+    changes: List[Tuple[str, str, str]] = []
+    tokens = output.split(b"\0")
+    i = 0
+
+    while i < len(tokens):
+        token = tokens[i].lstrip(b"\n")
+        i += 1
+
+        if not token:
+            continue
+
+        if token.startswith(b":"):
+            _, new_mode, _, new_sha, _ = token[1:].decode("ascii").split()
+            path = tokens[i].decode("utf-8", errors="surrogateescape")
+            i += 1
+            if _is_python_path(path):
+                changes.append((path, new_mode, new_sha))
+            continue
+
+        if commit is not None:
+            yield commit, changes
+        commit = token.decode("ascii")
+        changes = []
+
+    if commit is not None:
+        yield commit, changes
+
+
+def scan_history(repo: Path, rev_range: str = "HEAD") -> HistoryResult:
+    """
+    Walk the first-parent history in `rev_range` and report, for every
+    finding, the first and last commit in which it was present.
+
+    Work is proportional to the number of distinct blobs: the first commit
+    is listed in full, later commits are applied as diffs, and each blob is
+    scanned once no matter how many commits or paths reference it.
+    """
+    commits: List[str] = []
+    # path -> (blob sha, index of the commit that introduced this version)
+    live: Dict[str, Tuple[str, int]] = {}
+    # (path, finding key) -> [finding, first index, last index]
+    seen: Dict[Tuple[str, FindingKey], list] = {}
+
+    reader = BlobReader(repo)
+    cache = BlobFindingCache(reader)
+
+    def close_interval(path: str, sha: str, start: int, end: int):
+        for key, finding in cache.findings_for(sha, path):
+            entry = seen.get((path, key))
+            if entry is None:
+                seen[(path, key)] = [finding, start, end]
+                continue
+            if start < entry[1]:
+                entry[0], entry[1] = finding, start
+            if end > entry[2]:
+                entry[2] = end
+
+    try:
+        for index, (commit, changes) in enumerate(_iter_commit_changes(repo, rev_range)):
+            commits.append(commit)
+
+            if index == 0:
+                live = {path: (sha, 0) for path, sha in _list_tree(repo, commit).items()}
+                continue
+
+            for path, mode, sha in changes:
+                previous = live.pop(path, None)
+                if previous is not None:
+                    if previous[0] == sha:
+                        live[path] = previous
+                        continue
+                    close_interval(path, previous[0], previous[1], index - 1)
+
+                if mode in SCANNED_MODES:
+                    live[path] = (sha, index)
+
+        last_index = len(commits) - 1
+        for path, (sha, start) in live.items():
+            close_interval(path, sha, start, last_index)
+    finally:
+        reader.close()
+
+    findings = [
+        HistoryFinding(finding=finding, first_seen=commits[first], last_seen=commits[last])
+        for finding, first, last in seen.values()
+    ]
+    findings.sort(key=lambda h: (str(h.finding.file), h.finding.line, h.finding.rule_id))
+
+    return HistoryResult(commits=commits, blobs_scanned=len(cache), findings=findings)
@@ -0,0 +1,148 @@
+import re
+from pathlib import Path
+from typing import Iterable, List, Optional, Pattern, Tuple
+
+
+def _translate(pattern: str) -> str:
+    """
+    Translate the body of one gitignore pattern into a regex fragment.
+    """
+    out: List[str] = []
+    i, n = 0, len(pattern)
+
+    while i < n:
+        c = pattern[i]
+
+        if c == "*":
+            if pattern.startswith("**", i):
+                at_start = i == 0 or pattern[i - 1] == "/"
+                at_end = i + 2 == n or pattern[i + 2] == "/"
+                if at_start and at_end:
+                    if i + 2 == n:
+                        out.append(".*")
+                        i += 2
+                    else:
+                        # "**/" matches zero or more whole directories
+                        out.append("(?:.*/)?")
+                        i += 3
+                    continue
+            out.append("[^/]*")
+            while i < n and pattern[i] == "*":
+                i += 1
+            continue
+
+        if c == "?":
+            out.append("[^/]")
+        elif c == "[":
+            end = pattern.find("]", i + 2 if pattern[i + 1 : i + 2] in ("!", "]") else i + 1)
+            if end == -1:
+                out.append(re.escape(c))
+            else:
+                body = pattern[i + 1 : end]
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                out.append("[" + body.replace("\\", "\\\\") + "]")
+                i = end
+        elif c == "\\" and i + 1 < n:
+            i += 1
+            out.append(re.escape(pattern[i]))
+        else:
+            out.append(re.escape(c))
+        i += 1
+
+    return "".join(out)
+
+
+def _parse_line(line: str) -> Optional[Tuple[str, bool, bool]]:
+    """
+    Return `(regex, negated, dir_only)` for one gitignore line, or None for
+    blanks and comments.
+    """
+    line = line.rstrip("\n").rstrip("\r")
+
+    # Trailing spaces are ignored unless escaped.
+    stripped = line.rstrip(" ")
+    if stripped.endswith("\\") and len(stripped) < len(line):
+        stripped += " "
+    line = stripped
+
+    if not line or line.startswith("#"):
+        return None
+
+    negated = line.startswith("!")
+    if negated:
+        line = line[1:]
+    elif line.startswith("\\!") or line.startswith("\\#"):
+        line = line[1:]
+
+    dir_only = line.endswith("/")
+    line = line.rstrip("/")
+    if not line:
+        return None
+
+    # A slash anywhere but the end anchors the pattern to the base directory.
+    anchored = "/" in line
+    line = line.lstrip("/")
+
+    body = _translate(line)
+    if not anchored and not body.startswith("(?:.*/)?"):
+        body = "(?:.*/)?" + body
+
+    return body, negated, dir_only
+
+
+class IgnoreMatcher:
+    """
+    A set of gitignore-style patterns compiled into one regex per entry kind.
+
+    Patterns are joined in reverse order, so the first alternative that
+    matches is the last matching line of the file, which is exactly
+    gitignore's "last match wins" rule. The matched group tells whether that
+    line was a negation.
+    """
+
+    def __init__(self, lines: Iterable[str]):
+        parsed = [p for p in (_parse_line(line) for line in lines) if p is not None]
+
+        self._file_regex, self._file_negated = self._compile(
+            [p for p in parsed if not p[2]]
+        )
+        self._dir_regex, self._dir_negated = self._compile(parsed)
+
+    @staticmethod
+    def _compile(parsed: List[Tuple[str, bool, bool]]) -> Tuple[Optional[Pattern[str]], List[bool]]:
+        if not parsed:
+            return None, []
+
+        ordered = list(reversed(parsed))
+        regex = re.compile("|".join(f"({body})" for body, _, _ in ordered), re.DOTALL)
+        return regex, [negated for _, negated, _ in ordered]
+
+    @classmethod
+    def from_file(cls, path: Path) -> Optional["IgnoreMatcher"]:
+        try:
+            text = path.read_text(encoding="utf-8", errors="replace")
+        except OSError:
+            return None
+        return cls(text.splitlines())
+
+    def __bool__(self) -> bool:
+        return self._dir_regex is not None
+
+    def match(self, rel_path: str, is_dir: bool) -> Optional[bool]:
+        """
+        Return True if `rel_path` is ignored, False if a negation re-includes
+        it, and None if no pattern applies.
+        """
+        regex, negated = (
+            (self._dir_regex, self._dir_negated)
+            if is_dir
+            else (self._file_regex, self._file_negated)
+        )
+        if regex is None:
+            return None
+
+        m = regex.fullmatch(rel_path)
+        if m is None:
+            return None
+        return not negated[m.lastindex - 1]
@@ -0,0 +1,352 @@
+import ast
+import bisect
+import json
+import re
+from dataclasses import dataclass, field
+from typing import Iterator, List, Optional, Tuple, Union
+
+NOTEBOOK_SUFFIX = ".ipynb"
+
+# Cell magics whose body is still Python; any other `%%magic` cell is skipped.
+PYTHON_CELL_MAGICS = {"time", "timeit", "capture", "prun", "debug"}
+
+_WS = re.compile(rb"[ \t\r\n]*")
+_STRUCTURAL = re.compile(rb'[\[\]{}"]')
+_SCALAR = re.compile(rb"[^,\]}\s]+")
+
+_ASSIGN_MAGIC = re.compile(r"^(\s*[\w.\[\], ]+?\s*=\s*)[!%].*$")
+_LINE_MAGIC = re.compile(r"^(\s*)[!%]")
+_HELP = re.compile(r"^(\s*)\??[\w.]+\?{1,2}\s*$")
+
+
+class NotebookError(ValueError):
+    pass
+
+
+class _Reader:
+    """
+    Pull parser over the raw notebook bytes.
+
+    Only the values the caller asks for are decoded; everything else (cell
+    outputs, base64 images, rendered dataframes) is skipped by scanning for
+    structural bytes, so it is never materialized as Python objects.
+    """
+
+    def __init__(self, buf):
+        self.buf = buf
+        self.pos = 0
+
+    def _peek(self) -> bytes:
+        self.pos = _WS.match(self.buf, self.pos).end()
+        return self.buf[self.pos : self.pos + 1]
+
+    def _expect(self, ch: bytes):
+        if self._peek() != ch:
+            raise NotebookError(f"expected {ch!r} at offset {self.pos}")
+        self.pos += 1
+
+    def _skip_string(self, start: int) -> int:
+        # `find` runs at memchr speed over multi-megabyte base64 outputs,
+        # where a character-class regex is two orders of magnitude slower.
+        pos = start + 1
+        while True:
+            end = self.buf.find(b'"', pos)
+            if end == -1:
+                raise NotebookError(f"unterminated string at offset {start}")
+            escapes = end
+            while self.buf[escapes - 1] == 0x5C:
+                escapes -= 1
+            if (end - escapes) % 2 == 0:
+                return end + 1
+            pos = end + 1
+
+    def string(self) -> str:
+        self._peek()
+        start = self.pos
+        self.pos = self._skip_string(start)
+        return json.loads(self.buf[start : self.pos])
+
+    def skip(self):
+        c = self._peek()
+
+        if c == b'"':
+            self.pos = self._skip_string(self.pos)
+            return
+
+        if c in (b"[", b"{"):
+            depth = 0
+            pos = self.pos
+            while True:
+                m = _STRUCTURAL.search(self.buf, pos)
+                if m is None:
+                    raise NotebookError("unterminated container")
+                ch = self.buf[m.start() : m.start() + 1]
+                if ch == b'"':
+                    pos = self._skip_string(m.start())
+                    continue
+                pos = m.end()
+                depth += 1 if ch in (b"[", b"{") else -1
+                if depth == 0:
+                    self.pos = pos
+                    return
+
+        m = _SCALAR.match(self.buf, self.pos)
+        if m is None:
+            raise NotebookError(f"unexpected byte at offset {self.pos}")
+        self.pos = m.end()
+
+    def at_object(self) -> bool:
+        return self._peek() == b"{"
+
+    def value(self):
+        """
+        Decode the next value in full; only used for small values.
+        """
+        self._peek()
+        start = self.pos
+        self.skip()
+        return json.loads(self.buf[start : self.pos])
+
+    def iter_object(self) -> Iterator[str]:
+        """
+        Yield the keys of an object; the caller consumes each value.
+        """
+        self._expect(b"{")
+        if self._peek() == b"}":
+            self.pos += 1
+            return
+
+        while True:
+            key = self.string()
+            self._expect(b":")
+            yield key
+
+            c = self._peek()
+            self.pos += 1
+            if c == b"}":
+                return
+            if c != b",":
+                raise NotebookError(f"expected ',' or '}}' at offset {self.pos - 1}")
+
+    def iter_array(self) -> Iterator[int]:
+        """
+        Yield element indexes of an array; the caller consumes each element.
+        """
+        self._expect(b"[")
+        if self._peek() == b"]":
+            self.pos += 1
+            return
+
+        index = 0
+        while True:
+            yield index
+            index += 1
+
+            c = self._peek()
+            self.pos += 1
+            if c == b"]":
+                return
+            if c != b",":
+                raise NotebookError(f"expected ',' or ']' at offset {self.pos - 1}")
+
+
+def _read_cells(reader: _Reader, cells: List[Tuple[int, str]]):
+    for _ in reader.iter_array():
+        number = len(cells) + 1
+        cell_type = None
+        source: Union[str, List[str], None] = None
+
+        for key in reader.iter_object():
+            if key == "cell_type":
+                cell_type = reader.value()
+            elif key in ("source", "input"):
+                source = reader.value()
+            else:
+                reader.skip()
+
+        # Every cell is numbered, so reported cell numbers match the notebook.
+        text = "".join(source) if isinstance(source, list) else (source or "")
+        cells.append((number, text if cell_type == "code" else ""))
+
+
+def _read_member(reader: _Reader, wanted: str):
+    """
+    The `wanted` member of the next value if it is an object; the rest of
+    the object is skipped.
+    """
+    if not reader.at_object():
+        reader.skip()
+        return None
+
+    value = None
+    for key in reader.iter_object():
+        if key == wanted:
+            value = reader.value()
+        else:
+            reader.skip()
+    return value
+
+
+def _read_language(reader: _Reader) -> Optional[str]:
+    # Notebook metadata can hold megabytes of widget state; only the two
+    # language fields are decoded.
+    if not reader.at_object():
+        reader.skip()
+        return None
+
+    info_name = kernel_language = None
+    for key in reader.iter_object():
+        if key == "language_info":
+            info_name = _read_member(reader, "name")
+        elif key == "kernelspec":
+            kernel_language = _read_member(reader, "language")
+        else:
+            reader.skip()
+
+    name = info_name or kernel_language
+    return name.lower() if isinstance(name, str) else None
+
+
+def extract_code_cells(buf) -> List[Tuple[int, str]]:
+    """
+    Return `(cell number, source)` for every cell of a notebook buffer,
+    with non-code cells as empty sources.
+
+    Returns no cells for notebooks whose kernel language is not Python.
+    """
+    reader = _Reader(buf)
+    cells: List[Tuple[int, str]] = []
+    language = None
+
+    for key in reader.iter_object():
+        if key == "cells":
+            _read_cells(reader, cells)
+        elif key == "worksheets":
+            # nbformat 3
+            for _ in reader.iter_array():
+                for ws_key in reader.iter_object():
+                    if ws_key == "cells":
+                        _read_cells(reader, cells)
+                    else:
+                        reader.skip()
+        elif key == "metadata":
+            language = _read_language(reader)
+        else:
+            reader.skip()
+
+    if language is not None and language != "python":
+        return []
+    return cells
+
+
+def _neutralize_magics(lines: List[str]) -> List[str]:
+    """
+    Rewrite IPython syntax to parseable Python, keeping one output line per
+    input line so line numbers stay valid.
+    """
+    first = next((line.strip() for line in lines if line.strip()), "")
+    if first.startswith("%%"):
+        magic = first[2:].split(None, 1)[0] if len(first) > 2 else ""
+        if magic not in PYTHON_CELL_MAGICS:
+            return [""] * len(lines)
+
+    out = []
+    for line in lines:
+        stripped = line.lstrip()
+
+        if stripped.startswith("%%"):
+            out.append("")
+            continue
+
+        m = _ASSIGN_MAGIC.match(line)
+        if m:
+            out.append(m.group(1) + "None")
+            continue
+
+        m = _LINE_MAGIC.match(line) or _HELP.match(line)
+        if m:
+            out.append(m.group(1) + "pass")
+            continue
+
+        out.append(line)
+
+    return out
+
+
+@dataclass
+class NotebookSource:
+    """
+    Code cells concatenated into one module, with a line map back to cells.
+
+    Concatenation keeps cross-cell context (an `import pickle` in cell 1 and
+    `pickle.loads` in cell 5) visible to the rules.
+    """
+
+    cells: List[Tuple[int, List[str]]] = field(default_factory=list)
+    starts: List[int] = field(default_factory=list)
+
+    @classmethod
+    def from_buffer(cls, buf) -> "NotebookSource":
+        nb = cls()
+        line = 1
+        for number, text in extract_code_cells(buf):
+            lines = _neutralize_magics(text.splitlines())
+            if not lines:
+                continue
+            nb.cells.append((number, lines))
+            nb.starts.append(line)
+            line += len(lines)
+        return nb
+
+    @property
+    def text(self) -> str:
+        return "".join(line + "\n" for _, lines in self.cells for line in lines)
+
+    @property
+    def code_size(self) -> int:
+        """
+        Size in bytes of the concatenated code, as UTF-8.
+        """
+        return sum(
+            len(line.encode("utf-8", errors="surrogatepass")) + 1
+            for _, lines in self.cells
+            for line in lines
+        )
+
+    def locate(self, line: int) -> Tuple[int, int]:
+        """
+        Map a line of the concatenated source to (cell number, line in cell).
+        """
+        i = bisect.bisect_right(self.starts, line) - 1
+        if i < 0:
+            return 0, line
+        return self.cells[i][0], line - self.starts[i] + 1
+
+    def cell_span(self, line: int) -> Tuple[int, int]:
+        """
+        First and last line of the concatenated source in the cell of `line`.
+        """
+        i = bisect.bisect_right(self.starts, line) - 1
+        if i < 0:
+            return 1, line
+        return self.starts[i], self.starts[i] + len(self.cells[i][1]) - 1
+
+    def parse(self, filename: str) -> Optional[ast.AST]:
+        """
+        Parse the concatenated cells, blanking any cell that does not parse
+        so one broken cell does not hide the rest of the notebook.
+        """
+        for _ in range(len(self.cells) + 1):
+            try:
+                return ast.parse(self.text, filename=filename)
+            except SyntaxError as exc:
+                if not exc.lineno:
+                    return None
+                i = bisect.bisect_right(self.starts, exc.lineno) - 1
+                if i < 0 or not any(self.cells[i][1]):
+                    return None
+                number, lines = self.cells[i]
+                self.cells[i] = (number, [""] * len(lines))
+            except ValueError:
+                return None
+        return None
@@ -1,6 +1,6 @@
 import ast
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Union
 
 
 def parse_python_file(path: Path) -> Optional[ast.AST]:
@@ -12,8 +12,24 @@ def parse_python_file(path: Path) -> Optional[ast.AST]:
         None if file contains syntax errors or cannot be read
     """
     try:
-        source = path.read_text(encoding="utf-8")
+        # Parse bytes so PEP 263 coding declarations are honoured.
+        source = path.read_bytes()
         return ast.parse(source, filename=str(path))
-    except (SyntaxError, UnicodeDecodeError, OSError):
+    except (SyntaxError, UnicodeDecodeError, ValueError, OSError):
         # We never crash on bad files
-        return None
\ No newline at end of file
+        return None
+
+
+def parse_python_source(source: Union[str, bytes], filename: str) -> Optional[ast.AST]:
+    """
+    Safely parse Python source that is already in memory.
+
+    Returns:
+        ast.AST if parsing succeeds
+        None if the source contains syntax errors or cannot be decoded
+    """
+    try:
+        return ast.parse(source, filename=filename)
+    except (SyntaxError, UnicodeDecodeError, ValueError):
+        # ValueError covers null bytes in the source
+        return None
@@ -0,0 +1,123 @@
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple, Union
+
+from stone_sec.engine.notebook import NOTEBOOK_SUFFIX, NotebookError, NotebookSource
+from stone_sec.engine.parser import parse_python_source
+from stone_sec.engine.rules.runner import run_rules
+from stone_sec.engine.snippets import attach_snippets
+from stone_sec.engine.suppressions import filter_suppressed
+from stone_sec.engine.source import DEFAULT_MAX_FILE_SIZE, FileTooLargeError, SourceFile, read_source
+from stone_sec.models.finding import Finding
+
+
+def raw_size_limit(path: Path, max_file_size: Optional[int]) -> Optional[int]:
+    """
+    The size limit to apply to the raw bytes of `path`.
+
+    Notebooks have none: their outputs are skipped without being decoded,
+    so `max_file_size` applies to the extracted code cells instead.
+    """
+    return None if path.suffix == NOTEBOOK_SUFFIX else max_file_size
+
+
+def scan_notebook(source: SourceFile, max_file_size: Optional[int] = None) -> Optional[List[Finding]]:
+    """
+    Run every rule on the code cells of a Jupyter notebook.
+
+    Findings carry the cell number, with `line` relative to that cell.
+    Returns None if the notebook is not valid JSON. Raises
+    `FileTooLargeError` when the code cells exceed `max_file_size`.
+    """
+    try:
+        notebook = NotebookSource.from_buffer(source.buffer)
+    except (NotebookError, UnicodeDecodeError):
+        return None
+
+    if max_file_size:
+        size = notebook.code_size
+        if size > max_file_size:
+            raise FileTooLargeError(source.path, size, max_file_size)
+
+    tree = notebook.parse(str(source.path))
+    if tree is None:
+        return None
+
+    text = notebook.text
+    findings = filter_suppressed(run_rules(tree, source.path), text)
+    attach_snippets(findings, text, span=notebook.cell_span)
+    for f in findings:
+        f.cell, f.line = notebook.locate(f.line)
+    return findings
+
+
+def scan_source_file(source: SourceFile, max_file_size: Optional[int] = None) -> Optional[List[Finding]]:
+    """
+    Run every rule on an already-read file.
+
+    Returns None if the file cannot be parsed. `max_file_size` only applies
+    to the code cells of notebooks; see `raw_size_limit`.
+    """
+    if source.path.suffix == NOTEBOOK_SUFFIX:
+        return scan_notebook(source, max_file_size)
+
+    tree = source.parse()
+    if tree is None:
+        return None
+
+    findings = filter_suppressed(run_rules(tree, source.path), source.buffer)
+    attach_snippets(findings, source.buffer)
+    return findings
+
+
+def scan_file(path: Path, max_file_size: Optional[int] = DEFAULT_MAX_FILE_SIZE) -> List[Finding]:
+    """
+    Read `path` once and run every rule on it.
+
+    Unreadable or unparsable files yield no findings. Raises
+    `FileTooLargeError` for files above `max_file_size`.
+    """
+    source = read_source(path, max_size=raw_size_limit(path, max_file_size))
+    if source is None:
+        return []
+
+    with source:
+        return scan_source_file(source, max_file_size) or []
+
+
+def scan_source(
+    source: Union[str, bytes], filename: str = "<string>", max_file_size: Optional[int] = None
+) -> List[Finding]:
+    """
+    Run every rule on source code held in memory.
+
+    `filename` is reported as the finding file; an `.ipynb` name scans the
+    source as a notebook. Bytes are decoded as Python would decode the file
+    (coding cookie, BOM, UTF-8 default). Unparsable source yields no findings.
+    `max_file_size` limits the code cells of a notebook, as in `scan_file`.
+    """
+    path = Path(filename)
+
+    if isinstance(source, str):
+        if path.suffix == NOTEBOOK_SUFFIX:
+            source = source.encode("utf-8")
+        else:
+            tree = parse_python_source(source, filename=filename)
+            if tree is None:
+                return []
+
+            findings = filter_suppressed(run_rules(tree, path), source)
+            attach_snippets(findings, source)
+            return findings
+
+    return scan_source_file(SourceFile(path, source), max_file_size) or []
+
+
+def scan_sources(sources: Iterable[Tuple[Union[str, bytes], str]]) -> List[Finding]:
+    """
+    Scan many in-memory `(source, filename)` pairs; findings are returned in
+    input order.
+    """
+    findings: List[Finding] = []
+    for source, filename in sources:
+        findings.extend(scan_source(source, filename))
+    return findings
@@ -1,5 +1,5 @@
 from pathlib import Path
-from typing import List, Type
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Type
 import ast
 
 from stone_sec.models.finding import Finding
@@ -58,12 +58,106 @@ RULES: List[Type[ast.NodeVisitor]] = [
 ]
 
 
-def run_rules(tree: ast.AST, file_path: Path) -> List[Finding]:
-    findings: List[Finding] = []
+def rule_table(rules: Sequence[Type[ast.NodeVisitor]] = RULES) -> List[Tuple[str, Type[ast.NodeVisitor]]]:
+    """
+    Every rule ID with the class that reports it, in rule order.
+
+    Most rules declare `RULE_ID`; rules reporting several IDs declare one
+    `RULE_ID_*` attribute per ID.
+    """
+    table: List[Tuple[str, Type[ast.NodeVisitor]]] = []
+    for rule_cls in rules:
+        names = [n for n in vars(rule_cls) if n == "RULE_ID" or n.startswith("RULE_ID_")]
+        for name in names:
+            table.append((getattr(rule_cls, name), rule_cls))
+    return table
+
+
+def _skip_children(node: ast.AST):
+    # Replaces a rule's generic_visit: the compiled walk visits children.
+    pass
+
+
+class CompiledRules:
+    """
+    A rule set compiled into one dispatch table, so each AST is walked once
+    for all rules instead of once per rule.
+
+    Every rule's `visit_*` methods end with `generic_visit`, i.e. each rule
+    is a pre-order traversal. The compiled walk is the same pre-order
+    traversal with each node handed to every interested rule in rule order,
+    so per-rule state (such as import aliases) evolves exactly as before and
+    findings are identical. Rules that override `visit` or `generic_visit`
+    are run with their own traversal.
+    """
+
+    def __init__(self, rules: Sequence[Type[ast.NodeVisitor]]):
+        self.rules = list(rules)
+        self._dispatch: Dict[type, List[Tuple[int, Callable]]] = {}
+        self._custom: List[int] = []
+
+        for index, rule_cls in enumerate(self.rules):
+            if (
+                rule_cls.visit is not ast.NodeVisitor.visit
+                or rule_cls.generic_visit is not ast.NodeVisitor.generic_visit
+            ):
+                self._custom.append(index)
+                continue
+
+            for name in dir(rule_cls):
+                if not name.startswith("visit_"):
+                    continue
+                method = getattr(rule_cls, name)
+                # Skip NodeVisitor's own handlers (visit_Constant), which
+                # only exist for deprecated node classes.
+                if method is getattr(ast.NodeVisitor, name, None):
+                    continue
+                node_cls = getattr(ast, name[len("visit_"):], None)
+                if isinstance(node_cls, type) and issubclass(node_cls, ast.AST):
+                    self._dispatch.setdefault(node_cls, []).append((index, method))
 
-    for rule_cls in RULES:
-        rule = rule_cls(file_path)
-        rule.visit(tree)
-        findings.extend(rule.findings)
+    def run(self, tree: ast.AST, file_path: Path) -> List[Finding]:
+        rules = [rule_cls(file_path) for rule_cls in self.rules]
+        custom = set(self._custom)
+        for index, rule in enumerate(rules):
+            if index not in custom:
+                rule.generic_visit = _skip_children
 
-    return findings
+        dispatch = self._dispatch
+        iter_children = ast.iter_child_nodes
+        stack = [tree]
+
+        while stack:
+            node = stack.pop()
+            handlers = dispatch.get(type(node))
+            if handlers:
+                for index, method in handlers:
+                    method(rules[index], node)
+            children = list(iter_children(node))
+            children.reverse()
+            stack.extend(children)
+
+        for index in self._custom:
+            rules[index].visit(tree)
+
+        findings: List[Finding] = []
+        for rule in rules:
+            findings.extend(rule.findings)
+        return findings
+
+
+_compiled: Optional[CompiledRules] = None
+
+
+def compiled_rules() -> CompiledRules:
+    """
+    The default rule set, compiled once per process.
+    """
+    global _compiled
+    if _compiled is None:
+        _compiled = CompiledRules(RULES)
+    return _compiled
+
+
+def run_rules(tree: ast.AST, file_path: Path) -> List[Finding]:
+    return compiled_rules().run(tree, file_path)
@@ -1,35 +1,354 @@
+import os
+import stat
 from pathlib import Path
-from typing import List
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from stone_sec.engine.archives import is_archive
+from stone_sec.engine.ignore import IgnoreMatcher
+from stone_sec.engine.notebook import NOTEBOOK_SUFFIX
+from stone_sec.engine.shebang import ShebangCache, read_shebang_is_python
 
 EXCLUDED_DIRS = {
     ".venv",
     "venv",
     "__pycache__",
     "site-packages",
+    "node_modules",
+    ".git",
+    ".hg",
+    ".svn",
+    ".tox",
+    ".nox",
+    ".eggs",
+    ".mypy_cache",
+    ".pytest_cache",
+    ".ruff_cache",
+    "build",
+    "dist",
 }
 
+GITIGNORE = ".gitignore"
+
+SOURCE_SUFFIXES = (".py", NOTEBOOK_SUFFIX)
+
 
-def discover_python_files(target: Path) -> List[Path]:
+class _PrefixedMatcher:
     """
-    Discover Python files from a file or directory path,
-    excluding virtual environments and dependencies.
+    The .gitignore of a directory above the scan root, matched against
+    paths below the root by prefixing them with the root's path relative
+    to that directory.
     """
 
-    python_files: List[Path] = []
+    def __init__(self, prefix: str, matcher: IgnoreMatcher):
+        self.prefix = prefix
+        self.matcher = matcher
 
-    if target.is_file():
-        if target.suffix == ".py":
-            return [target.resolve()]
+    def match(self, rel_path: str, is_dir: bool) -> Optional[bool]:
+        return self.matcher.match(self.prefix + rel_path, is_dir)
+
+
+# (directory relative to the scan root, matcher loaded from its .gitignore)
+_ScopedMatcher = Tuple[str, Union[IgnoreMatcher, _PrefixedMatcher]]
+
+
+def _inherited_matchers(root: Path) -> List[_ScopedMatcher]:
+    """
+    Matchers for the .gitignore files between the enclosing git repository's
+    top level and the parent of `root`, outermost first, so scanning a
+    subdirectory honours the same rules as scanning the whole repository.
+    Empty when `root` is not inside a repository or is its top level.
+    """
+    if (root / ".git").exists():
+        return []
+
+    ancestors: List[Path] = []
+    for directory in root.parents:
+        ancestors.append(directory)
+        if (directory / ".git").exists():
+            break
+    else:
         return []
 
-    if target.is_dir():
-        for path in target.rglob("*.py"):
-            # Skip excluded directories
-            if any(part in EXCLUDED_DIRS for part in path.parts):
+    scoped: List[_ScopedMatcher] = []
+    for directory in reversed(ancestors):
+        path = directory / GITIGNORE
+        matcher = IgnoreMatcher.from_file(path) if path.is_file() else None
+        if matcher:
+            prefix = root.relative_to(directory).as_posix() + "/"
+            scoped.append(("", _PrefixedMatcher(prefix, matcher)))
+    return scoped
+
+
+def _is_ignored(
+    rel_path: str,
+    is_dir: bool,
+    excludes: Optional[IgnoreMatcher],
+    scoped: List[_ScopedMatcher],
+) -> bool:
+    if excludes is not None and excludes.match(rel_path, is_dir):
+        return True
+
+    # The deepest .gitignore that has an opinion wins.
+    for base, matcher in reversed(scoped):
+        result = matcher.match(rel_path[len(base):], is_dir)
+        if result is not None:
+            return result
+
+    return False
+
+
+def _is_candidate_script(name: str) -> bool:
+    # Extensionless names only ("deploy", "manage", "run-tests"); this also
+    # rules out dotfiles.
+    return "." not in name
+
+
+def _is_python_script(entry: os.DirEntry, shebangs: ShebangCache) -> bool:
+    try:
+        st = entry.stat()
+    except OSError:
+        return False
+
+    if not stat.S_ISREG(st.st_mode) or not st.st_mode & 0o111:
+        return False
+
+    return shebangs.is_python_script(entry.path, st)
+
+
+def _walk(
+    directory: str,
+    rel_dir: str,
+    excludes: Optional[IgnoreMatcher],
+    scoped: List[_ScopedMatcher],
+    use_gitignore: bool,
+    shebangs: Optional[ShebangCache],
+    include_archives: bool,
+) -> Iterator[Path]:
+    try:
+        with os.scandir(directory) as it:
+            # Sorting each directory by name yields paths in the same order
+            # as sorting the full `Path`s, which compare part by part.
+            entries = sorted(it, key=lambda e: e.name)
+    except OSError:
+        return
+
+    if use_gitignore and any(e.name == GITIGNORE for e in entries):
+        matcher = IgnoreMatcher.from_file(Path(directory) / GITIGNORE)
+        if matcher:
+            scoped = scoped + [(rel_dir, matcher)]
+
+    for entry in entries:
+        name = entry.name
+        rel_path = rel_dir + name
+
+        try:
+            is_dir = entry.is_dir(follow_symlinks=False)
+        except OSError:
+            continue
+
+        if is_dir:
+            # Prune before descending: nothing below an excluded directory
+            # is ever listed.
+            if name in EXCLUDED_DIRS or _is_ignored(rel_path, True, excludes, scoped):
+                continue
+            yield from _walk(
+                entry.path,
+                rel_path + "/",
+                excludes,
+                scoped,
+                use_gitignore,
+                shebangs,
+                include_archives,
+            )
+            continue
+
+        if name.endswith(SOURCE_SUFFIXES):
+            try:
+                if not entry.is_file():
+                    continue
+            except OSError:
+                continue
+            if _is_ignored(rel_path, False, excludes, scoped):
+                continue
+        elif shebangs is not None and _is_candidate_script(name):
+            # Check ignores first so ignored scripts are never stat'ed or opened.
+            if _is_ignored(rel_path, False, excludes, scoped):
+                continue
+            if not _is_python_script(entry, shebangs):
                 continue
+        elif include_archives and is_archive(Path(name)):
+            try:
+                if not entry.is_file():
+                    continue
+            except OSError:
+                continue
+            if _is_ignored(rel_path, False, excludes, scoped):
+                continue
+        else:
+            continue
+
+        yield Path(entry.path)
+
+
+def discover_python_files(
+    target: Path,
+    exclude: Sequence[str] = (),
+    use_gitignore: bool = True,
+    detect_scripts: bool = True,
+    shebang_cache: Optional[ShebangCache] = None,
+    include_archives: bool = False,
+) -> Iterator[Path]:
+    """
+    Discover Python files and Jupyter notebooks from a file or directory
+    path, excluding virtual environments and dependencies.
+
+    Directories are walked lazily with `os.scandir`. Excluded directories,
+    paths matched by `.gitignore` files and user `exclude` globs are pruned
+    before they are descended into. `.gitignore` files above `target`, up
+    to the top of its git repository, apply as well. Paths are yielded in
+    sorted `Path` order without collecting the whole tree first.
+
+    With `detect_scripts`, executable files without an extension are
+    included when their first line is a Python shebang. Results are cached
+    per inode and mtime (on disk unless `shebang_cache` is given).
+
+    With `include_archives`, wheels, zips and tarballs are yielded too, for
+    the caller to scan in place.
+    """
+
+    if target.is_file():
+        if target.suffix in SOURCE_SUFFIXES or (include_archives and is_archive(target)):
+            yield target.resolve()
+        elif detect_scripts and read_shebang_is_python(str(target)):
+            yield target.resolve()
+        return
+
+    if not target.is_dir():
+        return
+
+    excludes = IgnoreMatcher(exclude) if exclude else None
+    root = target.resolve()
+
+    shebangs = None
+    if detect_scripts:
+        shebangs = shebang_cache if shebang_cache is not None else ShebangCache.load()
+
+    scoped = _inherited_matchers(root) if use_gitignore else []
+
+    try:
+        yield from _walk(
+            str(root), "", excludes, scoped, use_gitignore, shebangs, include_archives
+        )
+    finally:
+        if shebangs is not None:
+            shebangs.save()
 
-            if path.is_file():
-                python_files.append(path.resolve())
 
-    python_files.sort()
-    return python_files
\ No newline at end of file
+class PathFilter:
+    """
+    Decides for a single path whether `discover_python_files(root, ...)`
+    would yield it, without walking the tree: only the path's ancestors are
+    checked, with the `.gitignore` of each loaded once and kept.
+
+    Used to vet paths reported by file system events. Call `reset` when a
+    `.gitignore` changes.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        exclude: Sequence[str] = (),
+        use_gitignore: bool = True,
+        shebangs: Optional[ShebangCache] = None,
+        include_archives: bool = False,
+    ):
+        self.root = root.resolve()
+        self.use_gitignore = use_gitignore
+        self.shebangs = shebangs
+        self.include_archives = include_archives
+        self._excludes = IgnoreMatcher(exclude) if exclude else None
+        self._matchers: Dict[str, Optional[IgnoreMatcher]] = {}
+        self._inherited: Optional[List[_ScopedMatcher]] = None
+
+    def reset(self):
+        self._matchers = {}
+        self._inherited = None
+
+    def _scoped(self, rel_dir: str, scoped: List[_ScopedMatcher]) -> List[_ScopedMatcher]:
+        if not self.use_gitignore:
+            return scoped
+        if rel_dir not in self._matchers:
+            path = self.root / rel_dir / GITIGNORE
+            self._matchers[rel_dir] = IgnoreMatcher.from_file(path) if path.is_file() else None
+        matcher = self._matchers[rel_dir]
+        return scoped + [(rel_dir, matcher)] if matcher else scoped
+
+    def _parents(self, parts: Sequence[str]) -> Optional[Tuple[str, List[_ScopedMatcher]]]:
+        # The directory of the last part relative to the root, and the
+        # .gitignore matchers in scope there; None when a parent is pruned.
+        if self._inherited is None:
+            self._inherited = _inherited_matchers(self.root) if self.use_gitignore else []
+        rel_dir = ""
+        scoped = self._scoped(rel_dir, self._inherited)
+        for name in parts[:-1]:
+            rel_path = rel_dir + name
+            if name in EXCLUDED_DIRS or _is_ignored(rel_path, True, self._excludes, scoped):
+                return None
+            rel_dir = rel_path + "/"
+            scoped = self._scoped(rel_dir, scoped)
+        return rel_dir, scoped
+
+    def _relative_parts(self, path: Path) -> Optional[Tuple[str, ...]]:
+        try:
+            parts = path.relative_to(self.root).parts
+        except ValueError:
+            return None
+        return parts or None
+
+    def includes_dir(self, path: Path) -> bool:
+        parts = self._relative_parts(path)
+        if parts is None:
+            return path == self.root
+        parents = self._parents(parts)
+        if parents is None:
+            return False
+        rel_dir, scoped = parents
+        name = parts[-1]
+        return name not in EXCLUDED_DIRS and not _is_ignored(rel_dir + name, True, self._excludes, scoped)
+
+    def includes(self, path: Path) -> bool:
+        parts = self._relative_parts(path)
+        if parts is None:
+            return False
+        parents = self._parents(parts)
+        if parents is None:
+            return False
+        rel_dir, scoped = parents
+        name = parts[-1]
+
+        try:
+            st = os.stat(path)
+        except OSError:
+            return False
+        if not stat.S_ISREG(st.st_mode) or _is_ignored(rel_dir + name, False, self._excludes, scoped):
+            return False
+
+        if name.endswith(SOURCE_SUFFIXES):
+            return True
+        if self.shebangs is not None and _is_candidate_script(name):
+            return bool(st.st_mode & 0o111) and self.shebangs.is_python_script(str(path), st)
+        return self.include_archives and is_archive(Path(name))
+
+
+def dedupe_roots(roots: Sequence[Path]) -> List[Path]:
+    """
+    Resolve scan roots and drop duplicates and roots nested inside another
+    root, so no file is discovered twice. Roots are returned sorted.
+    """
+    kept: List[Path] = []
+    for root in sorted({r.resolve() for r in roots}, key=lambda p: p.parts):
+        # Sorting by parts places a root right after any ancestor root.
+        if kept and kept[-1].is_dir() and root.is_relative_to(kept[-1]):
+            continue
+        kept.append(root)
+    return kept
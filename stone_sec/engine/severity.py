@@ -1,4 +1,5 @@
 from enum import Enum
+from typing import Optional
 
 
 class Severity(Enum):
@@ -15,4 +16,29 @@ class Severity(Enum):
         try:
             return cls[value.upper()]
         except KeyError:
-            raise ValueError(f"Invalid severity level: {value}")
\ No newline at end of file
+            raise ValueError(f"Invalid severity level: {value}")
+
+
+class SeverityGate:
+    """
+    Tracks the highest severity seen so far against an optional `--fail-on`
+    threshold, one finding at a time.
+    """
+
+    def __init__(self, threshold: Optional[Severity] = None):
+        self.threshold = threshold
+        self.highest: Optional[Severity] = None
+        self.count = 0
+
+    def observe(self, severity: Severity):
+        self.count += 1
+        if self.highest is None or severity.value > self.highest.value:
+            self.highest = severity
+
+    @property
+    def tripped(self) -> bool:
+        return (
+            self.threshold is not None
+            and self.highest is not None
+            and self.highest.value >= self.threshold.value
+        )
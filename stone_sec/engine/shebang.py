@@ -0,0 +1,98 @@
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from stone_sec.cache import atomic_write_bytes, cache_dir
+
+# A shebang line longer than this is not a Python interpreter line we care about.
+HEADER_BYTES = 256
+MAX_ENTRIES = 200_000
+
+
+def read_shebang_is_python(path: str) -> bool:
+    """
+    Read only the first line of `path` and check for a Python shebang.
+    """
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return False
+
+    try:
+        header = os.read(fd, HEADER_BYTES)
+    except OSError:
+        return False
+    finally:
+        os.close(fd)
+
+    if not header.startswith(b"#!"):
+        return False
+
+    first_line = header.split(b"\n", 1)[0]
+    return b"python" in first_line
+
+
+class ShebangCache:
+    """
+    Shebang detection results keyed by (device, inode), valid while the
+    file's mtime and size are unchanged.
+
+    Persisted between runs, so a tree of unchanged scripts is classified
+    from `stat` data alone and no file is opened.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = path
+        self._entries: Dict[str, List[int]] = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def load(cls, path: Optional[Path] = None) -> "ShebangCache":
+        cache = cls(path or cache_dir() / "shebang.json")
+        try:
+            data = json.loads(cache.path.read_bytes())
+            if isinstance(data, dict):
+                cache._entries = data
+        except (OSError, ValueError):
+            pass
+        return cache
+
+    def is_python_script(self, path: str, st: os.stat_result) -> bool:
+        key = f"{st.st_dev}:{st.st_ino}"
+        entry = self._entries.get(key)
+
+        if entry is not None and entry[0] == st.st_mtime_ns and entry[1] == st.st_size:
+            self.hits += 1
+            return bool(entry[2])
+
+        self.misses += 1
+        result = read_shebang_is_python(path)
+        with self._lock:
+            self._entries[key] = [st.st_mtime_ns, st.st_size, int(result)]
+            self._dirty = True
+        return result
+
+    def save(self):
+        if not self._dirty or self.path is None:
+            return
+
+        # Snapshot under the lock; concurrent scans may share this cache.
+        with self._lock:
+            if len(self._entries) > MAX_ENTRIES:
+                # Oldest insertions go first; dicts keep insertion order.
+                excess = len(self._entries) - MAX_ENTRIES
+                for key in list(self._entries)[:excess]:
+                    del self._entries[key]
+            data = json.dumps(self._entries).encode("utf-8")
+            self._dirty = False
+
+        try:
+            atomic_write_bytes(self.path, data)
+        except OSError:
+            with self._lock:
+                self._dirty = True
@@ -0,0 +1,113 @@
+import io
+import textwrap
+import tokenize
+from typing import Callable, List, Optional, Sequence, Tuple, Union
+
+from stone_sec.engine.source import Buffer
+from stone_sec.models.finding import Finding
+
+# Lines shown before and after the flagged line.
+CONTEXT_LINES = 2
+
+# Longer lines (minified or generated code) are cut to this many characters.
+MAX_LINE_LENGTH = 160
+
+LineSpan = Callable[[int], Tuple[int, int]]
+
+
+def _cap(line: str, limit: int = MAX_LINE_LENGTH) -> str:
+    return line if len(line) <= limit else line[: limit - 3] + "..."
+
+
+class LineIndex:
+    """
+    Line-start offsets of a source buffer, built on first lookup.
+
+    Lines are sliced from the buffer that was already read for parsing, so
+    snippets cost no extra I/O. Bytes are decoded as Python decodes the
+    file (coding cookie or BOM, UTF-8 by default), one line at a time.
+    """
+
+    def __init__(self, source: Union[str, Buffer]):
+        self.source = source
+        self._offsets: Optional[List[int]] = None
+        self._encoding: Optional[str] = None
+
+    def _build(self) -> List[int]:
+        newline = "\n" if isinstance(self.source, str) else b"\n"
+        offsets = [0]
+        find = self.source.find
+        pos = find(newline)
+        while pos != -1:
+            offsets.append(pos + 1)
+            pos = find(newline, pos + 1)
+        # A sentinel one past the end; a trailing newline does not start a line.
+        if offsets[-1] == len(self.source):
+            offsets[-1] += 1
+        else:
+            offsets.append(len(self.source) + 1)
+        return offsets
+
+    @property
+    def offsets(self) -> List[int]:
+        if self._offsets is None:
+            self._offsets = self._build()
+        return self._offsets
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def _decode(self, raw: bytes) -> str:
+        if self._encoding is None:
+            head = self.source[: self.offsets[min(2, len(self))] - 1]
+            try:
+                encoding, _ = tokenize.detect_encoding(io.BytesIO(head).readline)
+            except SyntaxError:
+                encoding = "utf-8"
+            self._encoding = "utf-8" if encoding == "utf-8-sig" else encoding
+        return raw.decode(self._encoding, errors="replace")
+
+    def line(self, number: int) -> str:
+        """
+        Text of the 1-based line `number`, without its line ending.
+        """
+        offsets = self.offsets
+        text = self.source[offsets[number - 1] : offsets[number] - 1]
+        if not isinstance(text, str):
+            text = self._decode(text)
+            if number == 1:
+                text = text.lstrip("\ufeff")
+        return text.rstrip("\r\n")
+
+
+def attach_snippets(
+    findings: Sequence[Finding],
+    source: Union[str, Buffer],
+    span: Optional[LineSpan] = None,
+    context: int = CONTEXT_LINES,
+):
+    """
+    Replace the rules' placeholder snippets with the flagged source line and
+    set `context` to the surrounding lines.
+
+    `span` maps a line to the first and last line it may draw context from
+    (a notebook cell); by default that is the whole file. Does nothing,
+    and builds no index, when there are no findings.
+    """
+    if not findings:
+        return
+
+    index = LineIndex(source)
+    total = len(index)
+
+    for f in findings:
+        if not 0 < f.line <= total:
+            continue
+
+        first, last = span(f.line) if span is not None else (1, total)
+        first = max(first, f.line - context)
+        last = min(last, f.line + context)
+
+        lines = [_cap(index.line(n)) for n in range(first, last + 1)]
+        f.snippet = lines[f.line - first].strip()
+        f.context = textwrap.dedent("\n".join(lines))
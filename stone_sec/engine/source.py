@@ -0,0 +1,97 @@
+import ast
+import mmap
+import os
+from pathlib import Path
+from typing import Optional, Union
+
+from stone_sec.defaults import DEFAULT_MAX_FILE_SIZE
+from stone_sec.engine.parser import parse_python_source
+
+# Files at or above this size are memory-mapped instead of copied into memory.
+MMAP_THRESHOLD = 1024 * 1024
+
+Buffer = Union[bytes, mmap.mmap]
+
+
+class FileTooLargeError(Exception):
+    def __init__(self, path: Path, size: int, limit: int):
+        super().__init__(f"{path} is {size} bytes (limit {limit})")
+        self.path = path
+        self.size = size
+        self.limit = limit
+
+    def __reduce__(self):
+        # Keep the error picklable across process pools.
+        return (type(self), (self.path, self.size, self.limit))
+
+
+class SourceFile:
+    """
+    The raw bytes of one file, read exactly once.
+
+    Parsing and snippet extraction both work from this buffer. Parsing
+    goes through `ast.parse` on bytes, so PEP 263 coding cookies and BOMs
+    are honoured.
+    """
+
+    def __init__(self, path: Path, buffer: Buffer):
+        self.path = path
+        self.buffer = buffer
+
+    @property
+    def size(self) -> int:
+        return len(self.buffer)
+
+    @property
+    def is_mapped(self) -> bool:
+        return isinstance(self.buffer, mmap.mmap)
+
+    def parse(self) -> Optional[ast.AST]:
+        return parse_python_source(self.buffer, filename=str(self.path))
+
+    def close(self):
+        if isinstance(self.buffer, mmap.mmap):
+            self.buffer.close()
+
+    def __enter__(self) -> "SourceFile":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def read_source(
+    path: Path,
+    max_size: Optional[int] = DEFAULT_MAX_FILE_SIZE,
+    mmap_threshold: int = MMAP_THRESHOLD,
+) -> Optional[SourceFile]:
+    """
+    Read `path` once into a `SourceFile`.
+
+    Returns None if the file cannot be read. Raises `FileTooLargeError` when
+    the file exceeds `max_size` (None or 0 disables the guard); the size
+    check uses the open descriptor, so no bytes are read in that case.
+    """
+    try:
+        fd = os.open(path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+    except OSError:
+        return None
+
+    try:
+        size = os.fstat(fd).st_size
+
+        if max_size and size > max_size:
+            raise FileTooLargeError(path, size, max_size)
+
+        if size >= mmap_threshold:
+            try:
+                return SourceFile(path, mmap.mmap(fd, 0, access=mmap.ACCESS_READ))
+            except (OSError, ValueError):
+                pass
+
+        with os.fdopen(os.dup(fd), "rb") as f:
+            return SourceFile(path, f.read())
+    except OSError:
+        return None
+    finally:
+        os.close(fd)
@@ -0,0 +1,206 @@
+import json
+import posixpath
+import sqlite3
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+from stone_sec.models.finding import Finding
+
+SCHEMA_VERSION = 1
+
+# PRAGMA values cannot be bound as parameters; the statement is built once
+# from the constant rather than interpolated at the call.
+_SET_SCHEMA_VERSION = "PRAGMA user_version=" + str(SCHEMA_VERSION)
+
+# Rows buffered before each executemany; the run is still one transaction.
+INSERT_BATCH = 5000
+
+GROUPINGS = ("rule", "dir", "file", "week", "run")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    started_at TEXT NOT NULL,
+    roots TEXT NOT NULL,
+    files_scanned INTEGER,
+    total_findings INTEGER,
+    baselined INTEGER
+);
+CREATE TABLE IF NOT EXISTS findings (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    rule_id TEXT NOT NULL,
+    severity INTEGER NOT NULL,
+    file TEXT NOT NULL,
+    dir TEXT NOT NULL,
+    line INTEGER NOT NULL,
+    fingerprint TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_findings_run ON findings(run_id);
+CREATE INDEX IF NOT EXISTS idx_findings_rule ON findings(rule_id, run_id);
+CREATE INDEX IF NOT EXISTS idx_findings_dir ON findings(dir, run_id);
+CREATE INDEX IF NOT EXISTS idx_findings_file ON findings(file, run_id);
+CREATE INDEX IF NOT EXISTS idx_findings_fingerprint ON findings(fingerprint);
+CREATE INDEX IF NOT EXISTS idx_runs_started ON runs(started_at);
+"""
+
+_INSERT = (
+    "INSERT INTO findings (run_id, rule_id, severity, file, dir, line, fingerprint) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+
+# Columns a finding aggregation groups by.
+_GROUP_COLUMNS = {"rule": "rule_id", "dir": "dir", "file": "file"}
+
+
+class StoreError(Exception):
+    pass
+
+
+class FindingStore:
+    """
+    Findings of every review run in a local SQLite database.
+
+    A run is written in a single transaction: rows are buffered and
+    inserted in batches through one prepared statement, and nothing is
+    visible to readers until `finish_run` commits. Paths are stored
+    relative to the review's working directory, with their directory
+    precomputed so per-directory queries use an index.
+    """
+
+    def __init__(self, path: Path, batch_size: int = INSERT_BATCH):
+        self.path = path
+        self.batch_size = batch_size
+        self._run_id: Optional[int] = None
+        self._rows: List[tuple] = []
+
+        try:
+            self._db = sqlite3.connect(str(path), isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            # A larger page cache keeps index maintenance of big runs in memory.
+            self._db.execute("PRAGMA cache_size=-65536")
+            version = self._db.execute("PRAGMA user_version").fetchone()[0]
+            if version not in (0, SCHEMA_VERSION):
+                raise StoreError(f"Unsupported findings store version {version}: {path}")
+            self._db.executescript(_SCHEMA)
+            self._db.execute(_SET_SCHEMA_VERSION)
+        except sqlite3.Error as exc:
+            raise StoreError(f"Unable to open findings store {path}: {exc}")
+
+    def begin_run(self, roots: Sequence[str]) -> int:
+        started = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+        self._db.execute("BEGIN")
+        cursor = self._db.execute(
+            "INSERT INTO runs (started_at, roots) VALUES (?, ?)", (started, json.dumps(list(roots)))
+        )
+        self._run_id = cursor.lastrowid
+        return self._run_id
+
+    def add(self, f: Finding, file: str, fingerprint: str):
+        self._rows.append(
+            (
+                self._run_id,
+                f.rule_id,
+                f.severity.value,
+                file,
+                posixpath.dirname(file) or ".",
+                f.line,
+                fingerprint,
+            )
+        )
+        if len(self._rows) >= self.batch_size:
+            self._flush()
+
+    def _flush(self):
+        if self._rows:
+            self._db.executemany(_INSERT, self._rows)
+            self._rows = []
+
+    def finish_run(self, files_scanned: int, total_findings: int, baselined: Optional[int] = None):
+        self._flush()
+        self._db.execute(
+            "UPDATE runs SET files_scanned = ?, total_findings = ?, baselined = ? WHERE id = ?",
+            (files_scanned, total_findings, baselined, self._run_id),
+        )
+        self._db.execute("COMMIT")
+        self._run_id = None
+
+    def close(self):
+        """
+        Close the database; an unfinished run is rolled back.
+        """
+        self._rows = []
+        if self._db.in_transaction:
+            self._db.execute("ROLLBACK")
+        self._db.close()
+
+    def __enter__(self) -> "FindingStore":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def aggregate(
+        self,
+        by: str = "rule",
+        rule: Optional[str] = None,
+        directory: Optional[str] = None,
+        since: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[Tuple[str, int, int]]:
+        """
+        `(key, runs, findings)` rows: the number of runs a rule, directory,
+        file, week or run appears in, and its total findings.
+
+        `directory` includes everything below it; `since` is a date
+        (`YYYY-MM-DD`, UTC) bounding the runs considered.
+        """
+        if by not in GROUPINGS:
+            raise StoreError(f"Unknown grouping: {by}")
+
+        first_run = 0
+        if since:
+            row = self._db.execute(
+                "SELECT MIN(id) FROM runs WHERE started_at >= date(?)", (since,)
+            ).fetchone()
+            if row[0] is None:
+                return []
+            first_run = row[0]
+
+        filters, params = [], []
+        if rule:
+            filters.append("f.rule_id = ?")
+            params.append(rule)
+        directory = (directory or "").strip("/")
+        if directory and directory != ".":
+            # Everything below `directory`, as an index range: '0' follows '/'.
+            filters.append("(f.dir = ? OR (f.dir >= ? AND f.dir < ?))")
+            params += [directory, directory + "/", directory + "0"]
+
+        if by in _GROUP_COLUMNS:
+            column = _GROUP_COLUMNS[by]
+            where = " AND ".join(["f.run_id >= ?"] + filters)
+            sql = (
+                f"SELECT f.{column}, COUNT(DISTINCT f.run_id), COUNT(*) FROM findings f "
+                f"WHERE {where} GROUP BY f.{column} ORDER BY COUNT(*) DESC, f.{column}"
+            )
+            params = [first_run] + params
+        else:
+            # Per week or run, counting runs without (matching) findings too.
+            key = "date(r.started_at, 'weekday 0', '-6 days')" if by == "week" else "r.id"
+            on = " AND ".join(["f.run_id = r.id"] + filters)
+            sql = (
+                f"SELECT {key} AS k, COUNT(DISTINCT r.id), COUNT(f.run_id) FROM runs r "
+                f"LEFT JOIN findings f ON {on} WHERE r.id >= ? GROUP BY k ORDER BY k"
+            )
+            params = params + [first_run]
+
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        try:
+            return [(str(key), runs, count) for key, runs, count in self._db.execute(sql, params)]
+        except sqlite3.Error as exc:
+            raise StoreError(f"Query failed: {exc}")
@@ -0,0 +1,123 @@
+import io
+import re
+import tokenize
+from typing import Dict, FrozenSet, Iterator, List, Optional, Union
+
+from stone_sec.engine.source import Buffer
+from stone_sec.models.finding import Finding
+
+# `# nosec` silences every rule; `# stone-sec: ignore[PY-EXEC-001, ...]` the
+# listed ones, or every rule when no `[` follows. An unclosed or empty list
+# silences nothing, so a typo never widens a suppression to every rule.
+_NOSEC = re.compile(r"(?:^|#)\s*nosec\b", re.IGNORECASE)
+_IGNORE = re.compile(r"stone-sec:\s*ignore\b(\s*\[([^\]]*)(\])?)?", re.IGNORECASE)
+
+# Rule IDs a line suppresses; None means every rule.
+Suppression = Optional[FrozenSet[str]]
+
+# Tokens that neither start nor end a logical line.
+_TRIVIA = (tokenize.COMMENT, tokenize.NL, tokenize.ENCODING)
+
+
+def parse_suppression(comment: str) -> Union[Suppression, bool]:
+    """
+    The rules a comment suppresses, or False when it suppresses nothing.
+    """
+    if _NOSEC.search(comment):
+        return None
+
+    m = _IGNORE.search(comment)
+    if m is None:
+        return False
+    if m.group(1) is None:
+        return None
+    if m.group(3) is None:
+        return False
+
+    ids = frozenset(part.strip().upper() for part in m.group(2).split(",") if part.strip())
+    return ids or False
+
+
+def _merge(a: Suppression, b: Suppression) -> Suppression:
+    if a is None or b is None:
+        return None
+    return a | b
+
+
+def _byte_lines(buf: Buffer) -> Iterator[bytes]:
+    pos, size = 0, len(buf)
+    while pos < size:
+        end = buf.find(b"\n", pos)
+        end = size if end == -1 else end + 1
+        yield buf[pos:end]
+        pos = end
+
+
+def _tokens(source: Union[str, Buffer]) -> Iterator[tokenize.TokenInfo]:
+    if isinstance(source, str):
+        return tokenize.generate_tokens(io.StringIO(source).readline)
+    return tokenize.tokenize(_byte_lines(source).__next__)
+
+
+def find_suppressions(source: Union[str, Buffer]) -> Dict[int, Suppression]:
+    """
+    Map each line covered by a suppression comment to the rules it silences.
+
+    A comment applies to every physical line of the logical line it ends
+    or sits in, so a comment after a multi-line call covers the whole call.
+    """
+    suppressed: Dict[int, Suppression] = {}
+    start: Optional[int] = None
+    pending: Union[Suppression, bool] = False
+
+    def cover(first: int, last: int, rules: Suppression):
+        for line in range(first, last + 1):
+            suppressed[line] = _merge(suppressed[line], rules) if line in suppressed else rules
+
+    try:
+        for tok in _tokens(source):
+            if tok.type == tokenize.COMMENT:
+                rules = parse_suppression(tok.string)
+                if rules is False:
+                    continue
+                if start is None:
+                    # A comment on a line of its own covers only that line.
+                    cover(tok.start[0], tok.start[0], rules)
+                else:
+                    pending = rules if pending is False else _merge(pending, rules)
+            elif tok.type in _TRIVIA:
+                continue
+            elif tok.type in (tokenize.NEWLINE, tokenize.ENDMARKER):
+                if start is not None and pending is not False:
+                    cover(start, tok.start[0], pending)
+                start, pending = None, False
+            elif start is None and tok.type not in (tokenize.INDENT, tokenize.DEDENT):
+                start = tok.start[0]
+    except (tokenize.TokenError, SyntaxError):
+        pass
+
+    return suppressed
+
+
+def filter_suppressed(findings: List[Finding], source: Union[str, Buffer]) -> List[Finding]:
+    """
+    Drop findings silenced by an inline comment.
+
+    Comments are only tokenized for files that have findings, so clean
+    files cost nothing extra.
+    """
+    if not findings:
+        return findings
+
+    suppressed = find_suppressions(source)
+    if not suppressed:
+        return findings
+
+    kept = []
+    for f in findings:
+        if f.line in suppressed:
+            rules = suppressed[f.line]
+            if rules is None or f.rule_id in rules:
+                continue
+        kept.append(f)
+    return kept
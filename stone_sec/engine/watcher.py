@@ -0,0 +1,410 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from stone_sec.engine.baseline import normalize_code
+from stone_sec.engine.pipeline import raw_size_limit, scan_source_file
+from stone_sec.engine.scanner import EXCLUDED_DIRS, GITIGNORE, PathFilter, discover_python_files
+from stone_sec.engine.shebang import ShebangCache
+from stone_sec.engine.source import DEFAULT_MAX_FILE_SIZE, FileTooLargeError, read_source
+from stone_sec.models.finding import Finding
+
+# (mtime_ns, size) is enough to notice an editor save without reading the file.
+FileSignature = Tuple[int, int]
+# Line numbers are left out, as in baseline fingerprints, so an edit above a
+# finding does not report it as resolved and new again.
+FindingKey = Tuple[str, Optional[int], str, int]
+
+
+@dataclass
+class WatchDelta:
+    new: List[Finding] = field(default_factory=list)
+    resolved: List[Finding] = field(default_factory=list)
+    # Changed files over the size limit; their previous findings are kept.
+    skipped: List[FileTooLargeError] = field(default_factory=list)
+    rescanned: int = 0
+    elapsed: float = 0.0
+
+    def __bool__(self) -> bool:
+        return bool(self.new or self.resolved or self.skipped)
+
+
+def _finding_keys(findings: Iterable[Finding]) -> List[FindingKey]:
+    """
+    `(rule, cell, normalized code, occurrence)` for each finding of one
+    file; the occurrence tells identical flagged code apart.
+    """
+    seen: Dict[Tuple[str, Optional[int], str], int] = {}
+    keys = []
+    for f in findings:
+        base = (f.rule_id, f.cell, normalize_code(f.snippet))
+        occurrence = seen.get(base, 0)
+        seen[base] = occurrence + 1
+        keys.append(base + (occurrence,))
+    return keys
+
+
+def _signature(path: Path) -> Optional[FileSignature]:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+class _Inotify:
+    """
+    Minimal ctypes binding to Linux inotify.
+
+    Events are reported as `(path, mask)`. When the kernel queue overflows,
+    `overflowed` is set and the caller falls back to a full stat poll.
+    """
+
+    IN_MODIFY = 0x00000002
+    IN_ATTRIB = 0x00000004
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_DELETE_SELF = 0x00000400
+    IN_MOVE_SELF = 0x00000800
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_ISDIR = 0x40000000
+    MASK = (
+        IN_MODIFY
+        | IN_ATTRIB
+        | IN_CLOSE_WRITE
+        | IN_MOVED_FROM
+        | IN_MOVED_TO
+        | IN_CREATE
+        | IN_DELETE
+        | IN_DELETE_SELF
+        | IN_MOVE_SELF
+    )
+
+    _HEADER = struct.Struct("iIII")
+
+    def __init__(self):
+        libc_name = ctypes.util.find_library("c")
+        if not libc_name:
+            raise OSError("libc not found")
+
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        self.fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        self._dirs: Dict[int, str] = {}
+        self._events: List[Tuple[str, int]] = []
+        self.overflowed = False
+
+    def watch(self, directory: str):
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(directory), self.MASK)
+        if wd >= 0:
+            self._dirs[wd] = directory
+
+    def wait(self, timeout: float) -> bool:
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return False
+
+        try:
+            while True:
+                data = os.read(self.fd, 65536)
+                if not data:
+                    break
+                self._parse(data)
+        except BlockingIOError:
+            pass
+        return True
+
+    def _parse(self, data: bytes):
+        offset = 0
+        while offset + self._HEADER.size <= len(data):
+            wd, mask, _, length = self._HEADER.unpack_from(data, offset)
+            offset += self._HEADER.size
+            name = data[offset : offset + length].rstrip(b"\0")
+            offset += length
+
+            if mask & self.IN_Q_OVERFLOW:
+                self.overflowed = True
+                continue
+            directory = self._dirs.get(wd)
+            if mask & self.IN_IGNORED:
+                self._dirs.pop(wd, None)
+            if directory is None or mask & self.IN_IGNORED:
+                continue
+            path = os.path.join(directory, os.fsdecode(name)) if name else directory
+            self._events.append((path, mask))
+
+    def take_events(self) -> List[Tuple[str, int]]:
+        events, self._events = self._events, []
+        return events
+
+    def close(self):
+        os.close(self.fd)
+
+
+def _open_inotify() -> Optional[_Inotify]:
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        return _Inotify()
+    except (OSError, AttributeError):
+        return None
+
+
+class Watcher:
+    """
+    Keeps per-file findings in memory and re-scans only the files whose
+    (mtime, size) signature changed.
+
+    With inotify, only the paths named by events are checked, and new
+    directories are watched as they appear, so the cost of a change does
+    not grow with the tree. Without it, or after a queue overflow or a
+    `.gitignore` change, the whole tree is polled.
+    """
+
+    def __init__(
+        self,
+        target: Path,
+        interval: float = 0.5,
+        debounce: float = 0.2,
+        use_inotify: bool = True,
+        exclude: Sequence[str] = (),
+        use_gitignore: bool = True,
+        detect_scripts: bool = True,
+        max_file_size: Optional[int] = DEFAULT_MAX_FILE_SIZE,
+    ):
+        self.target = target
+        self.root = target.resolve()
+        self.exclude = exclude
+        self.use_gitignore = use_gitignore
+        self.max_file_size = max_file_size
+        self._shebangs = ShebangCache.load() if detect_scripts else None
+        self._filter = PathFilter(self.root, exclude, use_gitignore, self._shebangs)
+        self.interval = interval
+        self.debounce = debounce
+        self._signatures: Dict[Path, FileSignature] = {}
+        self._findings: Dict[Path, List[Finding]] = {}
+        self._inotify = _open_inotify() if use_inotify else None
+
+    @property
+    def uses_inotify(self) -> bool:
+        return self._inotify is not None
+
+    def findings(self) -> List[Finding]:
+        result: List[Finding] = []
+        for path in sorted(self._findings):
+            result.extend(self._findings[path])
+        return result
+
+    def file_count(self) -> int:
+        return len(self._signatures)
+
+    def _scan_file(self, path: Path) -> Optional[List[Finding]]:
+        source = read_source(path, max_size=raw_size_limit(path, self.max_file_size))
+        if source is None:
+            return None
+        with source:
+            return scan_source_file(source, self.max_file_size)
+
+    def _poll(self) -> Set[Path]:
+        """
+        Return the files that were added, modified or removed.
+        """
+        changed: Set[Path] = set()
+        current: Dict[Path, FileSignature] = {}
+
+        for path in discover_python_files(
+            self.target,
+            exclude=self.exclude,
+            use_gitignore=self.use_gitignore,
+            detect_scripts=self._shebangs is not None,
+            shebang_cache=self._shebangs,
+        ):
+            sig = _signature(path)
+            if sig is None:
+                continue
+            current[path] = sig
+            if self._signatures.get(path) != sig:
+                changed.add(path)
+
+        changed.update(set(self._signatures) - set(current))
+        self._signatures = current
+        return changed
+
+    def _watch_tree(self, directory: Path) -> List[Path]:
+        """
+        Watch `directory` and every directory below it; returns the files
+        found, which may predate the watch.
+        """
+        files: List[Path] = []
+        for dirpath, dirnames, filenames in os.walk(directory):
+            dirnames[:] = [
+                d for d in dirnames
+                if d not in EXCLUDED_DIRS and self._filter.includes_dir(Path(dirpath, d))
+            ]
+            self._inotify.watch(dirpath)
+            files.extend(Path(dirpath, name) for name in filenames)
+        return files
+
+    def _includes(self, path: Path) -> bool:
+        if self.root.is_file():
+            return path == self.root
+        return self._filter.includes(path)
+
+    def _known_below(self, directory: Path) -> List[Path]:
+        return [p for p in self._signatures if p.is_relative_to(directory)]
+
+    def _changes(self) -> Set[Path]:
+        """
+        The files added, modified or removed since the last call.
+        """
+        if self._inotify is None:
+            return self._poll()
+
+        events = self._inotify.take_events()
+        if self._inotify.overflowed:
+            # Events were lost, including possibly new directories.
+            self._inotify.overflowed = False
+            self._filter.reset()
+            self._watch_target()
+            return self._poll()
+
+        candidates: Set[Path] = set()
+        for name, mask in events:
+            path = Path(name)
+            if path.name == GITIGNORE:
+                # Inclusion of any file below may have changed.
+                self._filter.reset()
+                return self._poll()
+
+            if mask & (_Inotify.IN_DELETE_SELF | _Inotify.IN_MOVE_SELF):
+                candidates.update(self._known_below(path))
+            elif mask & _Inotify.IN_ISDIR:
+                if mask & (_Inotify.IN_CREATE | _Inotify.IN_MOVED_TO):
+                    if self._filter.includes_dir(path):
+                        candidates.update(self._watch_tree(path))
+                else:
+                    candidates.update(self._known_below(path))
+            else:
+                candidates.add(path)
+
+        changed: Set[Path] = set()
+        for path in candidates:
+            sig = _signature(path) if self._includes(path) else None
+            if sig is not None:
+                if self._signatures.get(path) != sig:
+                    self._signatures[path] = sig
+                    changed.add(path)
+            elif path in self._signatures:
+                del self._signatures[path]
+                changed.add(path)
+
+        if self._shebangs is not None:
+            self._shebangs.save()
+        return changed
+
+    def _watch_target(self):
+        if self.root.is_file():
+            self._inotify.watch(str(self.root.parent))
+        else:
+            self._watch_tree(self.root)
+
+    def start(self) -> WatchDelta:
+        """
+        Run the initial full scan; every finding is reported as new.
+        """
+        if self._inotify is not None:
+            self._watch_target()
+        return self._rescan(self._poll())
+
+    def check(self) -> WatchDelta:
+        """
+        Collect pending changes once and re-scan them.
+        """
+        if self._inotify is not None:
+            self._inotify.wait(0)
+        return self._rescan(self._changes())
+
+    def _rescan(self, changed: Set[Path]) -> WatchDelta:
+        started = time.perf_counter()
+        delta = WatchDelta()
+
+        for path in sorted(changed):
+            old = self._findings.get(path, [])
+
+            if path not in self._signatures:
+                new: List[Finding] = []
+            else:
+                try:
+                    scanned = self._scan_file(path)
+                except FileTooLargeError as exc:
+                    # Not re-read, so its last findings still stand.
+                    delta.skipped.append(exc)
+                    continue
+                if scanned is None:
+                    # Keep the last good result while the file is mid-edit
+                    # and does not parse.
+                    continue
+                new = scanned
+
+            delta.rescanned += 1
+            old_keys = _finding_keys(old)
+            new_keys = _finding_keys(new)
+            old_set, new_set = set(old_keys), set(new_keys)
+
+            delta.new.extend(f for f, key in zip(new, new_keys) if key not in old_set)
+            delta.resolved.extend(f for f, key in zip(old, old_keys) if key not in new_set)
+
+            if new:
+                self._findings[path] = new
+            else:
+                self._findings.pop(path, None)
+
+        delta.elapsed = time.perf_counter() - started
+        return delta
+
+    def _wait(self, timeout: float) -> bool:
+        if self._inotify is not None:
+            return self._inotify.wait(timeout)
+        time.sleep(timeout)
+        return False
+
+    def run(self, on_delta: Callable[[WatchDelta], None]):
+        """
+        Block forever, calling `on_delta` after each settled burst of changes.
+        """
+        try:
+            while True:
+                self._wait(self.interval)
+
+                changed = self._changes()
+                if not changed:
+                    continue
+
+                # Debounce: keep folding in changes until a full debounce
+                # window passes quietly, so one burst of saves is one re-scan.
+                while True:
+                    self._wait(self.debounce)
+                    more = self._changes()
+                    if not more:
+                        break
+                    changed |= more
+
+                delta = self._rescan(changed)
+                if delta:
+                    on_delta(delta)
+        finally:
+            if self._inotify is not None:
+                self._inotify.close()
@@ -1,5 +1,22 @@
+import time
 from abc import ABC, abstractmethod
-from typing import Dict
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Dict, List, Optional, Sequence
+
+# What a provider returns when the model cannot be reached or its answer
+# cannot be parsed.
+FALLBACK_RESULT = {
+    "explanation": "Potential security risk detected.",
+    "exploit_scenario": "An attacker could abuse this behavior if input is controlled.",
+    "remediation": "Avoid unsafe constructs and validate inputs.",
+}
+
+# Seconds between checks for timed-out requests in `generate_many`.
+POLL_INTERVAL = 0.05
+
+
+def fallback_result() -> Dict[str, str]:
+    return dict(FALLBACK_RESULT)
 
 
 class LLMProvider(ABC):
@@ -11,4 +28,73 @@ class LLMProvider(ABC):
         - exploit_scenario
         - remediation
         """
-        raise NotImplementedError
\ No newline at end of file
+        raise NotImplementedError
+
+    def generate_many(
+        self,
+        prompts: Sequence[str],
+        concurrency: int = 1,
+        timeout: Optional[float] = None,
+    ) -> List[Dict[str, str]]:
+        """
+        `generate` for every prompt, up to `concurrency` at a time.
+
+        Results are aligned with `prompts` whatever order requests finish
+        in. A request that raises, or is still running `timeout` seconds
+        after it started, gets the fallback result; its thread is left to
+        finish in the background.
+        """
+        if not prompts:
+            return []
+        if concurrency <= 1 and timeout is None:
+            return [self._generate_safely(p) for p in prompts]
+
+        results: List[Optional[Dict[str, str]]] = [None] * len(prompts)
+        started: Dict[int, float] = {}
+
+        def run(i: int, prompt: str) -> Dict[str, str]:
+            started[i] = time.monotonic()
+            return self.generate(prompt)
+
+        pool = ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(prompts))))
+        try:
+            pending: Dict[Future, int] = {pool.submit(run, i, p): i for i, p in enumerate(prompts)}
+
+            while pending:
+                wait_for = None
+                if timeout is not None:
+                    # Re-check running requests at least every POLL_INTERVAL.
+                    wait_for = POLL_INTERVAL
+                    now = time.monotonic()
+                    for future, i in list(pending.items()):
+                        if i not in started or future.done():
+                            continue
+                        remaining = started[i] + timeout - now
+                        if remaining <= 0:
+                            results[i] = fallback_result()
+                            del pending[future]
+                        else:
+                            wait_for = min(wait_for, remaining)
+
+                done, _ = wait(pending, timeout=wait_for, return_when=FIRST_COMPLETED)
+                for future in done:
+                    i = pending.pop(future)
+                    try:
+                        results[i] = future.result()
+                    except Exception:
+                        results[i] = fallback_result()
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+        return results
+
+    def close(self):
+        """
+        Release connections or other resources held between requests.
+        """
+
+    def _generate_safely(self, prompt: str) -> Dict[str, str]:
+        try:
+            return self.generate(prompt)
+        except Exception:
+            return fallback_result()
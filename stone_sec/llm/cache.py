@@ -0,0 +1,189 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from stone_sec.cache import cache_dir
+from stone_sec.defaults import DEFAULT_LLM_CACHE_ENTRIES, DEFAULT_LLM_CACHE_TTL_DAYS
+from stone_sec.llm.base import FALLBACK_RESULT, LLMProvider
+from stone_sec.llm.prompt import PROMPT_VERSION, normalize_prompt
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    result TEXT NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_results_accessed ON results(accessed);
+"""
+
+
+def default_cache_path() -> Path:
+    return cache_dir() / "llm-cache.sqlite"
+
+
+def cache_key(model: str, prompt: str) -> str:
+    payload = "\0".join((model, str(PROMPT_VERSION), normalize_prompt(prompt)))
+    return hashlib.sha256(payload.encode("utf-8", errors="surrogateescape")).hexdigest()
+
+
+def is_cacheable(result: Dict[str, str]) -> bool:
+    """
+    Only real answers are kept: never the fallback, never an empty parse.
+    """
+    return result != FALLBACK_RESULT and any(result.get(k) for k in FALLBACK_RESULT)
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    stored: int = 0
+    expired: int = 0
+    evicted: int = 0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.hits} hit(s), {self.misses} miss(es), {self.stored} stored, "
+            f"{self.expired} expired, {self.evicted} evicted"
+        )
+
+
+class LLMCache:
+    """
+    Parsed `generate` results on disk, keyed by model, prompt template
+    version and normalized prompt.
+
+    Entries older than `ttl` seconds are ignored and dropped. When more
+    than `max_entries` are stored, the least recently used ones are
+    evicted when the cache is closed with `prune`.
+
+    Raises `OSError` or `sqlite3.Error` if the database cannot be opened.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        max_entries: int = DEFAULT_LLM_CACHE_ENTRIES,
+        ttl: Optional[float] = DEFAULT_LLM_CACHE_TTL_DAYS * 86400,
+    ):
+        self.path = path or default_cache_path()
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(self.path), isolation_level=None, check_same_thread=False)
+        try:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.executescript(_SCHEMA)
+        except sqlite3.Error:
+            self._db.close()
+            raise
+
+    def get(self, key: str) -> Optional[Dict[str, str]]:
+        now = time.time()
+        with self._lock:
+            row = self._db.execute("SELECT result, created FROM results WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.stats.misses += 1
+                return None
+
+            if self.ttl is not None and now - row[1] > self.ttl:
+                self._db.execute("DELETE FROM results WHERE key = ?", (key,))
+                self.stats.expired += 1
+                self.stats.misses += 1
+                return None
+
+            self._db.execute("UPDATE results SET accessed = ? WHERE key = ?", (now, key))
+            self.stats.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key: str, result: Dict[str, str]):
+        if not is_cacheable(result):
+            return
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO results (key, result, created, accessed) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(result), now, now),
+            )
+            self.stats.stored += 1
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def prune(self):
+        """
+        Drop expired entries, then the least recently used beyond `max_entries`.
+        """
+        with self._lock:
+            if self.ttl is not None:
+                cursor = self._db.execute("DELETE FROM results WHERE created < ?", (time.time() - self.ttl,))
+                self.stats.expired += cursor.rowcount
+
+            excess = self._db.execute("SELECT COUNT(*) FROM results").fetchone()[0] - self.max_entries
+            if excess > 0:
+                cursor = self._db.execute(
+                    "DELETE FROM results WHERE key IN "
+                    "(SELECT key FROM results ORDER BY accessed LIMIT ?)",
+                    (excess,),
+                )
+                self.stats.evicted += cursor.rowcount
+
+    def clear(self):
+        with self._lock:
+            self._db.execute("DELETE FROM results")
+
+    def close(self, prune: bool = True):
+        if prune:
+            self.prune()
+        self._db.close()
+
+
+class CachingProvider(LLMProvider):
+    """
+    Serves repeated prompts from an `LLMCache` and only sends misses to the
+    wrapped provider; `requests` counts those.
+    """
+
+    def __init__(self, provider: LLMProvider, cache: LLMCache, model: Optional[str] = None):
+        self.provider = provider
+        self.cache = cache
+        self.model = model or getattr(provider, "model", type(provider).__name__)
+        self.requests = 0
+
+    def generate(self, prompt: str) -> Dict[str, str]:
+        return self.generate_many([prompt])[0]
+
+    def generate_many(
+        self,
+        prompts: Sequence[str],
+        concurrency: int = 1,
+        timeout: Optional[float] = None,
+    ) -> List[Dict[str, str]]:
+        keys = [cache_key(self.model, p) for p in prompts]
+        results: List[Optional[Dict[str, str]]] = [self.cache.get(k) for k in keys]
+
+        missing = [i for i, r in enumerate(results) if r is None]
+        if missing:
+            self.requests += len(missing)
+            fresh = self.provider.generate_many(
+                [prompts[i] for i in missing], concurrency=concurrency, timeout=timeout
+            )
+            for i, result in zip(missing, fresh):
+                results[i] = result
+                self.cache.put(keys[i], result)
+
+        return results
+
+    def close(self):
+        self.provider.close()
+        self.cache.close()
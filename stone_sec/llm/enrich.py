@@ -0,0 +1,102 @@
+from typing import Callable, Dict, List, Optional, Tuple
+
+from stone_sec.defaults import DEFAULT_LLM_CONCURRENCY
+from stone_sec.llm.base import LLMProvider
+from stone_sec.llm.cache import is_cacheable
+from stone_sec.llm.prompt import build_prompt, normalize_prompt
+from stone_sec.models.finding import Finding
+
+# Findings sent per `generate_many` call, per unit of concurrency.
+BATCH_PER_WORKER = 4
+
+
+def apply_result(f: Finding, result: Dict[str, str]):
+    f.explanation = result.get("explanation")
+    f.exploit_scenario = result.get("exploit_scenario")
+    f.remediation = result.get("remediation")
+
+
+def cluster_key(f: Finding, prompt: str) -> Tuple[str, str]:
+    """
+    Findings with the same key get the same answer: same rule, and the same
+    prompt apart from file, line and whitespace.
+    """
+    return (f.rule_id, normalize_prompt(prompt))
+
+
+class EnrichmentStage:
+    """
+    Adds LLM explanations to findings between detection and reporting.
+
+    Findings are grouped by `cluster_key` and the model is asked once per
+    group: every member gets the group's answer, including members seen
+    in later batches. Distinct prompts are collected into batches sent
+    through `generate_many`, so up to `concurrency` model requests run at
+    once. Findings are handed to `sink` in the order they were added.
+
+    `requests` counts prompts sent to the provider (a caching provider
+    answers some without the model), `findings` the findings enriched;
+    the difference is the requests saved by grouping.
+    """
+
+    def __init__(
+        self,
+        provider: LLMProvider,
+        sink: Callable[[Finding], None],
+        concurrency: int = DEFAULT_LLM_CONCURRENCY,
+        timeout: Optional[float] = None,
+        batch_size: Optional[int] = None,
+    ):
+        self.provider = provider
+        self.sink = sink
+        self.concurrency = max(1, concurrency)
+        self.timeout = timeout
+        self.batch_size = batch_size or self.concurrency * BATCH_PER_WORKER
+        self.requests = 0
+        self.findings = 0
+        self._answers: Dict[Tuple[str, str], Dict[str, str]] = {}
+        self._pending: List[Tuple[Finding, Tuple[str, str]]] = []
+        self._prompts: Dict[Tuple[str, str], str] = {}
+
+    @property
+    def saved(self) -> int:
+        return self.findings - self.requests
+
+    def add(self, f: Finding):
+        prompt = build_prompt(f)
+        key = cluster_key(f, prompt)
+        self.findings += 1
+
+        if key in self._answers and not self._pending:
+            apply_result(f, self._answers[key])
+            self.sink(f)
+            return
+
+        self._pending.append((f, key))
+        if key not in self._answers and key not in self._prompts:
+            self._prompts[key] = prompt
+            if len(self._prompts) >= self.batch_size:
+                self.flush()
+
+    def flush(self):
+        batch, self._pending = self._pending, []
+        prompts, self._prompts = self._prompts, {}
+        if not batch:
+            return
+
+        fresh: Dict[Tuple[str, str], Dict[str, str]] = {}
+        if prompts:
+            results = self.provider.generate_many(
+                list(prompts.values()),
+                concurrency=self.concurrency,
+                timeout=self.timeout,
+            )
+            self.requests += len(prompts)
+            fresh = dict(zip(prompts, results))
+            # Failed answers serve this batch only; the group is asked again
+            # if more members turn up later.
+            self._answers.update((k, r) for k, r in fresh.items() if is_cacheable(r))
+
+        for f, key in batch:
+            apply_result(f, fresh.get(key) or self._answers[key])
+            self.sink(f)
@@ -0,0 +1,159 @@
+import http.client
+import json
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit
+
+from stone_sec.defaults import DEFAULT_LLM_TIMEOUT
+from stone_sec.llm.base import LLMProvider, fallback_result
+
+DEFAULT_PORT = 11434
+DEFAULT_URL = f"http://127.0.0.1:{DEFAULT_PORT}"
+
+# How long Ollama keeps the model loaded after a request, so consecutive
+# findings do not pay for a reload.
+DEFAULT_KEEP_ALIVE = "10m"
+
+DEFAULT_POOL_SIZE = 4
+
+
+def default_url() -> str:
+    """
+    The Ollama server URL: `OLLAMA_HOST` (as the ollama CLI reads it) or the
+    local default. Like the CLI, a host without a scheme or port uses port
+    11434; an explicit `http://` or `https://` URL keeps its scheme's port.
+    """
+    host = os.environ.get("OLLAMA_HOST", "").strip()
+    if not host:
+        return DEFAULT_URL
+    if "://" in host:
+        return host
+
+    parts = urlsplit("http://" + host)
+    netloc = parts.netloc if parts.hostname else "127.0.0.1" + parts.netloc
+    if parts.port is None:
+        netloc = f"{netloc}:{DEFAULT_PORT}"
+    return urlunsplit(("http", netloc, parts.path, "", ""))
+
+
+class ConnectionPool:
+    """
+    Idle keep-alive connections to one server, reused across requests and
+    threads. At most `size` idle connections are kept.
+    """
+
+    def __init__(self, url: str, size: int = DEFAULT_POOL_SIZE, timeout: Optional[float] = None):
+        parts = urlsplit(url)
+        self.scheme = parts.scheme or "http"
+        self.host = parts.hostname or "127.0.0.1"
+        self.port = parts.port
+        self.base_path = parts.path.rstrip("/")
+        self.size = size
+        self.timeout = timeout
+        self.opened = 0
+        self._idle: List[http.client.HTTPConnection] = []
+        self._lock = threading.Lock()
+
+    def get(self) -> Tuple[http.client.HTTPConnection, bool]:
+        """
+        A connection, and whether it was reused from the pool.
+        """
+        with self._lock:
+            if self._idle:
+                return self._idle.pop(), True
+            self.opened += 1
+
+        cls = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+        return cls(self.host, self.port, timeout=self.timeout), False
+
+    def put(self, conn: http.client.HTTPConnection):
+        with self._lock:
+            if len(self._idle) < self.size:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+
+class OllamaHTTPProvider(LLMProvider):
+    """
+    Talks to a running Ollama server over its HTTP API.
+
+    Unlike `OllamaProvider`, no process is started per finding: requests go
+    over pooled keep-alive connections, ask for JSON output (`format:
+    json`), and set `keep_alive` so the model stays loaded between them.
+    """
+
+    def __init__(
+        self,
+        model: str = "llama3",
+        url: Optional[str] = None,
+        timeout: Optional[float] = DEFAULT_LLM_TIMEOUT,
+        keep_alive: str = DEFAULT_KEEP_ALIVE,
+        pool_size: int = DEFAULT_POOL_SIZE,
+    ):
+        self.model = model
+        self.keep_alive = keep_alive
+        self.pool = ConnectionPool(url or default_url(), size=pool_size, timeout=timeout)
+
+    def generate(self, prompt: str) -> Dict[str, str]:
+        body = json.dumps(
+            {
+                "model": self.model,
+                "prompt": prompt,
+                "format": "json",
+                "stream": False,
+                "keep_alive": self.keep_alive,
+            }
+        ).encode("utf-8")
+
+        try:
+            reply = self._post("/api/generate", body)
+            data = json.loads(reply["response"])
+
+            return {
+                "explanation": data.get("explanation", ""),
+                "exploit_scenario": data.get("exploit_scenario", ""),
+                "remediation": data.get("remediation", ""),
+            }
+        except Exception:
+            # Never crash — fallback
+            return fallback_result()
+
+    def _post(self, path: str, body: bytes) -> dict:
+        headers = {"Content-Type": "application/json", "Connection": "keep-alive"}
+
+        while True:
+            conn, reused = self.pool.get()
+            try:
+                conn.request("POST", self.pool.base_path + path, body=body, headers=headers)
+                response = conn.getresponse()
+                payload = response.read()
+            except TimeoutError:
+                conn.close()
+                raise
+            except (http.client.HTTPException, OSError):
+                conn.close()
+                # The server may have dropped an idle connection; retry on a
+                # fresh one, but never retry a fresh connection's failure.
+                if reused:
+                    continue
+                raise
+
+            if response.will_close:
+                conn.close()
+            else:
+                self.pool.put(conn)
+
+            if response.status != 200:
+                raise http.client.HTTPException(f"HTTP {response.status}: {payload[:200]!r}")
+            return json.loads(payload)
+
+    def close(self):
+        self.pool.close()
@@ -1,13 +1,15 @@
 import json
 import subprocess
-from typing import Dict
+from typing import Dict, Optional
 
-from stone_sec.llm.base import LLMProvider
+from stone_sec.defaults import DEFAULT_LLM_TIMEOUT
+from stone_sec.llm.base import LLMProvider, fallback_result
 
 
 class OllamaProvider(LLMProvider):
-    def __init__(self, model: str = "llama3"):
+    def __init__(self, model: str = "llama3", timeout: Optional[float] = DEFAULT_LLM_TIMEOUT):
         self.model = model
+        self.timeout = timeout
 
     def generate(self, prompt: str) -> Dict[str, str]:
         try:
@@ -18,7 +20,7 @@ class OllamaProvider(LLMProvider):
     text=True,
     encoding="utf-8",
     errors="ignore",
-    timeout=120,
+    timeout=self.timeout,
 )
             output = proc.stdout.strip()
             data = json.loads(output)
@@ -30,8 +32,4 @@ class OllamaProvider(LLMProvider):
             }
         except Exception:
             # Never crash — fallback
-            return {
-                "explanation": "Potential security risk detected.",
-                "exploit_scenario": "An attacker could abuse this behavior if input is controlled.",
-                "remediation": "Avoid unsafe constructs and validate inputs.",
-            }
\ No newline at end of file
+            return fallback_result()
\ No newline at end of file
@@ -1,10 +1,22 @@
 from stone_sec.models.finding import Finding
 
+# Bump whenever the template changes, so cached answers to the old wording
+# are not reused.
+PROMPT_VERSION = 1
+
+# Location lines do not change the answer; leaving them out of the cache key
+# lets a finding keep its explanation when code moves or is copied.
+_LOCATION_PREFIXES = ("- File:", "- Line:")
+
 
 def build_prompt(finding: Finding) -> str:
     """
     Build a strict JSON-only prompt for the LLM.
     """
+    context = ""
+    if finding.context:
+        context = "\n- Surrounding Code:\n" + finding.context
+
     return f"""
 You are a security analysis engine.
 
@@ -18,10 +30,20 @@ Finding details:
 - Severity: {finding.severity}
 - File: {finding.file}
 - Line: {finding.line}
-- Code Snippet: {finding.snippet}
+- Code Snippet: {finding.snippet}{context}
 
 Rules:
 - Do not include any text outside JSON
 - Do not change severity
 - Do not invent vulnerabilities
-"""
\ No newline at end of file
+"""
+
+
+def normalize_prompt(prompt: str) -> str:
+    """
+    The prompt as a cache key: location lines dropped, whitespace collapsed.
+    """
+    lines = (line.strip() for line in prompt.splitlines())
+    return "\n".join(
+        " ".join(line.split()) for line in lines if line and not line.startswith(_LOCATION_PREFIXES)
+    )
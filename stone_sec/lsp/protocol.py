@@ -0,0 +1,50 @@
+import json
+import threading
+from typing import BinaryIO, Optional
+
+
+def read_message(stream: BinaryIO) -> Optional[dict]:
+    """
+    Read one JSON-RPC message framed with LSP `Content-Length` headers.
+
+    Returns None at end of stream.
+    """
+    content_length = None
+
+    while True:
+        line = stream.readline()
+        if not line:
+            return None
+
+        line = line.strip()
+        if not line:
+            break
+
+        name, _, value = line.decode("ascii", errors="replace").partition(":")
+        if name.strip().lower() == "content-length":
+            content_length = int(value.strip())
+
+    if content_length is None:
+        return None
+
+    body = stream.read(content_length)
+    return json.loads(body)
+
+
+class MessageWriter:
+    """
+    Thread-safe writer for framed JSON-RPC messages; debounce timers publish
+    diagnostics from their own threads.
+    """
+
+    def __init__(self, stream: BinaryIO):
+        self._stream = stream
+        self._lock = threading.Lock()
+
+    def write(self, message: dict):
+        body = json.dumps(message, separators=(",", ":")).encode("utf-8")
+        header = f"Content-Length: {len(body)}\r\n\r\n".encode("ascii")
+
+        with self._lock:
+            self._stream.write(header + body)
+            self._stream.flush()
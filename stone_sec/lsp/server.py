@@ -0,0 +1,244 @@
+import ast
+import sys
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+from urllib.parse import unquote, urlparse
+
+from stone_sec.engine.rules.runner import run_rules
+from stone_sec.engine.severity import Severity
+from stone_sec.engine.suppressions import filter_suppressed
+from stone_sec.lsp.protocol import MessageWriter, read_message
+from stone_sec.models.finding import Finding
+
+DEFAULT_DEBOUNCE = 0.3
+
+# LSP DiagnosticSeverity values
+DIAGNOSTIC_SEVERITY = {
+    Severity.CRITICAL: 1,
+    Severity.HIGH: 1,
+    Severity.MEDIUM: 2,
+    Severity.LOW: 3,
+}
+
+# JSON-RPC error codes
+METHOD_NOT_FOUND = -32601
+SERVER_NOT_INITIALIZED = -32002
+
+TEXT_DOCUMENT_SYNC_FULL = 1
+
+
+def uri_to_path(uri: str) -> Path:
+    parsed = urlparse(uri)
+    if parsed.scheme == "file":
+        return Path(unquote(parsed.path))
+    return Path(uri)
+
+
+def finding_to_diagnostic(finding: Finding, lines: List[str]) -> dict:
+    line = max(finding.line - 1, 0)
+    text = lines[line] if line < len(lines) else ""
+    start = len(text) - len(text.lstrip())
+
+    return {
+        "range": {
+            "start": {"line": line, "character": start},
+            "end": {"line": line, "character": len(text)},
+        },
+        "severity": DIAGNOSTIC_SEVERITY[finding.severity],
+        "code": finding.rule_id,
+        "source": "stone-sec",
+        "message": finding.title,
+    }
+
+
+@dataclass
+class Document:
+    uri: str
+    text: str
+    version: Optional[int] = None
+    # Last AST that parsed cleanly; reused while the buffer has syntax errors.
+    tree: Optional[ast.AST] = None
+    tree_lines: Optional[List[str]] = None
+    timer: Optional[threading.Timer] = None
+
+
+class LanguageServer:
+    """
+    Stdio language server that publishes stone-sec findings as diagnostics.
+
+    Each open document is analysed on its own: a change re-parses only that
+    buffer, after a debounce window so bursts of keystrokes cost one parse.
+    """
+
+    def __init__(self, send: Callable[[dict], None], debounce: float = DEFAULT_DEBOUNCE):
+        self._send = send
+        self.debounce = debounce
+        self.documents: Dict[str, Document] = {}
+        self._lock = threading.Lock()
+        self.initialized = False
+        self.shutdown_requested = False
+        self.exit_code: Optional[int] = None
+
+    # --- JSON-RPC dispatch ---
+
+    def handle(self, message: dict):
+        method = message.get("method")
+        params = message.get("params") or {}
+        msg_id = message.get("id")
+
+        if method == "initialize":
+            self.initialized = True
+            self._respond(msg_id, self._capabilities())
+            return
+
+        if method == "shutdown":
+            self.shutdown_requested = True
+            self._cancel_all()
+            self._respond(msg_id, None)
+            return
+
+        if method == "exit":
+            self.exit_code = 0 if self.shutdown_requested else 1
+            return
+
+        if not self.initialized:
+            if msg_id is not None:
+                self._error(msg_id, SERVER_NOT_INITIALIZED, "Server not initialized")
+            return
+
+        handler = {
+            "textDocument/didOpen": self._did_open,
+            "textDocument/didChange": self._did_change,
+            "textDocument/didClose": self._did_close,
+        }.get(method)
+
+        if handler is not None:
+            handler(params)
+        elif msg_id is not None:
+            self._error(msg_id, METHOD_NOT_FOUND, f"Method not found: {method}")
+
+    def _capabilities(self) -> dict:
+        return {
+            "capabilities": {
+                "textDocumentSync": {
+                    "openClose": True,
+                    "change": TEXT_DOCUMENT_SYNC_FULL,
+                },
+            },
+            "serverInfo": {"name": "stone-sec"},
+        }
+
+    def _respond(self, msg_id, result):
+        self._send({"jsonrpc": "2.0", "id": msg_id, "result": result})
+
+    def _error(self, msg_id, code: int, message: str):
+        self._send({"jsonrpc": "2.0", "id": msg_id, "error": {"code": code, "message": message}})
+
+    # --- Document lifecycle ---
+
+    def _did_open(self, params: dict):
+        item = params["textDocument"]
+        doc = Document(uri=item["uri"], text=item["text"], version=item.get("version"))
+
+        with self._lock:
+            self.documents[doc.uri] = doc
+
+        self.analyze(doc.uri)
+
+    def _did_change(self, params: dict):
+        uri = params["textDocument"]["uri"]
+        changes = params.get("contentChanges") or []
+
+        with self._lock:
+            doc = self.documents.get(uri)
+            if doc is None or not changes:
+                return
+
+            # Full sync: the last change carries the whole buffer.
+            doc.text = changes[-1]["text"]
+            doc.version = params["textDocument"].get("version")
+
+            if doc.timer is not None:
+                doc.timer.cancel()
+
+            if self.debounce <= 0:
+                doc.timer = None
+            else:
+                doc.timer = threading.Timer(self.debounce, self.analyze, args=(uri,))
+                doc.timer.daemon = True
+                doc.timer.start()
+                return
+
+        self.analyze(uri)
+
+    def _did_close(self, params: dict):
+        uri = params["textDocument"]["uri"]
+
+        with self._lock:
+            doc = self.documents.pop(uri, None)
+            if doc is not None and doc.timer is not None:
+                doc.timer.cancel()
+
+        self._publish(uri, [], None)
+
+    def _cancel_all(self):
+        with self._lock:
+            for doc in self.documents.values():
+                if doc.timer is not None:
+                    doc.timer.cancel()
+
+    # --- Analysis ---
+
+    def analyze(self, uri: str):
+        with self._lock:
+            doc = self.documents.get(uri)
+            if doc is None:
+                return
+            text, version = doc.text, doc.version
+
+        try:
+            tree = ast.parse(text, filename=str(uri_to_path(uri)))
+            lines = text.splitlines()
+        except (SyntaxError, ValueError):
+            # Mid-edit buffer: keep diagnostics from the last good parse.
+            tree, lines = doc.tree, doc.tree_lines
+            if tree is None:
+                return
+        else:
+            with self._lock:
+                if self.documents.get(uri) is doc:
+                    doc.tree, doc.tree_lines = tree, lines
+
+        findings = run_rules(tree, uri_to_path(uri))
+        if findings:
+            findings = filter_suppressed(findings, "\n".join(lines))
+        diagnostics = [finding_to_diagnostic(f, lines) for f in findings]
+        self._publish(uri, diagnostics, version)
+
+    def _publish(self, uri: str, diagnostics: List[dict], version: Optional[int]):
+        params = {"uri": uri, "diagnostics": diagnostics}
+        if version is not None:
+            params["version"] = version
+
+        self._send(
+            {
+                "jsonrpc": "2.0",
+                "method": "textDocument/publishDiagnostics",
+                "params": params,
+            }
+        )
+
+
+def run_stdio_server(debounce: float = DEFAULT_DEBOUNCE) -> int:
+    writer = MessageWriter(sys.stdout.buffer)
+    server = LanguageServer(writer.write, debounce=debounce)
+
+    while server.exit_code is None:
+        message = read_message(sys.stdin.buffer)
+        if message is None:
+            return 0 if server.shutdown_requested else 1
+        server.handle(message)
+
+    return server.exit_code
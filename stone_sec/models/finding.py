@@ -1,19 +1,158 @@
-from dataclasses import dataclass
+import sys
 from pathlib import Path
-from typing import Optional
+from typing import Dict, NamedTuple, Optional, Tuple
 
 from stone_sec.engine.severity import Severity
 
 
-@dataclass
-class Finding:
-    file: Path
-    line: int
+class RuleInfo(NamedTuple):
     rule_id: str
     severity: Severity
     title: str
-    snippet: str
 
-    explanation: Optional[str] = None
-    exploit_scenario: Optional[str] = None
-    remediation: Optional[str] = None
\ No newline at end of file
+
+# Every finding of a rule shares one RuleInfo, and every finding in a file
+# shares one Path, including findings unpickled from worker processes.
+_RULE_TABLE: Dict[Tuple[str, Severity, str], RuleInfo] = {}
+_PATH_TABLE: Dict[str, Path] = {}
+
+# The path table is only a memory saving; it is dropped rather than allowed
+# to grow without bound in a long-running process.
+MAX_INTERNED_PATHS = 200_000
+
+
+def intern_rule(rule_id: str, severity: Severity, title: str) -> RuleInfo:
+    key = (rule_id, severity, title)
+    info = _RULE_TABLE.get(key)
+    if info is None:
+        info = _RULE_TABLE[key] = RuleInfo(sys.intern(rule_id), severity, sys.intern(title))
+    return info
+
+
+def intern_path(file) -> Path:
+    key = str(file)
+    path = _PATH_TABLE.get(key)
+    if path is None:
+        if len(_PATH_TABLE) >= MAX_INTERNED_PATHS:
+            _PATH_TABLE.clear()
+        path = _PATH_TABLE[key] = file if isinstance(file, Path) else Path(file)
+    return path
+
+
+class Finding:
+    """
+    One rule match.
+
+    Slotted, with the rule's id, severity and title held in a shared
+    `RuleInfo` and the file in a shared `Path`, so a finding costs a
+    handful of pointers rather than its own dict and strings.
+    """
+
+    __slots__ = (
+        "_rule",
+        "_file",
+        "line",
+        "snippet",
+        "explanation",
+        "exploit_scenario",
+        "remediation",
+        "cell",
+        "context",
+    )
+
+    def __init__(
+        self,
+        file: Path,
+        line: int,
+        rule_id: str,
+        severity: Severity,
+        title: str,
+        snippet: str,
+        explanation: Optional[str] = None,
+        exploit_scenario: Optional[str] = None,
+        remediation: Optional[str] = None,
+        # Notebook cell number (1-based) when the file is a Jupyter notebook;
+        # `line` is then relative to the cell.
+        cell: Optional[int] = None,
+        # Source lines around the flagged line, when the source was at hand.
+        context: Optional[str] = None,
+    ):
+        self._rule = intern_rule(rule_id, severity, title)
+        self._file = intern_path(file)
+        self.line = line
+        self.snippet = sys.intern(snippet)
+        self.explanation = explanation
+        self.exploit_scenario = exploit_scenario
+        self.remediation = remediation
+        self.cell = cell
+        self.context = context
+
+    @property
+    def file(self) -> Path:
+        return self._file
+
+    @property
+    def rule_id(self) -> str:
+        return self._rule.rule_id
+
+    @property
+    def severity(self) -> Severity:
+        return self._rule.severity
+
+    @property
+    def title(self) -> str:
+        return self._rule.title
+
+    def _fields(self) -> tuple:
+        return (
+            self._file,
+            self.line,
+            self._rule.rule_id,
+            self._rule.severity,
+            self._rule.title,
+            self.snippet,
+            self.explanation,
+            self.exploit_scenario,
+            self.remediation,
+            self.cell,
+            self.context,
+        )
+
+    def replace(self, **changes) -> "Finding":
+        """
+        A copy of this finding with `changes` applied.
+        """
+        values = dict(zip(_FIELD_NAMES, self._fields()))
+        values.update(changes)
+        return Finding(**values)
+
+    def __reduce__(self):
+        # Rebuilt through __init__, so unpickled findings are interned in the
+        # receiving process.
+        return Finding, self._fields()
+
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._fields() == other._fields()
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        args = ", ".join(f"{name}={value!r}" for name, value in zip(_FIELD_NAMES, self._fields()))
+        return f"Finding({args})"
+
+
+_FIELD_NAMES = (
+    "file",
+    "line",
+    "rule_id",
+    "severity",
+    "title",
+    "snippet",
+    "explanation",
+    "exploit_scenario",
+    "remediation",
+    "cell",
+    "context",
+)
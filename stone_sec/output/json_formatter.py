@@ -1,30 +1,82 @@
 import json
+from pathlib import Path
 from typing import List
+from stone_sec.engine.severity import Severity
 from stone_sec.models.finding import Finding
 
 
-def findings_to_json(findings: List[Finding]) -> str:
+def finding_to_dict(f: Finding) -> dict:
+    data = {
+        "rule_id": f.rule_id,
+        "severity": str(f.severity),
+        "title": f.title,
+        "file": str(f.file),
+        "line": f.line,
+        "snippet": f.snippet,
+        "explanation": f.explanation,
+        "exploit_scenario": f.exploit_scenario,
+        "remediation": f.remediation,
+    }
+    if f.cell is not None:
+        data["cell"] = f.cell
+    if f.context is not None:
+        data["context"] = f.context
+    return data
+
+
+def finding_from_dict(data: dict) -> Finding:
+    return Finding(
+        file=Path(data["file"]),
+        line=data["line"],
+        rule_id=data["rule_id"],
+        severity=Severity.from_string(data["severity"]),
+        title=data["title"],
+        snippet=data["snippet"],
+        explanation=data.get("explanation"),
+        exploit_scenario=data.get("exploit_scenario"),
+        remediation=data.get("remediation"),
+        cell=data.get("cell"),
+        context=data.get("context"),
+    )
+
+
+def findings_to_json(findings: List[Finding], skipped=None, baselined=None) -> str:
     data = []
 
     for f in findings:
-        data.append(
-            {
-                "rule_id": f.rule_id,
-                "severity": str(f.severity),
-                "title": f.title,
-                "file": str(f.file),
-                "line": f.line,
-                "snippet": f.snippet,
-                "explanation": f.explanation,
-                "exploit_scenario": f.exploit_scenario,
-                "remediation": f.remediation,
-            }
-        )
+        data.append(finding_to_dict(f))
+
+    report = {
+        "total_findings": len(findings),
+        "findings": data,
+    }
+
+    if baselined is not None:
+        report["baselined_findings"] = baselined
+
+    if skipped:
+        report["skipped_files"] = [
+            {"file": str(s.path), "size": s.size, "limit": s.limit} for s in skipped
+        ]
+
+    return json.dumps(report, indent=2)
+
+
+def history_to_json(result) -> str:
+    data = []
+
+    for h in result.findings:
+        item = finding_to_dict(h.finding)
+        item["first_seen"] = h.first_seen
+        item["last_seen"] = h.last_seen
+        data.append(item)
 
     return json.dumps(
         {
-            "total_findings": len(findings),
+            "commits_scanned": len(result.commits),
+            "blobs_scanned": result.blobs_scanned,
+            "total_findings": len(result.findings),
             "findings": data,
         },
         indent=2,
-    )
\ No newline at end of file
+    )
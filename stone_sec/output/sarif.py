@@ -0,0 +1,182 @@
+import json
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from stone_sec.engine.rules.runner import rule_table
+from stone_sec.engine.severity import Severity
+from stone_sec.engine.source import FileTooLargeError
+from stone_sec.models.finding import Finding
+from stone_sec.output.writers import ReportWriter, ReviewSummary
+
+SARIF_VERSION = "2.1.0"
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+
+LEVELS = {
+    Severity.CRITICAL: "error",
+    Severity.HIGH: "error",
+    Severity.MEDIUM: "warning",
+    Severity.LOW: "note",
+}
+
+
+def _tool_version() -> str:
+    try:
+        return version("stone-sec")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+def _summary_line(rule_cls) -> str:
+    doc = (rule_cls.__doc__ or "").strip()
+    line = doc.splitlines()[0].strip() if doc else rule_cls.__name__
+    return line.rstrip(":")
+
+
+def sarif_rules() -> List[dict]:
+    """
+    The driver's rule metadata, one entry per rule ID of the rule set.
+    """
+    return [
+        {
+            "id": rule_id,
+            "name": rule_cls.__name__,
+            "shortDescription": {"text": _summary_line(rule_cls)},
+        }
+        for rule_id, rule_cls in rule_table()
+    ]
+
+
+def artifact_uri(path: Path, base: Optional[Path]) -> str:
+    """
+    A URI relative to `base` when the file is below it, else an absolute one.
+    """
+    if base is not None and path.is_absolute():
+        try:
+            return path.relative_to(base).as_posix()
+        except ValueError:
+            pass
+    if path.is_absolute():
+        return path.as_uri()
+    return path.as_posix()
+
+
+class SarifWriter(ReportWriter):
+    """
+    SARIF 2.1.0, written incrementally.
+
+    The document head (tool and rule table) is written up front and each
+    result is serialized and written as its file completes, so memory
+    does not grow with the number of findings. Skipped files and warnings
+    become tool execution notifications on the run's invocation.
+    """
+
+    def __init__(self, out, base: Optional[Path] = None):
+        super().__init__(out)
+        self.base = base.resolve() if base is not None else None
+        self._rules = sarif_rules()
+        self._rule_index: Dict[str, int] = {r["id"]: i for i, r in enumerate(self._rules)}
+        self._notifications: List[dict] = []
+        self._started = False
+        self._first_result = True
+        self._finished = False
+
+    def _start(self):
+        if self._started:
+            return
+        self._started = True
+
+        head = json.dumps(
+            {
+                "version": SARIF_VERSION,
+                "$schema": SARIF_SCHEMA,
+                "runs": [
+                    {
+                        "tool": {
+                            "driver": {
+                                "name": "stone-sec",
+                                "version": _tool_version(),
+                                "rules": self._rules,
+                            }
+                        },
+                        "results": [],
+                    }
+                ],
+            }
+        )
+        # Cut the document open just inside the results array.
+        self.out.write(head[: head.rindex('"results": []') + len('"results": [')])
+
+    def finding(self, f: Finding):
+        self._start()
+
+        physical = {"artifactLocation": {"uri": artifact_uri(Path(f.file), self.base)}}
+        location = {"physicalLocation": physical}
+        properties = {"severity": str(f.severity)}
+        if f.cell is None:
+            physical["region"] = {"startLine": f.line, "snippet": {"text": f.snippet}}
+        else:
+            # Notebook lines count from the top of the cell, not of the .ipynb
+            # file, so the cell is the location and no file region is claimed.
+            location["logicalLocations"] = [
+                {"name": f"cell {f.cell}", "fullyQualifiedName": f"cell {f.cell}", "kind": "module"}
+            ]
+            properties.update({"cell": f.cell, "cellLine": f.line, "snippet": f.snippet})
+
+        result = {
+            "ruleId": f.rule_id,
+            "level": LEVELS[f.severity],
+            "message": {"text": f.title},
+            "locations": [location],
+            "properties": properties,
+        }
+        if f.rule_id in self._rule_index:
+            result["ruleIndex"] = self._rule_index[f.rule_id]
+        for key in ("explanation", "exploit_scenario", "remediation"):
+            value = getattr(f, key)
+            if value:
+                result["properties"][key] = value
+
+        self.out.write(("\n" if self._first_result else ",\n") + json.dumps(result))
+        self._first_result = False
+        self._flush()
+
+    def _notify(self, level: str, message: str, uri: Optional[str] = None):
+        notification = {"level": level, "message": {"text": message}}
+        if uri is not None:
+            notification["locations"] = [{"physicalLocation": {"artifactLocation": {"uri": uri}}}]
+        self._notifications.append(notification)
+
+    def skipped(self, exc: FileTooLargeError):
+        self._notify(
+            "warning",
+            f"Skipped oversized file ({exc.size} bytes > {exc.limit})",
+            artifact_uri(Path(exc.path), self.base),
+        )
+
+    def warning(self, message: str):
+        self._notify("warning", message)
+
+    def info(self, message: str):
+        self._notify("note", message)
+
+    def error(self, message: str):
+        self._notify("error", message)
+        self._close(successful=False)
+
+    def finish(self, summary: ReviewSummary):
+        self._close(successful=True)
+
+    def _close(self, successful: bool):
+        if self._finished:
+            return
+        self._finished = True
+        self._start()
+
+        invocation = {
+            "executionSuccessful": successful,
+            "toolExecutionNotifications": self._notifications,
+        }
+        self.out.write(("" if self._first_result else "\n") + "],\n")
+        self.out.write('"invocations": [' + json.dumps(invocation) + "]}]}\n")
+        self._flush()
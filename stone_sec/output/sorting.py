@@ -0,0 +1,76 @@
+import heapq
+import pickle
+import tempfile
+from typing import IO, Iterator, List
+
+from stone_sec.models.finding import Finding
+
+# Findings held in memory before a sorted run is spilled to disk.
+DEFAULT_RUN_SIZE = 50_000
+
+
+def finding_sort_key(f: Finding) -> tuple:
+    """
+    Report order: file, then position, then rule. Snippet and title break
+    the remaining ties so equal keys only ever hold identical findings.
+    """
+    return (str(f.file), f.cell or 0, f.line, f.rule_id, f.snippet, f.title)
+
+
+def _read_run(spill: IO[bytes]) -> Iterator[Finding]:
+    spill.seek(0)
+    load = pickle.Unpickler(spill).load
+    while True:
+        try:
+            yield load()
+        except EOFError:
+            return
+
+
+class SortedSpool:
+    """
+    Collects findings in any order and replays them sorted by
+    `finding_sort_key`, in bounded memory.
+
+    Every `run_size` findings are sorted and spilled to an anonymous
+    temporary file; `drain` k-way merges the spilled runs with the
+    in-memory remainder. Only one finding per run is held while merging.
+    """
+
+    def __init__(self, run_size: int = DEFAULT_RUN_SIZE):
+        self.run_size = run_size
+        self._buffer: List[Finding] = []
+        self._runs: List[IO[bytes]] = []
+
+    def add(self, f: Finding):
+        self._buffer.append(f)
+        if len(self._buffer) >= self.run_size:
+            self._spill()
+
+    def _spill(self):
+        self._buffer.sort(key=finding_sort_key)
+        spill = tempfile.TemporaryFile()
+        pickler = pickle.Pickler(spill, protocol=pickle.HIGHEST_PROTOCOL)
+        for f in self._buffer:
+            pickler.dump(f)
+            # Each finding is independent; keep the memo from growing.
+            pickler.clear_memo()
+        self._runs.append(spill)
+        self._buffer = []
+
+    def drain(self) -> Iterator[Finding]:
+        """
+        Every finding added so far, in sorted order; the spool is emptied.
+        """
+        self._buffer.sort(key=finding_sort_key)
+        runs = [_read_run(spill) for spill in self._runs] + [iter(self._buffer)]
+        try:
+            yield from heapq.merge(*runs, key=finding_sort_key)
+        finally:
+            self.close()
+
+    def close(self):
+        for spill in self._runs:
+            spill.close()
+        self._runs = []
+        self._buffer = []
@@ -0,0 +1,193 @@
+import json
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import List, Optional
+
+from stone_sec.engine.severity import Severity
+from stone_sec.engine.source import FileTooLargeError
+from stone_sec.models.finding import Finding
+from stone_sec.output.json_formatter import finding_to_dict, findings_to_json
+
+
+@dataclass
+class ReviewSummary:
+    files_scanned: int
+    total_findings: int
+    highest_severity: Optional[Severity]
+    failed: bool
+    # Findings suppressed by --baseline; None when no baseline was given.
+    baselined: Optional[int] = None
+
+
+class ReportWriter(ABC):
+    """
+    Receives a review's results as they are produced.
+
+    Streaming writers emit each finding immediately, so nothing is held
+    back until the scan completes and memory does not grow with the
+    number of findings.
+    """
+
+    def __init__(self, out):
+        self.out = out
+
+    @abstractmethod
+    def finding(self, f: Finding):
+        """
+        Report one finding as soon as it is produced.
+        """
+
+    def skipped(self, exc: FileTooLargeError):
+        pass
+
+    def warning(self, message: str):
+        pass
+
+    def info(self, message: str):
+        pass
+
+    def error(self, message: str):
+        """
+        A fatal error; the review stops and `finish` is not called.
+        """
+        print(f"[ERROR] {message}", file=self.out)
+        self._flush()
+
+    def finish(self, summary: ReviewSummary):
+        pass
+
+    def _flush(self):
+        flush = getattr(self.out, "flush", None)
+        if flush is not None:
+            flush()
+
+
+def format_finding_text(f: Finding) -> str:
+    lines = [
+        f"[{str(f.severity)}] {f.title}",
+        f"Rule: {f.rule_id}",
+        f"File: {f.file}",
+    ]
+    if f.cell is not None:
+        lines.append(f"Cell: {f.cell}")
+    lines.append(f"Line: {f.line}")
+    lines.append(f"Snippet: {f.snippet}")
+    if f.context is not None:
+        lines.append("Context:")
+        lines.extend(("    " + line).rstrip() for line in f.context.splitlines())
+
+    if f.explanation:
+        lines.append(f"Explanation: {f.explanation}")
+    if f.exploit_scenario:
+        lines.append(f"Exploit: {f.exploit_scenario}")
+    if f.remediation:
+        lines.append(f"Fix: {f.remediation}")
+
+    return "\n".join(lines) + "\n"
+
+
+class TextWriter(ReportWriter):
+    def finding(self, f: Finding):
+        print(format_finding_text(f), file=self.out)
+        self._flush()
+
+    def skipped(self, exc: FileTooLargeError):
+        self.warning(f"Skipped oversized file ({exc.size} bytes > {exc.limit}): {exc.path}")
+
+    def warning(self, message: str):
+        print(f"[WARN] {message}", file=self.out)
+        self._flush()
+
+    def info(self, message: str):
+        print(f"[INFO] {message}", file=self.out)
+        self._flush()
+
+    def finish(self, summary: ReviewSummary):
+        if not summary.files_scanned:
+            print("No Python files found.", file=self.out)
+        elif not summary.total_findings:
+            print("No security issues found.", file=self.out)
+        else:
+            print(f"Found {summary.total_findings} issue(s).", file=self.out)
+
+
+class JsonWriter(ReportWriter):
+    """
+    The single JSON document report; it needs the total up front, so
+    findings are collected until the end.
+    """
+
+    def __init__(self, out):
+        super().__init__(out)
+        self._findings: List[Finding] = []
+        self._skipped: List[FileTooLargeError] = []
+
+    def finding(self, f: Finding):
+        self._findings.append(f)
+
+    def skipped(self, exc: FileTooLargeError):
+        self._skipped.append(exc)
+
+    def finish(self, summary: ReviewSummary):
+        skipped = self._skipped if summary.files_scanned else None
+        print(
+            findings_to_json(self._findings, skipped=skipped, baselined=summary.baselined),
+            file=self.out,
+        )
+
+
+class JsonLinesWriter(ReportWriter):
+    """
+    One JSON object per line, each tagged with a `type`: `finding`,
+    `skipped`, `warning` and `info` records as they occur, then one `summary`.
+    """
+
+    def _record(self, record: dict):
+        print(json.dumps(record), file=self.out)
+        self._flush()
+
+    def finding(self, f: Finding):
+        self._record({"type": "finding", **finding_to_dict(f)})
+
+    def skipped(self, exc: FileTooLargeError):
+        self._record({"type": "skipped", "file": str(exc.path), "size": exc.size, "limit": exc.limit})
+
+    def warning(self, message: str):
+        self._record({"type": "warning", "message": message})
+
+    def info(self, message: str):
+        self._record({"type": "info", "message": message})
+
+    def error(self, message: str):
+        self._record({"type": "error", "message": message})
+
+    def finish(self, summary: ReviewSummary):
+        record = {
+            "type": "summary",
+            "files_scanned": summary.files_scanned,
+            "total_findings": summary.total_findings,
+            "highest_severity": str(summary.highest_severity) if summary.highest_severity else None,
+            "failed": summary.failed,
+        }
+        if summary.baselined is not None:
+            record["baselined"] = summary.baselined
+        self._record(record)
+
+
+WRITERS = {
+    "text": TextWriter,
+    "json": JsonWriter,
+    "jsonl": JsonLinesWriter,
+}
+
+
+def create_writer(fmt: str, out, base=None) -> ReportWriter:
+    """
+    The writer for an output format; `base` is the directory SARIF
+    artifact URIs are made relative to.
+    """
+    if fmt == "sarif":
+        from stone_sec.output.sarif import SarifWriter
+
+        return SarifWriter(out, base=base)
+    return WRITERS[fmt](out)
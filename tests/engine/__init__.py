@@ -0,0 +1 @@
+# Engine test package marker for unittest discovery.
@@ -0,0 +1,101 @@
+import io
+import tarfile
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+
+from stone_sec.engine.archives import scan_archive
+from stone_sec.engine.executor import ScanExecutor
+from stone_sec.engine.scanner import discover_python_files
+
+
+class ArchiveScanTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def make_wheel(self, name: str, members: dict) -> Path:
+        path = self.root / name
+        with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+            for member, content in members.items():
+                zf.writestr(member, content)
+        return path
+
+    def make_sdist(self, name: str, members: dict) -> Path:
+        path = self.root / name
+        with tarfile.open(path, "w:gz") as tf:
+            for member, content in members.items():
+                data = content.encode("utf-8")
+                info = tarfile.TarInfo(member)
+                info.size = len(data)
+                tf.addfile(info, io.BytesIO(data))
+        return path
+
+    def test_wheel_members_are_scanned_in_place(self):
+        wheel = self.make_wheel(
+            "pkg-1.0-py3-none-any.whl",
+            {"pkg/__init__.py": "import pickle\npickle.loads(b)\n", "pkg/data.txt": "eval(x)"},
+        )
+
+        result = scan_archive(wheel)
+
+        self.assertIsNone(result.error)
+        self.assertEqual(result.members_scanned, 1)
+        self.assertEqual(len(result.findings), 1)
+        self.assertEqual(str(result.findings[0].file), f"{wheel}!pkg/__init__.py")
+        self.assertEqual(result.findings[0].line, 2)
+
+    def test_sdist_members_are_scanned(self):
+        sdist = self.make_sdist("pkg-1.0.tar.gz", {"pkg-1.0/setup.py": "import os\nos.system(c)\n"})
+        result = scan_archive(sdist)
+        self.assertEqual([f.rule_id for f in result.findings], ["PY-OS-SYSTEM-001"])
+
+    def test_member_and_total_limits(self):
+        wheel = self.make_wheel(
+            "bomb.zip",
+            {"a.py": "eval(x)\n", "big.py": "x = 0\n" * 10_000, "z.py": "exec(y)\n"},
+        )
+
+        result = scan_archive(wheel, max_member_size=1024)
+        self.assertEqual([f.rule_id for f in result.findings], ["PY-EVAL-001", "PY-EXEC-001"])
+        self.assertEqual([str(s.path) for s in result.skipped], [f"{wheel}!big.py"])
+
+        result = scan_archive(wheel, max_member_size=0, max_total_size=1024)
+        self.assertEqual([f.rule_id for f in result.findings], ["PY-EVAL-001"])
+        self.assertEqual([s.path for s in result.skipped], [wheel])
+
+    def test_corrupt_archive_reports_error(self):
+        path = self.root / "broken.whl"
+        path.write_bytes(b"not a zip")
+        self.assertIsNotNone(scan_archive(path).error)
+
+    def test_parallel_results_keep_submission_order(self):
+        archives = [
+            self.make_wheel(f"p{i}.whl", {"m.py": "eval(x)\n" * (i + 1)}) for i in range(4)
+        ]
+
+        scanner = ScanExecutor(jobs=2)
+        for archive in archives:
+            scanner.submit(archive)
+        results = list(scanner.results())
+
+        self.assertEqual([r.archive for r in results], archives)
+        self.assertEqual([len(r.findings) for r in results], [1, 2, 3, 4])
+
+    def test_directories_of_archives_are_discovered(self):
+        self.make_wheel("a.whl", {"m.py": ""})
+        self.make_sdist("b.tar.gz", {"m.py": ""})
+        (self.root / "notes.txt").write_text("", encoding="utf-8")
+
+        found = sorted(
+            p.name for p in discover_python_files(self.root, include_archives=True, detect_scripts=False)
+        )
+        self.assertEqual(found, ["a.whl", "b.tar.gz"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import io
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from stone_sec.cli import create_parser, handle_baseline, run_review
+from stone_sec.engine.baseline import Baseline, BaselineError, Fingerprinter
+from stone_sec.engine.pipeline import scan_source
+
+
+class FingerprintTests(unittest.TestCase):
+    def fingerprints(self, source: str, base: Path = Path("/repo")):
+        fingerprint = Fingerprinter(base)
+        return [fingerprint(f) for f in scan_source(source, "/repo/pkg/mod.py")]
+
+    def test_stable_across_line_shifts_and_spacing(self):
+        before = self.fingerprints("eval(a)\nexec(b)\n")
+        after = self.fingerprints("import os\n\n\neval(a)\n    \nexec(b)   \n")
+
+        self.assertEqual(before, after)
+
+    def test_repeated_code_is_counted(self):
+        first, second = self.fingerprints("eval(a)\neval(a)\n")
+        self.assertNotEqual(first, second)
+
+    def test_depends_on_rule_path_and_code(self):
+        (base,) = self.fingerprints("eval(a)\n")
+        (other_code,) = self.fingerprints("eval(b)\n")
+        (other_base,) = self.fingerprints("eval(a)\n", base=Path("/repo/pkg"))
+
+        self.assertEqual(len({base, other_code, other_base}), 3)
+
+
+class BaselineReviewTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name).resolve()
+        (self.root / "src").mkdir()
+        (self.root / "src/a.py").write_text("eval(a)\nexec(b)\n", encoding="utf-8")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def create_baseline(self):
+        args = create_parser().parse_args(
+            ["baseline", "create", str(self.root / "src"), "-o", str(self.root / "baseline.json")]
+        )
+        with mock.patch("pathlib.Path.cwd", return_value=self.root), mock.patch(
+            "sys.stdout", io.StringIO()
+        ), self.assertRaises(SystemExit) as exit:
+            handle_baseline(args)
+        self.assertEqual(exit.exception.code, 0)
+
+    def review(self, *argv):
+        out = io.StringIO()
+        args = create_parser().parse_args(["review", "src", "--baseline", "baseline.json", *argv])
+        return run_review(args, out, cwd=self.root), out.getvalue()
+
+    def test_only_new_findings_are_reported_and_gate(self):
+        self.create_baseline()
+
+        self.assertEqual(len(Baseline.load(self.root / "baseline.json")), 2)
+
+        code, out = self.review("--fail-on", "high")
+        self.assertEqual(code, 0)
+        self.assertIn("[INFO] 0 new finding(s), 2 baselined", out)
+
+        (self.root / "src/a.py").write_text("# moved\neval(a)\nexec(b)\neval(c)\n", encoding="utf-8")
+        code, out = self.review("--fail-on", "high", "--format", "json")
+        report = json.loads(out)
+
+        self.assertEqual(code, 1)
+        self.assertEqual([f["snippet"] for f in report["findings"]], ["eval(c)"])
+        self.assertEqual(report["baselined_findings"], 2)
+
+    def test_invalid_baseline_is_an_error(self):
+        (self.root / "baseline.json").write_text("[]", encoding="utf-8")
+
+        code, out = self.review()
+
+        self.assertEqual(code, 1)
+        self.assertIn("[ERROR] Unsupported baseline format", out)
+        with self.assertRaises(BaselineError):
+            Baseline.load(self.root / "missing.json")
+
+
+if __name__ == "__main__":
+    unittest.main()
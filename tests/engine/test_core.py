@@ -0,0 +1,105 @@
+import ast
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from stone_sec import Engine
+from stone_sec.engine.rules.runner import RULES, CompiledRules
+
+
+SAMPLE = """
+import pickle as p
+import ssl
+from yaml import load
+
+def handler(data, cmd):
+    ctx = ssl.create_default_context()
+    ctx.check_hostname = False
+    eval(data)
+    p.loads(data)
+    load(data)
+    cursor.execute(f"SELECT * FROM t WHERE id = {data}")
+    __import__(cmd)
+"""
+
+
+class CompiledRulesTests(unittest.TestCase):
+    def test_single_pass_matches_per_rule_traversal(self):
+        tree = ast.parse(SAMPLE)
+        path = Path("sample.py")
+
+        expected = []
+        for rule_cls in RULES:
+            rule = rule_cls(path)
+            rule.visit(tree)
+            expected.extend(rule.findings)
+
+        actual = CompiledRules(RULES).run(tree, path)
+
+        self.assertGreater(len(expected), 4)
+        self.assertEqual(actual, expected)
+
+    def test_rules_with_custom_traversal_still_run(self):
+        class CountingRule(ast.NodeVisitor):
+            def __init__(self, file_path):
+                self.findings = []
+
+            def generic_visit(self, node):
+                self.findings.append(type(node).__name__)
+                super().generic_visit(node)
+
+        findings = CompiledRules([CountingRule]).run(ast.parse("x = 1\n"), Path("a.py"))
+
+        self.assertEqual(findings[0], "Module")
+
+
+class EngineTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.engine = Engine(jobs=1)
+
+    def tearDown(self):
+        self.engine.close()
+        self._tmp.cleanup()
+
+    def test_scan_paths_reports_counts_and_reuses_cache(self):
+        (self.root / "a.py").write_text("eval(x)\n", encoding="utf-8")
+        (self.root / "big.py").write_text("x = 1\n" * 100, encoding="utf-8")
+
+        scan = self.engine.scan_paths([self.root], max_file_size=100, detect_scripts=False)
+        findings = list(scan)
+
+        self.assertEqual([f.rule_id for f in findings], ["PY-EVAL-001"])
+        self.assertEqual(scan.files_scanned, 2)
+        self.assertEqual([s.path.name for s in scan.skipped], ["big.py"])
+
+        findings[0].explanation = "enriched"
+        again = list(self.engine.scan_paths([self.root], max_file_size=100, detect_scripts=False))
+        self.assertIsNone(again[0].explanation)
+
+    def test_scan_source_iterator(self):
+        findings = list(self.engine.scan_source("exec(s)\n", "a.py"))
+        self.assertEqual([f.rule_id for f in findings], ["PY-EXEC-001"])
+
+    def test_shared_across_threads(self):
+        for i in range(8):
+            (self.root / f"m{i}.py").write_text("eval(x)\n" * (i + 1), encoding="utf-8")
+
+        counts = []
+
+        def worker():
+            counts.append(len(list(self.engine.scan_paths([self.root], detect_scripts=False))))
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(counts, [36] * 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from stone_sec.engine import environment
+from stone_sec.engine.environment import DistributionCache, scan_environment
+
+
+class EnvironmentScanTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.site = Path(self._tmp.name) / "site-packages"
+        self.site.mkdir()
+        self.cache = DistributionCache(Path(self._tmp.name) / "cache")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def install(self, name: str, version: str, source: str):
+        pkg = self.site / name
+        pkg.mkdir(exist_ok=True)
+        (pkg / "__init__.py").write_text(source, encoding="utf-8")
+
+        dist_info = self.site / f"{name}-{version}.dist-info"
+        dist_info.mkdir(exist_ok=True)
+        (dist_info / "METADATA").write_text(
+            f"Metadata-Version: 2.1\nName: {name}\nVersion: {version}\n", encoding="utf-8"
+        )
+        (dist_info / "RECORD").write_text(
+            f"{name}/__init__.py,sha256={len(source)},{len(source)}\n"
+            f"{name}-{version}.dist-info/METADATA,,\n",
+            encoding="utf-8",
+        )
+        return dist_info
+
+    def scan(self):
+        return scan_environment(cache=self.cache, paths=[str(self.site)])
+
+    def test_scans_installed_distribution_files(self):
+        self.install("evilpkg", "1.0", "import pickle\npickle.loads(b)\n")
+        result = self.scan()
+
+        self.assertEqual(result.distributions, 1)
+        self.assertEqual(result.cached, 0)
+        self.assertEqual([f.rule_id for f in result.findings], ["PY-PICKLE-001"])
+        self.assertEqual(result.findings[0].file, self.site / "evilpkg" / "__init__.py")
+
+    def test_counts_python_files(self):
+        self.install("evilpkg", "1.0", "eval(x)\n")
+        self.install("otherpkg", "1.0", "x = 1\n")
+
+        self.assertEqual(self.scan().files, 2)
+        self.assertEqual(self.scan().files, 2)
+
+    def test_skipped_files_are_cached_per_size_limit(self):
+        self.install("bigpkg", "1.0", "x = 1\n" * 20 + "eval(x)\n")
+
+        def scan(limit):
+            return scan_environment(cache=self.cache, paths=[str(self.site)], max_file_size=limit)
+
+        first = scan(50)
+        self.assertEqual(first.findings, [])
+        self.assertEqual([exc.path for exc in first.skipped], [self.site / "bigpkg" / "__init__.py"])
+
+        cached = scan(50)
+        self.assertEqual(cached.cached, 1)
+        self.assertEqual([(exc.path, exc.limit) for exc in cached.skipped], [(self.site / "bigpkg" / "__init__.py", 50)])
+
+        unlimited = scan(None)
+        self.assertEqual(unlimited.cached, 0)
+        self.assertEqual(unlimited.skipped, [])
+        self.assertEqual([f.rule_id for f in unlimited.findings], ["PY-EVAL-001"])
+
+    def test_unchanged_distribution_is_served_from_cache(self):
+        self.install("evilpkg", "1.0", "eval(x)\n")
+        self.scan()
+
+        result = self.scan()
+        self.assertEqual(result.cached, 1)
+        self.assertEqual([f.rule_id for f in result.findings], ["PY-EVAL-001"])
+
+    def test_upgraded_distribution_is_rescanned(self):
+        dist_info = self.install("evilpkg", "1.0", "eval(x)\n")
+        self.scan()
+
+        for child in dist_info.iterdir():
+            child.unlink()
+        dist_info.rmdir()
+        self.install("evilpkg", "1.1", "exec(x)\n")
+
+        result = self.scan()
+        self.assertEqual(result.cached, 0)
+        self.assertEqual([f.rule_id for f in result.findings], ["PY-EXEC-001"])
+
+    def test_rule_changes_invalidate_cached_results(self):
+        self.install("evilpkg", "1.0", "eval(x)\n")
+        self.scan()
+
+        table = environment.rule_table() + [("PY-NEW-001", EnvironmentScanTests)]
+        environment.pipeline_fingerprint.cache_clear()
+        self.addCleanup(environment.pipeline_fingerprint.cache_clear)
+        with mock.patch.object(environment, "rule_table", return_value=table):
+            result = self.scan()
+
+        self.assertEqual(result.cached, 0)
+        self.assertEqual([f.rule_id for f in result.findings], ["PY-EVAL-001"])
+
+
+if __name__ == "__main__":
+    unittest.main()
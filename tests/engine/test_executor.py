@@ -0,0 +1,103 @@
+import io
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from stone_sec.cli import create_parser, run_review
+from stone_sec.engine.core import FileResultCache
+from stone_sec.engine.executor import FileBatchResult, ScanExecutor
+from stone_sec.engine.scanner import dedupe_roots
+
+
+class ScanExecutorTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def write(self, rel: str, text: str = "") -> Path:
+        path = self.root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="utf-8")
+        return path
+
+    def review(self, *argv, stdin=None):
+        out = io.StringIO()
+        args = create_parser().parse_args(["review", *argv])
+        with mock.patch("sys.stdin", io.StringIO(stdin or "")):
+            code = run_review(args, out, cwd=self.root)
+        return code, out.getvalue()
+
+    def test_batches_keep_submission_order_across_pool(self):
+        paths = [self.write(f"m{i}.py", "eval(x)\n" * (i % 3)) for i in range(10)]
+
+        executor = ScanExecutor(jobs=2, batch_size=3)
+        for path in paths:
+            executor.submit(path)
+        results = list(executor.results())
+
+        self.assertTrue(all(isinstance(r, FileBatchResult) for r in results))
+        self.assertEqual([p for r in results for p in r.paths], paths)
+        self.assertEqual(sum(len(r.findings) for r in results), 9)
+
+    def test_cache_serves_unchanged_files(self):
+        cache = FileResultCache()
+        paths = [self.write("a.py", "eval(x)\n"), self.write("b.py"), self.write("c.py", "exec(y)\n")]
+
+        def run():
+            executor = ScanExecutor(cache=cache, batch_size=2)
+            for path in paths:
+                executor.submit(path)
+            return [r.per_file for r in executor.results()]
+
+        first = run()
+        with mock.patch("stone_sec.engine.executor.scan_files", side_effect=AssertionError):
+            second = run()
+
+        self.assertEqual(first, second)
+        self.assertEqual(sum(len(f) for batch in first for f in batch), 2)
+
+    def test_dedupe_roots_drops_nested_and_repeated_roots(self):
+        self.write("svc/a/x.py")
+        self.write("svc/b/y.py")
+        self.write("lib/z.py")
+        r = self.root.resolve()
+
+        roots = dedupe_roots(
+            [self.root / "svc", self.root / "svc/a", self.root / "lib/z.py", self.root / "svc/../svc"]
+        )
+
+        self.assertEqual(roots, [r / "lib/z.py", r / "svc"])
+
+    def test_review_combines_many_roots_into_one_report(self):
+        self.write("svc1/a.py", "eval(x)\n")
+        self.write("svc2/b.py", "exec(y)\n")
+        self.write("paths.txt", "svc2\n\nsvc1/a.py\n")
+
+        code, out = self.review("svc1", "--paths-from", "paths.txt", "--format", "json", "--fail-on", "high")
+        report = json.loads(out)
+
+        self.assertEqual(code, 1)
+        self.assertEqual(
+            sorted(Path(f["file"]).name for f in report["findings"]), ["a.py", "b.py"]
+        )
+
+    def test_paths_from_stdin(self):
+        self.write("svc1/a.py", "eval(x)\n")
+
+        code, out = self.review("--paths-from", "-", stdin="svc1\n")
+
+        self.assertIn("Found 1 issue(s)", out)
+
+    def test_missing_root_is_an_error(self):
+        code, out = self.review("nope")
+        self.assertEqual(code, 1)
+        self.assertIn("[ERROR] Path does not exist: nope", out)
+
+
+if __name__ == "__main__":
+    unittest.main()
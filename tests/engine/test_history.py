@@ -0,0 +1,82 @@
+import shutil
+import subprocess
+import tempfile
+import unittest
+from pathlib import Path
+
+from stone_sec.engine.history import scan_history
+
+
+@unittest.skipIf(shutil.which("git") is None, "git is not installed")
+class HistoryScanTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.repo = Path(self._tmp.name)
+        self.git("init", "-q")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def git(self, *args: str) -> str:
+        proc = subprocess.run(
+            ["git", "-c", "user.name=t", "-c", "user.email=t@t", *args],
+            cwd=self.repo,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        return proc.stdout.strip()
+
+    def commit(self, files: dict, message: str) -> str:
+        for name, content in files.items():
+            path = self.repo / name
+            if content is None:
+                path.unlink()
+            else:
+                path.write_text(content, encoding="utf-8")
+        self.git("add", "-A")
+        self.git("commit", "-q", "-m", message)
+        return self.git("rev-parse", "HEAD")
+
+    def test_first_and_last_seen_survive_line_shifts(self):
+        c1 = self.commit({"a.py": "import pickle\n"}, "one")
+        c2 = self.commit({"a.py": "import pickle\npickle.loads(x)\n"}, "two")
+        c3 = self.commit({"a.py": "import pickle\n\n\npickle.loads(x)\n"}, "three")
+        self.commit({"a.py": "import pickle\n"}, "four")
+
+        result = scan_history(self.repo, "HEAD")
+
+        self.assertEqual(len(result.commits), 4)
+        self.assertEqual(result.commits[0], c1)
+        self.assertEqual(len(result.findings), 1)
+        self.assertEqual(result.findings[0].finding.rule_id, "PY-PICKLE-001")
+        self.assertEqual(result.findings[0].first_seen, c2)
+        self.assertEqual(result.findings[0].last_seen, c3)
+
+    def test_identical_flagged_lines_are_tracked_separately(self):
+        c1 = self.commit({"a.py": "eval(x)\n"}, "one")
+        c2 = self.commit({"a.py": "eval(x)\neval(x)\n"}, "copy")
+        c3 = self.commit({"a.py": "eval(x)\n"}, "drop copy")
+
+        result = scan_history(self.repo, "HEAD")
+
+        spans = sorted((h.first_seen, h.last_seen) for h in result.findings)
+        self.assertEqual(spans, sorted([(c1, c3), (c2, c2)]))
+
+    def test_each_distinct_blob_is_scanned_once(self):
+        self.commit({"a.py": "eval(x)\n"}, "one")
+        self.commit({"b.py": "eval(x)\n"}, "same blob at a new path")
+        self.commit({"c.txt": "unrelated\n"}, "no python change")
+        head = self.commit({"b.py": None}, "delete copy")
+
+        result = scan_history(self.repo, "HEAD")
+
+        self.assertEqual(result.blobs_scanned, 1)
+        by_file = {str(h.finding.file): h for h in result.findings}
+        self.assertEqual(set(by_file), {"a.py", "b.py"})
+        self.assertEqual(by_file["a.py"].last_seen, head)
+        self.assertNotEqual(by_file["b.py"].last_seen, head)
+
+
+if __name__ == "__main__":
+    unittest.main()
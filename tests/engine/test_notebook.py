@@ -0,0 +1,170 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from stone_sec.engine.notebook import NotebookSource, extract_code_cells
+from stone_sec.engine.pipeline import scan_file
+from stone_sec.engine.scanner import discover_python_files
+from stone_sec.engine.source import FileTooLargeError, read_source
+from stone_sec.output.json_formatter import finding_from_dict, finding_to_dict
+
+
+def code(source, outputs=None):
+    return {
+        "cell_type": "code",
+        "execution_count": 1,
+        "metadata": {},
+        "outputs": outputs or [],
+        "source": source,
+    }
+
+
+def markdown(source):
+    return {"cell_type": "markdown", "metadata": {}, "source": source}
+
+
+def notebook(cells, language="python"):
+    return {
+        "cells": cells,
+        "metadata": {"language_info": {"name": language}},
+        "nbformat": 4,
+        "nbformat_minor": 5,
+    }
+
+
+class NotebookTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def write(self, name: str, nb: dict) -> Path:
+        path = self.root / name
+        path.write_text(json.dumps(nb, indent=1))
+        return path
+
+    def test_findings_report_cell_and_line(self):
+        path = self.write(
+            "analysis.ipynb",
+            notebook(
+                [
+                    markdown(["# Title\n", "eval(x)\n"]),
+                    code(["import os\n", "x = 1\n"]),
+                    code(["y = 2\n", "eval(data)\n"]),
+                ]
+            ),
+        )
+
+        findings = scan_file(path)
+
+        self.assertEqual([(f.rule_id, f.cell, f.line) for f in findings], [("PY-EVAL-001", 3, 2)])
+        self.assertEqual(findings[0].file, path)
+
+    def test_outputs_are_skipped(self):
+        blob = "A" * 200000 + '\\"]}{['
+        outputs = [
+            {
+                "output_type": "display_data",
+                "data": {"image/png": blob, "text/plain": ["eval(x)\n"]},
+                "metadata": {},
+            }
+        ]
+        path = self.write("plots.ipynb", notebook([code("plot()\n", outputs), code("exec(s)\n")]))
+
+        with read_source(path) as source:
+            cells = extract_code_cells(source.buffer)
+
+        self.assertEqual(cells, [(1, "plot()\n"), (2, "exec(s)\n")])
+        self.assertEqual([(f.rule_id, f.cell) for f in scan_file(path)], [("PY-EXEC-001", 2)])
+
+    def test_size_limit_applies_to_code_not_outputs(self):
+        outputs = [{"output_type": "display_data", "data": {"image/png": "A" * 300000}, "metadata": {}}]
+        nb = notebook([code("plot()\n", outputs), code("exec(s)\n")])
+        nb["metadata"]["widgets"] = {"state": {"model": "B" * 300000}}
+        path = self.write("large.ipynb", nb)
+
+        findings = scan_file(path, max_file_size=100000)
+
+        self.assertEqual([(f.rule_id, f.cell) for f in findings], [("PY-EXEC-001", 2)])
+        with self.assertRaises(FileTooLargeError) as ctx:
+            scan_file(path, max_file_size=10)
+        self.assertEqual(ctx.exception.size, len("plot()\nexec(s)\n"))
+
+    def test_language_is_read_from_metadata_without_decoding_it(self):
+        nb = notebook([code("eval(x)\n")], language="R")
+        nb["metadata"] = {"widgets": {"state": {}}, "kernelspec": {"language": "python"}, **nb["metadata"]}
+        self.assertEqual(scan_file(self.write("r.ipynb", nb)), [])
+
+        nb["metadata"] = {"kernelspec": {"display_name": "Python 3", "language": "python"}}
+        self.assertEqual(len(scan_file(self.write("py.ipynb", nb))), 1)
+
+        nb["metadata"] = []
+        self.assertEqual(len(scan_file(self.write("odd.ipynb", nb))), 1)
+
+    def test_magics_are_neutralized(self):
+        path = self.write(
+            "magic.ipynb",
+            notebook(
+                [
+                    code(["%matplotlib inline\n", "!pip install foo\n", "files = !ls\n", "os.path?\n"]),
+                    code(["%%bash\n", "rm -rf $(eval echo ~)\n"]),
+                    code(["%%time\n", "for i in x:\n", "    %time f()\n", "    eval(i)\n"]),
+                ]
+            ),
+        )
+
+        findings = scan_file(path)
+
+        self.assertEqual([(f.cell, f.line) for f in findings], [(3, 4)])
+
+    def test_broken_cell_does_not_hide_others(self):
+        path = self.write(
+            "broken.ipynb",
+            notebook([code("def broken(:\n"), code("import pickle\npickle.loads(b)\n")]),
+        )
+
+        findings = scan_file(path)
+
+        self.assertEqual([(f.rule_id, f.cell, f.line) for f in findings], [("PY-PICKLE-001", 2, 2)])
+
+    def test_non_python_kernel_is_ignored(self):
+        path = self.write("r.ipynb", notebook([code("eval(parse(text = x))\n")], language="R"))
+        self.assertEqual(scan_file(path), [])
+
+    def test_invalid_json_yields_no_findings(self):
+        path = self.root / "bad.ipynb"
+        path.write_text('{"cells": [')
+        self.assertEqual(scan_file(path), [])
+
+    def test_locate_maps_concatenated_lines(self):
+        nb = NotebookSource.from_buffer(
+            json.dumps(notebook([code("a\nb\n"), markdown("m"), code("c\n")])).encode()
+        )
+        self.assertEqual(nb.text, "a\nb\nc\n")
+        self.assertEqual(nb.locate(2), (1, 2))
+        self.assertEqual(nb.locate(3), (3, 1))
+
+    def test_discovery_yields_notebooks(self):
+        self.write("a.ipynb", notebook([]))
+        (self.root / "b.py").write_text("")
+        (self.root / "c.json").write_text("{}")
+
+        names = [p.name for p in discover_python_files(self.root, detect_scripts=False)]
+
+        self.assertEqual(names, ["a.ipynb", "b.py"])
+
+    def test_cell_round_trips_through_json(self):
+        path = self.write("rt.ipynb", notebook([code("exec(s)\n")]))
+        finding = scan_file(path)[0]
+
+        data = finding_to_dict(finding)
+
+        self.assertEqual(data["cell"], 1)
+        self.assertEqual(finding_from_dict(data), finding)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,177 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from stone_sec.engine.ignore import IgnoreMatcher
+from stone_sec.engine.scanner import PathFilter, discover_python_files
+from stone_sec.engine.shebang import ShebangCache
+
+
+class IgnoreMatcherTests(unittest.TestCase):
+    def test_unanchored_pattern_matches_at_any_depth(self):
+        m = IgnoreMatcher(["*_pb2.py"])
+        self.assertTrue(m.match("a/b/x_pb2.py", False))
+        self.assertIsNone(m.match("a/b/x.py", False))
+
+    def test_anchored_pattern_matches_from_base_only(self):
+        m = IgnoreMatcher(["/gen/*.py", "docs/build"])
+        self.assertTrue(m.match("gen/a.py", False))
+        self.assertIsNone(m.match("src/gen/a.py", False))
+        self.assertTrue(m.match("docs/build", True))
+
+    def test_last_match_wins_with_negation(self):
+        m = IgnoreMatcher(["*.py", "!keep.py"])
+        self.assertTrue(m.match("drop.py", False))
+        self.assertFalse(m.match("keep.py", False))
+
+    def test_dir_only_pattern_ignores_files(self):
+        m = IgnoreMatcher(["out/"])
+        self.assertTrue(m.match("out", True))
+        self.assertIsNone(m.match("out", False))
+
+    def test_double_star(self):
+        m = IgnoreMatcher(["a/**/z.py", "**/tmp"])
+        self.assertTrue(m.match("a/z.py", False))
+        self.assertTrue(m.match("a/b/c/z.py", False))
+        self.assertTrue(m.match("x/y/tmp", True))
+
+    def test_comments_and_escapes(self):
+        m = IgnoreMatcher(["# comment", "", "\\#hash.py"])
+        self.assertTrue(m.match("#hash.py", False))
+        self.assertIsNone(m.match("comment", False))
+
+
+class DiscoverPythonFilesTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def touch(self, rel: str, content: str = ""):
+        path = self.root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content, encoding="utf-8")
+
+    def rel(self, paths):
+        return [p.relative_to(self.root.resolve()).as_posix() for p in paths]
+
+    def test_prunes_excluded_dirs_and_yields_sorted(self):
+        for rel in (
+            "b.py",
+            "a/z.py",
+            "a.py",
+            ".venv/lib/x.py",
+            "node_modules/pkg/x.py",
+            ".git/hooks/x.py",
+            "build/lib/x.py",
+            "pkg/README.md",
+        ):
+            self.touch(rel)
+
+        self.assertEqual(self.rel(discover_python_files(self.root)), ["a/z.py", "a.py", "b.py"])
+
+    def test_honours_gitignore_and_excludes(self):
+        self.touch(".gitignore", "generated/\n*_pb2.py\n")
+        self.touch("sub/.gitignore", "!keep_pb2.py\nlocal.py\n")
+        for rel in (
+            "app.py",
+            "api_pb2.py",
+            "generated/x.py",
+            "sub/keep_pb2.py",
+            "sub/local.py",
+            "migrations/0001.py",
+        ):
+            self.touch(rel)
+
+        found = self.rel(discover_python_files(self.root, exclude=["migrations/"]))
+        self.assertEqual(found, ["app.py", "sub/keep_pb2.py"])
+
+        found = self.rel(discover_python_files(self.root, use_gitignore=False))
+        self.assertIn("generated/x.py", found)
+
+    def test_yields_in_sorted_path_order(self):
+        for rel in ("a.py", "a/x.py", "a-b/y.py", "a_c.py", "B.py", "a/b/z.py"):
+            self.touch(rel)
+
+        found = list(discover_python_files(self.root))
+        self.assertEqual(found, sorted(found))
+        self.assertEqual(self.rel(found), ["B.py", "a/b/z.py", "a/x.py", "a-b/y.py", "a.py", "a_c.py"])
+
+    def test_honours_gitignore_above_the_scan_root(self):
+        (self.root / ".git").mkdir()
+        self.touch(".gitignore", "generated/\n/svc/local.py\n*_pb2.py\n")
+        self.touch("svc/.gitignore", "!keep_pb2.py\n")
+        for rel in ("svc/app.py", "svc/local.py", "svc/api_pb2.py", "svc/keep_pb2.py", "svc/generated/x.py"):
+            self.touch(rel)
+
+        found = self.rel(discover_python_files(self.root / "svc"))
+        self.assertEqual(found, ["svc/app.py", "svc/keep_pb2.py"])
+
+        found = self.rel(discover_python_files(self.root / "svc", use_gitignore=False))
+        self.assertIn("svc/local.py", found)
+
+    def test_path_filter_honours_gitignore_above_the_root(self):
+        (self.root / ".git").mkdir()
+        self.touch(".gitignore", "*_pb2.py\n")
+        self.touch("svc/app.py")
+        self.touch("svc/api_pb2.py")
+
+        path_filter = PathFilter(self.root / "svc")
+        self.assertTrue(path_filter.includes(self.root / "svc" / "app.py"))
+        self.assertFalse(path_filter.includes(self.root / "svc" / "api_pb2.py"))
+
+    def test_is_lazy(self):
+        self.touch("a.py")
+        walker = discover_python_files(self.root)
+        self.assertEqual(next(walker).name, "a.py")
+
+
+class ScriptDetectionTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name) / "tree"
+        self.root.mkdir()
+        self.cache_path = Path(self._tmp.name) / "shebang.json"
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def script(self, name: str, content: str, mode: int = 0o755):
+        path = self.root / name
+        path.write_text(content, encoding="utf-8")
+        path.chmod(mode)
+
+    def discover(self, cache):
+        return sorted(p.name for p in discover_python_files(self.root, shebang_cache=cache))
+
+    def test_detects_executable_python_shebang_scripts(self):
+        self.script("deploy", "#!/usr/bin/env python3\nimport os\n")
+        self.script("build", "#!/bin/sh\necho hi\n")
+        self.script("notexec", "#!/usr/bin/python\n", mode=0o644)
+        self.script("tool.sh", "#!/usr/bin/env python\n")
+
+        self.assertEqual(self.discover(ShebangCache(self.cache_path)), ["deploy"])
+
+    def test_unchanged_scripts_are_classified_from_cache(self):
+        self.script("deploy", "#!/usr/bin/env python3\n")
+        self.script("build", "#!/bin/sh\n")
+
+        first = ShebangCache(self.cache_path)
+        self.discover(first)
+        self.assertEqual(first.misses, 2)
+        self.assertTrue(self.cache_path.exists())
+
+        second = ShebangCache.load(self.cache_path)
+        self.assertEqual(self.discover(second), ["deploy"])
+        self.assertEqual((second.hits, second.misses), (2, 0))
+
+    def test_detection_can_be_disabled(self):
+        self.script("deploy", "#!/usr/bin/env python3\n")
+        found = list(discover_python_files(self.root, detect_scripts=False))
+        self.assertEqual(found, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import json
+import unittest
+from unittest import mock
+
+from stone_sec.engine.pipeline import scan_source
+from stone_sec.engine.snippets import MAX_LINE_LENGTH, LineIndex
+
+
+class SnippetTests(unittest.TestCase):
+    def test_real_line_and_context(self):
+        source = "import os\n\ndef run(cmd):\n    value = cmd.strip()\n    return eval(value)\n\nx = 1\ny = 2\n"
+
+        (f,) = scan_source(source, "mod.py")
+
+        self.assertEqual(f.snippet, "return eval(value)")
+        self.assertEqual(f.context, "def run(cmd):\n    value = cmd.strip()\n    return eval(value)\n\nx = 1")
+
+    def test_bytes_honour_coding_cookie_and_crlf(self):
+        source = '# -*- coding: latin-1 -*-\r\nname = "\xe9"\r\neval(name)\r\n'.encode("latin-1")
+
+        (f,) = scan_source(source, "mod.py")
+
+        self.assertEqual(f.snippet, "eval(name)")
+        self.assertEqual(f.context, '# -*- coding: latin-1 -*-\nname = "é"\neval(name)')
+
+    def test_long_lines_are_capped(self):
+        (f,) = scan_source("eval(x)  # " + "a" * 1000 + "\n", "mod.py")
+
+        self.assertEqual(len(f.snippet), MAX_LINE_LENGTH)
+        self.assertTrue(f.snippet.endswith("..."))
+
+    def test_notebook_context_stays_in_cell(self):
+        nb = {
+            "cells": [
+                {"cell_type": "code", "metadata": {}, "outputs": [], "source": "a = 1\nb = 2"},
+                {"cell_type": "code", "metadata": {}, "outputs": [], "source": "eval(a)\nc = 3"},
+            ],
+            "metadata": {"language_info": {"name": "python"}},
+            "nbformat": 4,
+            "nbformat_minor": 5,
+        }
+
+        (f,) = scan_source(json.dumps(nb), "nb.ipynb")
+
+        self.assertEqual((f.cell, f.line), (2, 1))
+        self.assertEqual(f.snippet, "eval(a)")
+        self.assertEqual(f.context, "eval(a)\nc = 3")
+
+    def test_index_is_not_built_for_clean_files(self):
+        with mock.patch.object(LineIndex, "_build", side_effect=AssertionError):
+            self.assertEqual(scan_source(b"x = 1\n" * 100, "clean.py"), [])
+
+    def test_line_index(self):
+        index = LineIndex(b"\xef\xbb\xbfa\nbb\n\nccc")
+
+        self.assertEqual(len(index), 4)
+        self.assertEqual([index.line(n) for n in range(1, 5)], ["a", "bb", "", "ccc"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from stone_sec.engine.pipeline import scan_file
+from stone_sec.engine.source import FileTooLargeError, read_source
+
+
+class SourceFileTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def write(self, name: str, data: bytes) -> Path:
+        path = self.root / name
+        path.write_bytes(data)
+        return path
+
+    def test_coding_cookie_is_honoured(self):
+        path = self.write(
+            "latin.py",
+            b"# -*- coding: latin-1 -*-\nname = '\xe9t\xe9'\neval(name)\n",
+        )
+        findings = scan_file(path)
+        self.assertEqual([f.rule_id for f in findings], ["PY-EVAL-001"])
+
+    def test_large_files_are_memory_mapped(self):
+        data = b"x = 1\n" * 100 + b"exec(code)\n"
+        path = self.write("big.py", data)
+
+        with read_source(path, mmap_threshold=64) as source:
+            self.assertTrue(source.is_mapped)
+            self.assertEqual(source.size, len(data))
+            self.assertIsNotNone(source.parse())
+
+    def test_small_files_are_read_into_bytes(self):
+        path = self.write("small.py", b"x = 1\n")
+        with read_source(path) as source:
+            self.assertFalse(source.is_mapped)
+            self.assertEqual(source.size, 6)
+
+    def test_oversized_file_raises(self):
+        path = self.write("gen.py", b"x = 1\n" * 100)
+        with self.assertRaises(FileTooLargeError) as ctx:
+            read_source(path, max_size=100)
+        self.assertEqual(ctx.exception.size, 600)
+
+        self.assertIsNotNone(read_source(path, max_size=0))
+
+    def test_missing_file_returns_none(self):
+        self.assertIsNone(read_source(self.root / "missing.py"))
+
+
+if __name__ == "__main__":
+    unittest.main()
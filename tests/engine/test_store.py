@@ -0,0 +1,83 @@
+import io
+import tempfile
+import unittest
+from pathlib import Path
+
+from stone_sec.cli import create_parser, run_review
+from stone_sec.engine import store as store_module
+from stone_sec.engine.pipeline import scan_file
+from stone_sec.engine.severity import Severity
+from stone_sec.engine.store import FindingStore
+from stone_sec.models.finding import Finding
+
+
+def finding(rule_id: str, line: int = 1) -> Finding:
+    return Finding(
+        file=Path("x.py"),
+        line=line,
+        rule_id=rule_id,
+        severity=Severity.HIGH,
+        title="title",
+        snippet="snippet",
+    )
+
+
+class FindingStoreTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.path = self.root / "findings.sqlite"
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def record(self, rows, batch_size=2):
+        with FindingStore(self.path, batch_size=batch_size) as store:
+            store.begin_run(["."])
+            for rule_id, file in rows:
+                store.add(finding(rule_id), file, f"{rule_id}:{file}")
+            store.finish_run(files_scanned=len(rows), total_findings=len(rows))
+
+    def test_aggregations(self):
+        self.record([("PY-EVAL-001", "src/a.py"), ("PY-EVAL-001", "src/sub/b.py"), ("PY-SQL-001", "c.py")])
+        self.record([("PY-EVAL-001", "src/a.py")])
+
+        with FindingStore(self.path) as store:
+            self.assertEqual(store.aggregate("rule"), [("PY-EVAL-001", 2, 3), ("PY-SQL-001", 1, 1)])
+            self.assertEqual(store.aggregate("dir", directory="src"), [("src", 2, 2), ("src/sub", 1, 1)])
+            self.assertEqual(store.aggregate("file", rule="PY-SQL-001"), [("c.py", 1, 1)])
+            self.assertEqual(store.aggregate("run"), [("1", 1, 3), ("2", 1, 1)])
+            self.assertEqual([row[1:] for row in store.aggregate("week")], [(2, 4)])
+            self.assertEqual(store.aggregate("rule", since="2999-01-01"), [])
+            self.assertEqual(len(store.aggregate("rule", limit=1)), 1)
+
+    def test_unfinished_run_is_rolled_back(self):
+        self.record([("PY-EVAL-001", "a.py")])
+
+        store = FindingStore(self.path, batch_size=1)
+        store.begin_run(["."])
+        store.add(finding("PY-EXEC-001"), "b.py", "fp")
+        store.close()
+
+        with FindingStore(self.path) as store:
+            self.assertEqual(store.aggregate("run"), [("1", 1, 1)])
+
+    def test_store_module_passes_its_own_rules(self):
+        with FindingStore(self.path) as store:
+            self.assertEqual(store._db.execute("PRAGMA user_version").fetchone()[0], 1)
+        self.assertEqual(scan_file(Path(store_module.__file__)), [])
+
+    def test_review_records_reported_findings(self):
+        (self.root / "pkg").mkdir()
+        (self.root / "pkg/a.py").write_text("eval(a)\nexec(b)  # nosec\n", encoding="utf-8")
+
+        args = create_parser().parse_args(["review", "pkg", "--store", "findings.sqlite"])
+        for _ in range(2):
+            self.assertEqual(run_review(args, io.StringIO(), cwd=self.root), 0)
+
+        with FindingStore(self.path) as store:
+            self.assertEqual(store.aggregate("file"), [("pkg/a.py", 2, 2)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+from unittest import mock
+
+from stone_sec.engine import suppressions
+from stone_sec.engine.pipeline import scan_source
+from stone_sec.engine.suppressions import find_suppressions, parse_suppression
+
+
+def rule_lines(source):
+    return [(f.rule_id, f.line) for f in scan_source(source, "mod.py")]
+
+
+class ParseSuppressionTests(unittest.TestCase):
+    def test_comment_forms(self):
+        self.assertIsNone(parse_suppression("# nosec"))
+        self.assertIsNone(parse_suppression("# noqa: E501  # NOSEC"))
+        self.assertIsNone(parse_suppression("# stone-sec: ignore"))
+        self.assertEqual(
+            parse_suppression("# stone-sec: ignore[PY-EXEC-001, py-eval-001]"),
+            frozenset({"PY-EXEC-001", "PY-EVAL-001"}),
+        )
+        self.assertEqual(parse_suppression("# stone-sec: ignore [PY-EXEC-001]"), frozenset({"PY-EXEC-001"}))
+        self.assertIs(parse_suppression("# nosecurity concerns here"), False)
+        self.assertIs(parse_suppression("# TODO"), False)
+
+
+    def test_malformed_rule_lists_suppress_nothing(self):
+        self.assertIs(parse_suppression("# stone-sec: ignore[PY-EXEC-001"), False)
+        self.assertIs(parse_suppression("# stone-sec: ignore[]"), False)
+        self.assertIs(parse_suppression("# stone-sec: ignore[ , ]"), False)
+
+        source = "exec(a)  # stone-sec: ignore[PY-EXEC-001\neval(b)  # stone-sec: ignore[]\n"
+        self.assertEqual(rule_lines(source), [("PY-EVAL-001", 2), ("PY-EXEC-001", 1)])
+
+
+class SuppressionTests(unittest.TestCase):
+    def test_line_suppressions(self):
+        source = (
+            "eval(a)  # nosec\n"
+            "exec(b)  # stone-sec: ignore[PY-EVAL-001]\n"
+            "exec(c)  # stone-sec: ignore[PY-EXEC-001]\n"
+            "eval(d)\n"
+        )
+
+        self.assertEqual(rule_lines(source), [("PY-EVAL-001", 4), ("PY-EXEC-001", 2)])
+
+    def test_comment_covers_the_logical_line(self):
+        source = (
+            "run(\n"
+            "    eval(a),\n"
+            ")  # nosec\n"
+            "# nosec\n"
+            "eval(b)\n"
+        )
+
+        self.assertEqual(rule_lines(source), [("PY-EVAL-001", 5)])
+        self.assertEqual(find_suppressions(source), {1: None, 2: None, 3: None, 4: None})
+
+    def test_bytes_source(self):
+        self.assertEqual(rule_lines(b"\xef\xbb\xbfeval(a)  # nosec\n"), [])
+
+    def test_clean_files_are_not_tokenized(self):
+        with mock.patch.object(suppressions, "find_suppressions", side_effect=AssertionError):
+            self.assertEqual(scan_source("x = 1  # nosec\n", "clean.py"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
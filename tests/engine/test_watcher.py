@@ -0,0 +1,117 @@
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from stone_sec.engine.watcher import Watcher
+
+
+class WatcherTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def write(self, name: str, content: str, mtime_ns: int):
+        path = self.root / name
+        path.write_text(content, encoding="utf-8")
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+        return path
+
+    def test_reports_new_and_resolved_findings_for_changed_file_only(self):
+        self.write("a.py", "x = 1\n", 1_000)
+        self.write("b.py", "exec(code)\n", 1_000)
+
+        watcher = Watcher(self.root, use_inotify=False)
+        initial = watcher.start()
+        self.assertEqual([f.rule_id for f in initial.new], ["PY-EXEC-001"])
+
+        self.write("a.py", "x = 1\neval(y)\n", 2_000)
+        delta = watcher.check()
+        self.assertEqual(delta.rescanned, 1)
+        self.assertEqual([f.rule_id for f in delta.new], ["PY-EVAL-001"])
+        self.assertEqual(delta.resolved, [])
+
+        (self.root / "b.py").unlink()
+        delta = watcher.check()
+        self.assertEqual(delta.new, [])
+        self.assertEqual([f.rule_id for f in delta.resolved], ["PY-EXEC-001"])
+
+    def test_syntax_error_keeps_last_good_findings(self):
+        self.write("a.py", "eval(y)\n", 1_000)
+        watcher = Watcher(self.root, use_inotify=False)
+        watcher.start()
+
+        self.write("a.py", "eval(y\n", 2_000)
+        delta = watcher.check()
+        self.assertFalse(delta)
+        self.assertEqual([f.rule_id for f in watcher.findings()], ["PY-EVAL-001"])
+
+    def test_oversized_file_is_skipped_and_keeps_its_findings(self):
+        self.write("a.py", "eval(y)\n", 1_000)
+        watcher = Watcher(self.root, use_inotify=False, max_file_size=100)
+        watcher.start()
+
+        self.write("a.py", "eval(y)\n" + "x = 1\n" * 50, 2_000)
+        delta = watcher.check()
+
+        self.assertTrue(delta)
+        self.assertEqual([exc.path for exc in delta.skipped], [self.root.resolve() / "a.py"])
+        self.assertEqual(delta.resolved, [])
+        self.assertEqual([f.rule_id for f in watcher.findings()], ["PY-EVAL-001"])
+
+    def test_unchanged_tree_rescans_nothing(self):
+        self.write("a.py", "eval(y)\n", 1_000)
+        watcher = Watcher(self.root, use_inotify=False)
+        watcher.start()
+
+        delta = watcher.check()
+        self.assertEqual(delta.rescanned, 0)
+
+    def test_moved_findings_are_not_reported_again(self):
+        self.write("a.py", "eval(y)\nexec(z)\n", 1_000)
+        watcher = Watcher(self.root, use_inotify=False)
+        watcher.start()
+
+        self.write("a.py", "import os\n\neval(y)\nexec(z)\neval(y)\n", 2_000)
+        delta = watcher.check()
+
+        self.assertEqual(delta.rescanned, 1)
+        self.assertEqual([(f.rule_id, f.line) for f in delta.new], [("PY-EVAL-001", 5)])
+        self.assertEqual(delta.resolved, [])
+
+    @unittest.skipUnless(sys.platform.startswith("linux"), "inotify is Linux-only")
+    def test_inotify_events_drive_rescans(self):
+        self.write("a.py", "x = 1\n", 1_000)
+        (self.root / "ignored").mkdir()
+        (self.root / ".gitignore").write_text("ignored/\n", encoding="utf-8")
+        watcher = Watcher(self.root)
+        if not watcher.uses_inotify:
+            self.skipTest("inotify is not available")
+        watcher.start()
+
+        self.write("a.py", "eval(y)\n", 2_000)
+        (self.root / "pkg" / "sub").mkdir(parents=True)
+        self.write("pkg/sub/b.py", "exec(z)\n", 1_000)
+        self.write("ignored/c.py", "exec(z)\n", 1_000)
+
+        with mock.patch.object(watcher, "_poll", side_effect=AssertionError("full poll")):
+            delta = watcher.check()
+            self.assertEqual(sorted(f.rule_id for f in delta.new), ["PY-EVAL-001", "PY-EXEC-001"])
+
+            # The new directory is watched too.
+            self.write("pkg/sub/b.py", "x = 2\n", 2_000)
+            delta = watcher.check()
+            self.assertEqual([f.rule_id for f in delta.resolved], ["PY-EXEC-001"])
+
+            (self.root / "a.py").unlink()
+            delta = watcher.check()
+            self.assertEqual([f.rule_id for f in delta.resolved], ["PY-EVAL-001"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,198 @@
+import io
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from stone_sec.cli import create_parser, handle_llm_cache, run_review
+from stone_sec.llm.base import FALLBACK_RESULT, LLMProvider
+from stone_sec.llm.cache import CachingProvider, LLMCache, cache_key, is_cacheable
+from stone_sec.llm.prompt import build_prompt
+from stone_sec.models.finding import Finding, Severity
+
+ANSWER = {"explanation": "e", "exploit_scenario": "x", "remediation": "r"}
+
+
+class CountingProvider(LLMProvider):
+    model = "test-model"
+
+    def __init__(self, result=ANSWER):
+        self.result = result
+        self.prompts = []
+
+    def generate(self, prompt):
+        self.prompts.append(prompt)
+        return dict(self.result)
+
+
+def make_finding(file="a.py", line=1, snippet="eval(x)"):
+    return Finding(
+        rule_id="PY-EVAL-001",
+        severity=Severity.HIGH,
+        file=Path(file),
+        line=line,
+        title="Use of eval()",
+        snippet=snippet,
+    )
+
+
+class TestLLMCache(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = Path(tmp.name) / "llm-cache.sqlite"
+
+    def open_cache(self, **kwargs):
+        cache = LLMCache(self.path, **kwargs)
+        self.addCleanup(cache._db.close)
+        return cache
+
+    def test_answers_persist_across_instances(self):
+        cache = LLMCache(self.path)
+        cache.put("k", ANSWER)
+        cache.close()
+
+        cache = self.open_cache()
+        self.assertEqual(cache.get("k"), ANSWER)
+        self.assertIsNone(cache.get("other"))
+        self.assertEqual((cache.stats.hits, cache.stats.misses), (1, 1))
+
+    def test_key_ignores_location_but_not_code(self):
+        a = build_prompt(make_finding("a.py", 3))
+        b = build_prompt(make_finding("src/b.py", 40))
+        c = build_prompt(make_finding("a.py", 3, snippet="eval(y)"))
+
+        self.assertEqual(cache_key("m", a), cache_key("m", b))
+        self.assertNotEqual(cache_key("m", a), cache_key("m", c))
+        self.assertNotEqual(cache_key("m", a), cache_key("other", a))
+
+    def test_fallback_is_never_cached(self):
+        cache = self.open_cache()
+        cache.put("fallback", dict(FALLBACK_RESULT))
+        cache.put("empty", {"explanation": "", "exploit_scenario": "", "remediation": ""})
+
+        self.assertFalse(is_cacheable(FALLBACK_RESULT))
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.stats.stored, 0)
+
+    def test_expired_entries_are_misses(self):
+        cache = self.open_cache(ttl=60)
+        with mock.patch("stone_sec.llm.cache.time.time", return_value=time.time() - 120):
+            cache.put("old", ANSWER)
+        cache.put("new", ANSWER)
+
+        self.assertIsNone(cache.get("old"))
+        self.assertEqual(cache.get("new"), ANSWER)
+        self.assertEqual(cache.stats.expired, 1)
+        self.assertEqual(len(cache), 1)
+
+    def test_prune_evicts_least_recently_used(self):
+        cache = self.open_cache(max_entries=2)
+        now = time.time()
+        for n, key in enumerate(["a", "b", "c"]):
+            with mock.patch("stone_sec.llm.cache.time.time", return_value=now + n):
+                cache.put(key, ANSWER)
+        with mock.patch("stone_sec.llm.cache.time.time", return_value=now + 10):
+            cache.get("a")
+
+        cache.prune()
+
+        self.assertEqual(cache.stats.evicted, 1)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), ANSWER)
+
+    def test_stats_command_does_not_prune(self):
+        cache = LLMCache(self.path)
+        with mock.patch("stone_sec.llm.cache.time.time", return_value=time.time() - 40 * 86400):
+            cache.put("old", ANSWER)
+        cache.close(prune=False)
+
+        args = create_parser().parse_args(["llm-cache", "stats"])
+        outputs = []
+        for _ in range(2):
+            out = io.StringIO()
+            with mock.patch.dict(os.environ, {"STONE_SEC_CACHE_DIR": str(self.path.parent)}), \
+                    mock.patch("sys.stdout", out), self.assertRaises(SystemExit):
+                handle_llm_cache(args)
+            outputs.append(out.getvalue())
+
+        self.assertIn("1 answer(s)", outputs[0])
+        self.assertIn("1 answer(s)", outputs[1])
+
+
+class TestCachingProvider(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = Path(tmp.name) / "llm-cache.sqlite"
+
+    def test_only_misses_reach_the_model(self):
+        inner = CountingProvider()
+        provider = CachingProvider(inner, LLMCache(self.path))
+        self.addCleanup(provider.close)
+
+        first = build_prompt(make_finding(line=1))
+        moved = build_prompt(make_finding(line=9))
+        other = build_prompt(make_finding(snippet="eval(y)"))
+
+        self.assertEqual(provider.generate(first), ANSWER)
+        results = provider.generate_many([moved, other], concurrency=2)
+
+        self.assertEqual(results, [ANSWER, ANSWER])
+        self.assertEqual(inner.prompts, [first, other])
+        self.assertEqual(provider.cache.stats.hits, 1)
+
+    def test_failures_are_retried_next_time(self):
+        inner = CountingProvider(result=FALLBACK_RESULT)
+        provider = CachingProvider(inner, LLMCache(self.path))
+        self.addCleanup(provider.close)
+
+        prompt = build_prompt(make_finding())
+        provider.generate(prompt)
+        provider.generate(prompt)
+
+        self.assertEqual(len(inner.prompts), 2)
+
+    def test_review_reuses_cached_answers(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            (Path(tmp) / "a.py").write_text("eval(a)\nexec(b)\n", encoding="utf-8")
+            argv = ["review", tmp, "--provider", "ollama", "--format", "jsonl"]
+
+            calls = []
+            for _ in range(2):
+                inner = CountingProvider()
+                out = io.StringIO()
+                with mock.patch.dict(os.environ, {"STONE_SEC_CACHE_DIR": str(self.path.parent)}), \
+                        mock.patch("stone_sec.llm.ollama_provider.OllamaProvider", return_value=inner):
+                    run_review(create_parser().parse_args(argv), out)
+                calls.append(len(inner.prompts))
+                self.assertEqual(out.getvalue().count('"explanation": "e"'), 2)
+
+        self.assertEqual(calls, [2, 0])
+        self.assertIn("LLM: 0 model request(s) for 2 finding(s)", out.getvalue())
+        self.assertIn("LLM cache: 2 hit(s), 0 miss(es)", out.getvalue())
+
+    def test_review_without_usable_cache_asks_the_model(self):
+        blocker = self.path.parent / "not-a-dir"
+        blocker.write_text("", encoding="utf-8")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            (Path(tmp) / "a.py").write_text("eval(a)\n", encoding="utf-8")
+            argv = ["review", tmp, "--provider", "ollama", "--fail-on", "high"]
+            inner = CountingProvider()
+            inner.close = mock.Mock()
+            out = io.StringIO()
+            with mock.patch.dict(os.environ, {"STONE_SEC_CACHE_DIR": str(blocker / "cache")}), \
+                    mock.patch("stone_sec.llm.ollama_provider.OllamaProvider", return_value=inner):
+                code = run_review(create_parser().parse_args(argv), out)
+
+        self.assertEqual(code, 1)
+        self.assertIn("[WARN] LLM cache unavailable", out.getvalue())
+        self.assertEqual(len(inner.prompts), 1)
+        inner.close.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
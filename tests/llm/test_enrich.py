@@ -0,0 +1,146 @@
+import io
+import random
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from stone_sec.cli import create_parser, run_review
+from stone_sec.engine.pipeline import scan_source
+from stone_sec.llm.base import FALLBACK_RESULT, LLMProvider
+from stone_sec.llm.enrich import EnrichmentStage
+
+
+class FakeProvider(LLMProvider):
+    """
+    Answers with the prompt's `Line:` after a random delay; tracks how many
+    requests overlap.
+    """
+
+    def __init__(self, delay=0.05, slow_lines=(), failing_lines=()):
+        self.delay = delay
+        self.slow_lines = set(slow_lines)
+        self.failing_lines = set(failing_lines)
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+        self._random = random.Random(0)
+
+    def generate(self, prompt):
+        line = int(prompt.split("- Line: ")[1].split("\n")[0])
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            delay = self._random.uniform(self.delay / 2, self.delay)
+        try:
+            time.sleep(1.0 if line in self.slow_lines else delay)
+            if line in self.failing_lines:
+                raise RuntimeError("model crashed")
+            return {"explanation": f"line {line}", "exploit_scenario": "", "remediation": ""}
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+def prompt(line):
+    return f"Finding details:\n- Line: {line}\n"
+
+
+class GenerateManyTests(unittest.TestCase):
+    def test_results_follow_prompt_order(self):
+        provider = FakeProvider()
+
+        results = provider.generate_many([prompt(n) for n in range(20)], concurrency=5)
+
+        self.assertEqual([r["explanation"] for r in results], [f"line {n}" for n in range(20)])
+        self.assertEqual(provider.peak, 5)
+
+    def test_timeouts_and_errors_fall_back(self):
+        provider = FakeProvider(slow_lines={1}, failing_lines={2})
+
+        started = time.monotonic()
+        results = provider.generate_many([prompt(n) for n in range(4)], concurrency=4, timeout=0.2)
+
+        self.assertLess(time.monotonic() - started, 0.9)
+        self.assertEqual(results[0]["explanation"], "line 0")
+        self.assertEqual(results[1], FALLBACK_RESULT)
+        self.assertEqual(results[2], FALLBACK_RESULT)
+        self.assertEqual(results[3]["explanation"], "line 3")
+
+    def test_sequential_without_concurrency(self):
+        provider = FakeProvider()
+        provider.generate_many([prompt(n) for n in range(3)])
+        self.assertEqual(provider.peak, 1)
+
+
+class EnrichmentStageTests(unittest.TestCase):
+    def test_findings_keep_order_and_get_their_own_result(self):
+        findings = scan_source("".join(f"eval(x{n})\n" for n in range(10)), "mod.py")
+        out = []
+
+        stage = EnrichmentStage(FakeProvider(), out.append, concurrency=3, batch_size=4)
+        for f in findings:
+            stage.add(f)
+        self.assertEqual(len(out), 8)
+        stage.flush()
+
+        self.assertEqual(out, findings)
+        self.assertEqual([f.explanation for f in out], [f"line {f.line}" for f in findings])
+        self.assertEqual(stage.requests, 10)
+
+    def test_equivalent_findings_share_one_request(self):
+        source = "".join("\n\nsubprocess.run(cmd, shell=True)\n\n\n" for _ in range(6))
+        findings = scan_source("import subprocess\n" + source + "eval(x)\n", "mod.py")
+        self.assertEqual(len(findings), 7)
+        out = []
+
+        provider = FakeProvider()
+        stage = EnrichmentStage(provider, out.append, concurrency=2, batch_size=1)
+        for f in findings:
+            stage.add(f)
+        stage.flush()
+
+        self.assertEqual(out, findings)
+        calls = [f for f in out if f.rule_id == "PY-SUBPROCESS-001"]
+        (evaluated,) = [f for f in out if f.rule_id == "PY-EVAL-001"]
+        self.assertEqual({f.explanation for f in calls}, {f"line {calls[0].line}"})
+        self.assertEqual(evaluated.explanation, f"line {evaluated.line}")
+        self.assertEqual((stage.requests, stage.findings, stage.saved), (2, 7, 5))
+
+    def test_failed_group_is_asked_again_in_a_later_batch(self):
+        findings = scan_source("eval(x)\n\n\n\n\n\neval(x)\n", "mod.py")
+        provider = FakeProvider(failing_lines={findings[0].line})
+        out = []
+
+        stage = EnrichmentStage(provider, out.append, batch_size=1)
+        stage.add(findings[0])
+        stage.flush()
+        stage.add(findings[1])
+        stage.flush()
+
+        self.assertEqual(out[0].explanation, FALLBACK_RESULT["explanation"])
+        self.assertEqual(out[1].explanation, f"line {findings[1].line}")
+        self.assertEqual(stage.requests, 2)
+
+    def test_review_enriches_with_concurrency(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            (Path(tmp) / "a.py").write_text("eval(a)\nexec(b)\neval(c)\n", encoding="utf-8")
+            provider = FakeProvider()
+            args = create_parser().parse_args(
+                ["review", tmp, "--provider", "ollama", "--llm-concurrency", "3",
+                 "--no-llm-cache", "--format", "jsonl"]
+            )
+
+            out = io.StringIO()
+            with mock.patch("stone_sec.llm.ollama_provider.OllamaProvider", return_value=provider):
+                run_review(args, out)
+
+        self.assertEqual(out.getvalue().count('"explanation": "line '), 3)
+        self.assertEqual(provider.peak, 3)
+        self.assertIn("LLM: 3 model request(s) for 3 finding(s), 0 saved by grouping", out.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,133 @@
+import json
+import os
+import threading
+import unittest
+from unittest import mock
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from stone_sec.llm.base import FALLBACK_RESULT
+from stone_sec.llm.ollama_http_provider import ConnectionPool, OllamaHTTPProvider, default_url
+
+
+class StubOllama(ThreadingHTTPServer):
+    """
+    Answers /api/generate like Ollama with `format: json` and counts the
+    TCP connections it accepts.
+    """
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), StubHandler)
+        self.connections = 0
+        self.requests = []
+        self.status = 200
+        self.close_after_reply = False
+
+    def process_request(self, request, client_address):
+        self.connections += 1
+        super().process_request(request, client_address)
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # As Ollama's server does; headers and body are written separately.
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.requests.append((self.path, body))
+
+        answer = {"explanation": body["prompt"], "exploit_scenario": "x", "remediation": "y"}
+        payload = json.dumps({"model": body["model"], "response": json.dumps(answer), "done": True})
+        data = payload.encode("utf-8")
+
+        self.send_response(self.server.status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        if self.server.close_after_reply:
+            self.send_header("Connection", "close")
+            self.close_connection = True
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class OllamaHTTPProviderTests(unittest.TestCase):
+    def setUp(self):
+        self.server = StubOllama()
+        self.thread = threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True)
+        self.thread.start()
+        self.provider = OllamaHTTPProvider(url=self.server.url, timeout=5, pool_size=3)
+
+    def tearDown(self):
+        self.provider.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_requests_json_and_keeps_model_loaded(self):
+        result = self.provider.generate("why?")
+
+        self.assertEqual(result, {"explanation": "why?", "exploit_scenario": "x", "remediation": "y"})
+        path, body = self.server.requests[0]
+        self.assertEqual(path, "/api/generate")
+        self.assertEqual(body["format"], "json")
+        self.assertEqual(body["keep_alive"], "10m")
+        self.assertFalse(body["stream"])
+
+    def test_sequential_requests_share_one_connection(self):
+        for n in range(5):
+            self.assertEqual(self.provider.generate(str(n))["explanation"], str(n))
+        self.assertEqual(self.server.connections, 1)
+
+    def test_concurrent_requests_stay_within_pool(self):
+        prompts = [str(n) for n in range(30)]
+
+        results = self.provider.generate_many(prompts, concurrency=3)
+
+        self.assertEqual([r["explanation"] for r in results], prompts)
+        self.assertLessEqual(self.server.connections, 3)
+
+    def test_server_closed_connections_are_replaced(self):
+        self.server.close_after_reply = True
+        for n in range(3):
+            self.assertEqual(self.provider.generate(str(n))["explanation"], str(n))
+        self.assertEqual(self.server.connections, 3)
+
+    def test_stale_pooled_connection_is_retried(self):
+        self.provider.generate("warm")
+        for conn in self.provider.pool._idle:
+            conn.sock.close()
+
+        self.assertEqual(self.provider.generate("again")["explanation"], "again")
+
+    def test_errors_fall_back(self):
+        self.server.status = 500
+        self.assertEqual(self.provider.generate("x"), FALLBACK_RESULT)
+
+        unreachable = OllamaHTTPProvider(url="http://127.0.0.1:9", timeout=1)
+        self.assertEqual(unreachable.generate("x"), FALLBACK_RESULT)
+
+
+class DefaultURLTests(unittest.TestCase):
+    def url(self, host):
+        with mock.patch.dict(os.environ, {"OLLAMA_HOST": host}):
+            return default_url()
+
+    def test_host_without_port_uses_ollama_port(self):
+        self.assertEqual(self.url(""), "http://127.0.0.1:11434")
+        self.assertEqual(self.url("myhost"), "http://myhost:11434")
+        self.assertEqual(ConnectionPool(self.url("myhost")).port, 11434)
+        self.assertEqual(self.url("myhost:8080"), "http://myhost:8080")
+        self.assertEqual(self.url(":8080"), "http://127.0.0.1:8080")
+        self.assertEqual(self.url("https://ollama.example"), "https://ollama.example")
+
+
+if __name__ == "__main__":
+    unittest.main()
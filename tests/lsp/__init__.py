@@ -0,0 +1 @@
+# LSP test package marker for unittest discovery.
@@ -0,0 +1,98 @@
+import io
+import time
+import unittest
+
+from stone_sec.lsp.protocol import MessageWriter, read_message
+from stone_sec.lsp.server import LanguageServer
+
+URI = "file:///tmp/sample.py"
+
+
+class LanguageServerTests(unittest.TestCase):
+    def setUp(self):
+        self.sent = []
+        self.server = LanguageServer(self.sent.append, debounce=0)
+        self.server.handle({"jsonrpc": "2.0", "id": 1, "method": "initialize", "params": {}})
+
+    def open(self, text: str):
+        self.server.handle(
+            {
+                "jsonrpc": "2.0",
+                "method": "textDocument/didOpen",
+                "params": {"textDocument": {"uri": URI, "version": 1, "text": text}},
+            }
+        )
+
+    def change(self, text: str, version: int):
+        self.server.handle(
+            {
+                "jsonrpc": "2.0",
+                "method": "textDocument/didChange",
+                "params": {
+                    "textDocument": {"uri": URI, "version": version},
+                    "contentChanges": [{"text": text}],
+                },
+            }
+        )
+
+    def last_diagnostics(self):
+        published = [m for m in self.sent if m.get("method") == "textDocument/publishDiagnostics"]
+        return published[-1]["params"]
+
+    def test_open_publishes_findings_as_diagnostics(self):
+        self.open("import subprocess\nsubprocess.run(cmd, shell=True)\n")
+
+        params = self.last_diagnostics()
+        self.assertEqual(params["uri"], URI)
+        self.assertEqual(len(params["diagnostics"]), 1)
+        diag = params["diagnostics"][0]
+        self.assertEqual(diag["code"], "PY-SUBPROCESS-001")
+        self.assertEqual(diag["range"]["start"]["line"], 1)
+        self.assertEqual(diag["severity"], 1)
+
+    def test_syntax_error_keeps_last_good_ast(self):
+        self.open("eval(x)\n")
+        self.change("eval(x)\nif (\n", 2)
+
+        params = self.last_diagnostics()
+        self.assertEqual(params["version"], 2)
+        self.assertEqual([d["code"] for d in params["diagnostics"]], ["PY-EVAL-001"])
+
+    def test_debounced_changes_analyse_once(self):
+        server = LanguageServer(self.sent.append, debounce=0.05)
+        server.handle({"jsonrpc": "2.0", "id": 1, "method": "initialize", "params": {}})
+        self.server = server
+        self.open("x = 1\n")
+        self.sent.clear()
+
+        for version in range(2, 7):
+            self.change("eval(x)\n" * version, version)
+        time.sleep(0.3)
+
+        published = [m for m in self.sent if m.get("method") == "textDocument/publishDiagnostics"]
+        self.assertEqual(len(published), 1)
+        self.assertEqual(published[0]["params"]["version"], 6)
+
+    def test_close_clears_diagnostics(self):
+        self.open("eval(x)\n")
+        self.server.handle(
+            {
+                "jsonrpc": "2.0",
+                "method": "textDocument/didClose",
+                "params": {"textDocument": {"uri": URI}},
+            }
+        )
+        self.assertEqual(self.last_diagnostics()["diagnostics"], [])
+
+
+class ProtocolTests(unittest.TestCase):
+    def test_round_trip(self):
+        stream = io.BytesIO()
+        MessageWriter(stream).write({"jsonrpc": "2.0", "id": 1, "result": "é"})
+        stream.seek(0)
+        self.assertEqual(read_message(stream)["result"], "é")
+        self.assertIsNone(read_message(stream))
+
+
+if __name__ == "__main__":
+    unittest.main()
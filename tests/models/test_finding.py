@@ -0,0 +1,57 @@
+import pickle
+import unittest
+from pathlib import Path
+
+from stone_sec.engine.severity import Severity
+from stone_sec.models.finding import Finding
+
+
+def make(line: int = 1, file: str = "pkg/mod.py") -> Finding:
+    return Finding(
+        file=Path(file),
+        line=line,
+        rule_id="PY-EVAL-001",
+        severity=Severity.HIGH,
+        title="Use of eval()",
+        snippet="eval(...)",
+    )
+
+
+class FindingTests(unittest.TestCase):
+    def test_slotted(self):
+        f = make()
+        self.assertFalse(hasattr(f, "__dict__"))
+        with self.assertRaises(AttributeError):
+            f.unknown = 1
+
+    def test_rule_metadata_and_paths_are_shared(self):
+        a, b = make(1), make(2)
+        self.assertIs(a._rule, b._rule)
+        self.assertIs(a.file, b.file)
+        self.assertEqual((a.rule_id, a.severity, a.title), ("PY-EVAL-001", Severity.HIGH, "Use of eval()"))
+
+    def test_pickle_round_trip_reinterns(self):
+        f = make(3)
+        f.explanation = "why"
+        f.cell = 2
+
+        copy = pickle.loads(pickle.dumps(f))  # stone-sec: ignore[PY-PICKLE-001]
+
+        self.assertEqual(copy, f)
+        self.assertIs(copy.file, f.file)
+        self.assertIs(copy._rule, f._rule)
+
+    def test_replace_copies(self):
+        f = make()
+        moved = f.replace(file=Path("other.py"))
+        clone = f.replace()
+        clone.explanation = "enriched"
+
+        self.assertEqual(moved.file, Path("other.py"))
+        self.assertEqual(moved.line, f.line)
+        self.assertIsNone(f.explanation)
+        self.assertNotEqual(clone, f)
+
+
+if __name__ == "__main__":
+    unittest.main()
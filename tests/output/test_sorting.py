@@ -0,0 +1,72 @@
+import io
+import random
+import tempfile
+import unittest
+from pathlib import Path
+
+from stone_sec.cli import create_parser, run_review
+from stone_sec.engine.severity import Severity
+from stone_sec.models.finding import Finding
+from stone_sec.output.sorting import SortedSpool, finding_sort_key
+
+
+def finding(file: str, line: int, rule_id: str) -> Finding:
+    return Finding(
+        file=Path(file),
+        line=line,
+        rule_id=rule_id,
+        severity=Severity.HIGH,
+        title="title",
+        snippet=f"{rule_id}@{line}",
+    )
+
+
+class SortedSpoolTests(unittest.TestCase):
+    def test_merges_spilled_runs_in_order(self):
+        findings = [
+            finding(f"f{n % 7}.py", n % 13, f"PY-{n % 3}") for n in range(500)
+        ]
+        shuffled = findings[:]
+        random.Random(0).shuffle(shuffled)
+
+        spool = SortedSpool(run_size=64)
+        for f in shuffled:
+            spool.add(f)
+
+        self.assertEqual(len(spool._runs), 7)
+        self.assertEqual(list(spool.drain()), sorted(findings, key=finding_sort_key))
+        self.assertEqual(spool._runs, [])
+
+
+class SortedReviewTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        for name in ("b", "a", "c/d", "c/a"):
+            path = self.root / f"{name}.py"
+            path.parent.mkdir(exist_ok=True)
+            path.write_text("exec(y)\neval(x)\n" * 3, encoding="utf-8")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def review(self, *argv):
+        out = io.StringIO()
+        run_review(create_parser().parse_args(["review", ".", "--sort", *argv]), out, cwd=self.root)
+        return out.getvalue()
+
+    def test_output_is_sorted_and_identical_across_jobs(self):
+        reports = {self.review("--format", "jsonl", "--jobs", str(jobs)) for jobs in (1, 2)}
+        self.assertEqual(len(reports), 1)
+
+        text = self.review()
+        files = [line.split("/")[-1] for line in text.splitlines() if line.startswith("File: ")]
+        lines = [int(line[6:]) for line in text.splitlines() if line.startswith("Line: ")]
+
+        self.assertEqual(files[:6], ["a.py"] * 6)
+        self.assertEqual(lines[:6], [1, 2, 3, 4, 5, 6])
+        self.assertTrue(text.endswith("Found 24 issue(s).\n"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,136 @@
+import io
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from stone_sec.cli import create_parser, run_review
+from stone_sec.engine.severity import Severity, SeverityGate
+
+
+class SeverityGateTests(unittest.TestCase):
+    def test_tracks_highest_and_threshold(self):
+        gate = SeverityGate(Severity.HIGH)
+        gate.observe(Severity.LOW)
+        self.assertFalse(gate.tripped)
+
+        gate.observe(Severity.CRITICAL)
+        gate.observe(Severity.MEDIUM)
+
+        self.assertTrue(gate.tripped)
+        self.assertEqual(gate.highest, Severity.CRITICAL)
+        self.assertEqual(gate.count, 3)
+
+    def test_no_threshold_never_trips(self):
+        gate = SeverityGate()
+        gate.observe(Severity.CRITICAL)
+        self.assertFalse(gate.tripped)
+
+
+class StreamingReviewTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        (self.root / "a.py").write_text("eval(x)\n", encoding="utf-8")
+        (self.root / "b.py").write_text("import pickle\npickle.loads(d)\n", encoding="utf-8")
+        (self.root / "big.py").write_text("x = 1\n" * 50, encoding="utf-8")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def review(self, *argv, cwd=None):
+        out = io.StringIO()
+        code = run_review(create_parser().parse_args(["review", str(self.root), *argv]), out, cwd=cwd)
+        return code, out.getvalue()
+
+    def test_jsonl_emits_findings_then_summary(self):
+        code, out = self.review("--format", "jsonl", "--max-file-size", "100", "--fail-on", "high")
+        records = [json.loads(line) for line in out.splitlines()]
+
+        self.assertEqual(code, 1)
+        self.assertEqual(
+            [r["type"] for r in records], ["finding", "finding", "skipped", "summary"]
+        )
+        self.assertEqual(records[0]["rule_id"], "PY-EVAL-001")
+        self.assertEqual(
+            records[-1],
+            {
+                "type": "summary",
+                "files_scanned": 3,
+                "total_findings": 2,
+                "highest_severity": "high",
+                "failed": True,
+            },
+        )
+
+    def test_text_streams_findings_with_trailing_summary(self):
+        code, out = self.review()
+
+        self.assertEqual(code, 0)
+        self.assertTrue(out.startswith("[high] Use of eval()\nRule: PY-EVAL-001\n"))
+        self.assertTrue(out.endswith("Found 2 issue(s).\n"))
+
+    def test_json_document_is_unchanged(self):
+        code, out = self.review("--format", "json")
+        report = json.loads(out)
+
+        self.assertEqual(report["total_findings"], 2)
+        self.assertEqual(len(report["findings"]), 2)
+
+    def test_sarif_document(self):
+        code, out = self.review("--format", "sarif", "--max-file-size", "100", cwd=self.root)
+        report = json.loads(out)
+        run = report["runs"][0]
+        rules = run["tool"]["driver"]["rules"]
+        rule_ids = [r["id"] for r in rules]
+
+        self.assertEqual(report["version"], "2.1.0")
+        self.assertIn("PY-SSLCTX-001", rule_ids)
+        self.assertIn("PY-SSLCTX-002", rule_ids)
+        self.assertEqual(len(rule_ids), len(set(rule_ids)))
+
+        self.assertEqual([r["ruleId"] for r in run["results"]], ["PY-EVAL-001", "PY-PICKLE-001"])
+        first = run["results"][0]
+        self.assertEqual(rules[first["ruleIndex"]]["id"], "PY-EVAL-001")
+        self.assertEqual(first["level"], "error")
+        location = first["locations"][0]["physicalLocation"]
+        self.assertEqual(location["artifactLocation"]["uri"], "a.py")
+        self.assertEqual(location["region"]["startLine"], 1)
+
+        invocation = run["invocations"][0]
+        self.assertTrue(invocation["executionSuccessful"])
+        self.assertEqual(len(invocation["toolExecutionNotifications"]), 1)
+        self.assertEqual(code, 0)
+
+    def test_sarif_notebook_finding_is_located_by_cell(self):
+        nb = {
+            "cells": [
+                {"cell_type": "code", "source": ["x = 1\n"], "outputs": []},
+                {"cell_type": "code", "source": ["y = 2\n", "eval(y)\n"], "outputs": []},
+            ],
+            "metadata": {},
+        }
+        (self.root / "nb.ipynb").write_text(json.dumps(nb, indent=1), encoding="utf-8")
+
+        code, out = self.review("--format", "sarif", "--sort", cwd=self.root)
+        result = json.loads(out)["runs"][0]["results"][-1]
+        location = result["locations"][0]
+
+        self.assertEqual(location["physicalLocation"]["artifactLocation"]["uri"], "nb.ipynb")
+        self.assertNotIn("region", location["physicalLocation"])
+        self.assertEqual(location["logicalLocations"][0]["name"], "cell 2")
+        self.assertEqual(result["properties"]["cell"], 2)
+        self.assertEqual(result["properties"]["cellLine"], 2)
+        self.assertEqual(result["properties"]["snippet"], "eval(y)")
+
+    def test_sarif_without_findings_is_valid(self):
+        for name in ("a.py", "b.py"):
+            (self.root / name).unlink()
+
+        code, out = self.review("--format", "sarif")
+
+        self.assertEqual(json.loads(out)["runs"][0]["results"], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import io
+import json
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import stone_sec
+from stone_sec.cli import create_parser, run_review
+
+
+class ScanSourceTests(unittest.TestCase):
+    def test_scan_source_text(self):
+        findings = stone_sec.scan_source("import pickle\npickle.loads(b)\n", "svc/app.py")
+
+        self.assertEqual([(f.rule_id, f.line) for f in findings], [("PY-PICKLE-001", 2)])
+        self.assertEqual(findings[0].file, Path("svc/app.py"))
+
+    def test_scan_source_bytes_honours_coding_cookie(self):
+        source = b"# -*- coding: latin-1 -*-\ns = '\xe9'\neval(s)\n"
+        self.assertEqual([f.rule_id for f in stone_sec.scan_source(source, "a.py")], ["PY-EVAL-001"])
+
+    def test_scan_source_notebook(self):
+        nb = {"cells": [{"cell_type": "code", "source": "exec(s)\n", "outputs": []}], "metadata": {}}
+        findings = stone_sec.scan_source(json.dumps(nb), "nb.ipynb")
+        self.assertEqual([(f.rule_id, f.cell) for f in findings], [("PY-EXEC-001", 1)])
+
+    def test_invalid_source_yields_no_findings(self):
+        self.assertEqual(stone_sec.scan_source("def broken(:\n", "bad.py"), [])
+
+    def test_scan_sources_keeps_input_order(self):
+        findings = stone_sec.scan_sources([("exec(a)\n", "b.py"), ("eval(b)\n", "a.py")])
+        self.assertEqual([str(f.file) for f in findings], ["b.py", "a.py"])
+
+    def test_review_reads_source_from_stdin(self):
+        args = create_parser().parse_args(
+            ["review", "-", "--stdin-filename", "pr/app.py", "--format", "json"]
+        )
+        out = io.StringIO()
+
+        with mock.patch("sys.stdin", io.StringIO("eval(x)\n")):
+            code = run_review(args, out)
+
+        report = json.loads(out.getvalue())
+        self.assertEqual(code, 0)
+        self.assertEqual([f["file"] for f in report["findings"]], ["pr/app.py"])
+
+
+class ImportTests(unittest.TestCase):
+    def test_cli_import_does_not_load_the_engine(self):
+        code = (
+            "import sys, stone_sec.cli; "
+            "print(sorted(m for m in sys.modules if m.startswith('stone_sec')))"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).resolve().parent.parent,
+        )
+        self.assertEqual(result.stdout.strip(), "['stone_sec', 'stone_sec.cli', 'stone_sec.defaults']")
+
+    def test_public_names_load_on_first_use(self):
+        from stone_sec.engine.core import Engine
+
+        self.assertIs(stone_sec.Engine, Engine)
+        self.assertIn("scan_sources", dir(stone_sec))
+        with self.assertRaises(AttributeError):
+            stone_sec.missing
+
+
+if __name__ == "__main__":
+    unittest.main()
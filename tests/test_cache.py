@@ -0,0 +1,37 @@
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from stone_sec.cache import atomic_write_bytes
+
+
+class AtomicWriteTests(unittest.TestCase):
+    def test_concurrent_writers_never_publish_a_torn_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "cache.json"
+            payloads = [bytes([65 + n]) * 200_000 for n in range(8)]
+            errors = []
+            start = threading.Barrier(len(payloads))
+
+            def write(data):
+                start.wait()
+                try:
+                    for _ in range(20):
+                        atomic_write_bytes(path, data)
+                except Exception as exc:
+                    errors.append(exc)
+
+            threads = [threading.Thread(target=write, args=(p,)) for p in payloads]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+            self.assertEqual(errors, [])
+            self.assertIn(path.read_bytes(), payloads)
+            self.assertEqual([p.name for p in Path(tmp).iterdir()], ["cache.json"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+import contextlib
+import io
+import os
+import socket
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from stone_sec.cli import create_parser, run_review
+from stone_sec.daemon import default_socket_path, ensure_private_dir, review_via_daemon, serve
+from stone_sec.engine.core import FileResultCache
+
+
+@unittest.skipUnless(hasattr(socket, "AF_UNIX"), "Unix sockets are not available")
+class DaemonTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        (self.root / "a.py").write_text("import os\nos.system(cmd)\n", encoding="utf-8")
+        self.socket_path = self.root / "s.sock"
+
+        self.server = threading.Thread(
+            target=serve,
+            kwargs={"socket_path": str(self.socket_path), "idle_timeout": 1.0},
+            daemon=True,
+        )
+        self.server.start()
+        deadline = time.monotonic() + 5
+        while not self.socket_path.exists() and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def tearDown(self):
+        self.server.join(timeout=10)
+        self._tmp.cleanup()
+
+    def test_daemon_output_and_exit_code_match_in_process(self):
+        for argv in (
+            ["review", str(self.root), "--fail-on", "high"],
+            ["review", str(self.root), "--format", "json"],
+            ["review", str(self.root / "missing")],
+        ):
+            expected = io.StringIO()
+            expected_code = run_review(create_parser().parse_args(argv), expected)
+
+            actual = io.StringIO()
+            code = review_via_daemon(argv, socket_path=str(self.socket_path), out=actual)
+
+            self.assertEqual(code, expected_code)
+            self.assertEqual(actual.getvalue(), expected.getvalue())
+
+    def test_server_shuts_down_when_idle(self):
+        self.server.join(timeout=10)
+        self.assertFalse(self.server.is_alive())
+        self.assertFalse(self.socket_path.exists())
+
+
+@unittest.skipUnless(hasattr(socket, "AF_UNIX"), "Unix sockets are not available")
+class SocketTrustTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        (self.root / "a.py").write_text("eval(x)\n", encoding="utf-8")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def listen(self, path: Path) -> socket.socket:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.bind(str(path))
+        sock.listen(1)
+        self.addCleanup(sock.close)
+        return sock
+
+    def test_default_socket_lives_in_a_private_directory(self):
+        with mock.patch.dict(os.environ, {"XDG_RUNTIME_DIR": ""}), \
+                mock.patch("stone_sec.daemon.tempfile.gettempdir", return_value=str(self.root)):
+            path = default_socket_path()
+
+        self.assertEqual(path.parent, self.root / f"stone-sec-{os.getuid()}")
+        ensure_private_dir(path.parent)
+        self.assertEqual(path.parent.stat().st_mode & 0o777, 0o700)
+
+        path.parent.chmod(0o755)
+        with self.assertRaises(PermissionError):
+            ensure_private_dir(path.parent)
+
+    @unittest.skipUnless(hasattr(os, "geteuid") and os.geteuid() == 0, "needs root to chown")
+    def test_socket_of_another_user_is_not_trusted(self):
+        path = self.root / "s.sock"
+        listener = self.listen(path)
+        listener.settimeout(0.5)
+        os.chown(path, 65534, 65534)
+
+        out = io.StringIO()
+        code = review_via_daemon(["review", str(self.root), "--fail-on", "high"], str(path), out)
+
+        self.assertEqual(code, 1)
+        self.assertIn("PY-EVAL-001", out.getvalue())
+        with self.assertRaises(socket.timeout):
+            listener.accept()
+
+    def test_stale_socket_that_cannot_be_removed_is_reported(self):
+        path = self.root / "s.sock"
+        self.listen(path).close()
+
+        out = io.StringIO()
+        with mock.patch.object(Path, "unlink", side_effect=PermissionError("denied")), \
+                contextlib.redirect_stdout(out):
+            code = serve(socket_path=str(path), idle_timeout=1.0)
+
+        self.assertEqual(code, 1)
+        self.assertIn("[ERROR] Unable to remove stale socket", out.getvalue())
+
+
+class FileResultCacheTests(unittest.TestCase):
+    def test_cached_findings_are_copies(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "a.py"
+            path.write_text("eval(x)\n", encoding="utf-8")
+            cache = FileResultCache()
+
+            first = cache.scan(path)
+            first[0].explanation = "enriched"
+            second = cache.scan(path)
+
+            self.assertEqual(second[0].rule_id, "PY-EVAL-001")
+            self.assertIsNone(second[0].explanation)
+
+
+if __name__ == "__main__":
+    unittest.main()